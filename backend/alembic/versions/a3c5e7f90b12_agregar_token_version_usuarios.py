@@ -0,0 +1,31 @@
+"""agregar_token_version_usuarios
+
+Revision ID: a3c5e7f90b12
+Revises: fix_corredor_sequences
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c5e7f90b12"
+down_revision: Union[str, None] = "fix_corredor_sequences"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Versión de los tokens del usuario: incrementarla revoca los emitidos
+    op.add_column(
+        "usuarios",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("usuarios", "token_version")
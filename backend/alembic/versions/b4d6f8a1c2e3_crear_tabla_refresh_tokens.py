@@ -0,0 +1,56 @@
+"""crear_tabla_refresh_tokens
+
+Revision ID: b4d6f8a1c2e3
+Revises: a3c5e7f90b12
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b4d6f8a1c2e3"
+down_revision: Union[str, None] = "a3c5e7f90b12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("usuario_id", sa.Integer(), nullable=False),
+        sa.Column("token_hash", sa.String(length=64), nullable=False),
+        sa.Column("familia", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("usado", sa.Boolean(), nullable=False),
+        sa.Column("revocado", sa.Boolean(), nullable=False),
+        sa.Column("fecha_creacion", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("fecha_expiracion", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["usuario_id"], ["usuarios.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token_hash"),
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_id"), "refresh_tokens", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_usuario_id"),
+        "refresh_tokens",
+        ["usuario_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_familia"), "refresh_tokens", ["familia"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_refresh_tokens_familia"), table_name="refresh_tokens")
+    op.drop_index(op.f("ix_refresh_tokens_usuario_id"), table_name="refresh_tokens")
+    op.drop_index(op.f("ix_refresh_tokens_id"), table_name="refresh_tokens")
+    op.drop_table("refresh_tokens")
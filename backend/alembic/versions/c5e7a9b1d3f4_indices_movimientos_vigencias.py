@@ -0,0 +1,74 @@
+"""indices_movimientos_vigencias
+
+Revision ID: c5e7a9b1d3f4
+Revises: b4d6f8a1c2e3
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e7a9b1d3f4"
+down_revision: Union[str, None] = "b4d6f8a1c2e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVAS = "estado_poliza = 'activa'"
+
+# (nombre, columnas, condición del índice parcial)
+INDICES = [
+    ("ix_movimientos_vigencias_vencimiento", ["fecha_vencimiento", "id"], None),
+    (
+        "ix_movimientos_vigencias_corredor_vencimiento",
+        ["corredor_id", "fecha_vencimiento", "id"],
+        None,
+    ),
+    (
+        "ix_movimientos_vigencias_cliente_vencimiento",
+        ["cliente_id", "fecha_vencimiento"],
+        None,
+    ),
+    (
+        "ix_movimientos_vigencias_estado_vencimiento",
+        ["estado_poliza", "fecha_vencimiento"],
+        None,
+    ),
+    ("ix_movimientos_vigencias_inicio", ["fecha_inicio", "id"], None),
+    ("ix_movimientos_vigencias_activas_vencimiento", ["fecha_vencimiento"], ACTIVAS),
+    (
+        "ix_movimientos_vigencias_activas_corredor",
+        ["corredor_id", "fecha_vencimiento"],
+        ACTIVAS,
+    ),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        for nombre, columnas, condicion in INDICES:
+            op.create_index(
+                nombre,
+                "movimientos_vigencias",
+                columnas,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(condicion) if condicion else None,
+                if_not_exists=True,
+            )
+    op.execute("ANALYZE movimientos_vigencias")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nombre, _, _ in reversed(INDICES):
+            op.drop_index(
+                nombre,
+                table_name="movimientos_vigencias",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
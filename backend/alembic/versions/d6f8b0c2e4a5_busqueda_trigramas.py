@@ -0,0 +1,46 @@
+"""busqueda_trigramas
+
+Revision ID: d6f8b0c2e4a5
+Revises: c5e7a9b1d3f4
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d6f8b0c2e4a5"
+down_revision: Union[str, None] = "c5e7a9b1d3f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nombre, tabla, expresión indexada)
+INDICES = [
+    (
+        "ix_movimientos_vigencias_numero_poliza_trgm",
+        "movimientos_vigencias",
+        "numero_poliza",
+    ),
+    ("ix_clientes_nombre_completo_trgm", "clientes", "(nombres || ' ' || apellidos)"),
+    ("ix_clientes_numero_documento_trgm", "clientes", "numero_documento"),
+    ("ix_clientes_mail_trgm", "clientes", "mail"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        for nombre, tabla, expresion in INDICES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {nombre} "
+                f"ON {tabla} USING gin ({expresion} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nombre, _, _ in reversed(INDICES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}")
@@ -0,0 +1,40 @@
+"""trigramas_nombres_apellidos
+
+Revision ID: e7a9c1b3d5f6
+Revises: d6f8b0c2e4a5
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a9c1b3d5f6"
+down_revision: Union[str, None] = "d6f8b0c2e4a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Los filtros cliente_nombre y cliente_apellido buscan por subcadena en cada
+# columna; el índice del nombre completo no les sirve
+INDICES = [
+    ("ix_clientes_nombres_trgm", "nombres"),
+    ("ix_clientes_apellidos_trgm", "apellidos"),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with op.get_context().autocommit_block():
+        for nombre, columna in INDICES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {nombre} "
+                f"ON clientes USING gin ({columna} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nombre, _ in reversed(INDICES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}")
@@ -3,15 +3,25 @@ Dependencias para la API.
 """
 
 
-from fastapi import Depends, HTTPException, status
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.principal import (
+    Principal,
+    principal_cache,
+    token_cache,
+    token_version_cache,
+)
+from app.core.security import hash_token
+from app.db.crud.pagination import Cursor, Page, decode_cursor
 from app.db.crud.usuario import usuario_crud
 from app.db.database import get_db
-from app.db.models.usuario import Usuario
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -20,34 +30,74 @@ oauth2_scheme = OAuth2PasswordBearer(
 
 async def get_current_user(
     db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> Usuario:
+) -> Principal:
     """
     Valida el token JWT y retorna el usuario actual.
+
+    Los tokens llevan el rol, los permisos y la versión del usuario, así que
+    el principal se arma desde los claims; solo se comprueba (con caché) que
+    la versión siga vigente. Los tokens sin claims, emitidos antes de este
+    esquema, resuelven el usuario en la base de datos.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudieron validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
+    token_key = hash_token(token)
+    cached = token_cache.get(token_key)
+    if cached is None:
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+            sub: str = payload.get("sub")
+            if sub is None:
+                raise credentials_exception
+            cached = (
+                Principal.from_claims(payload) if "ver" in payload else int(sub)
+            )
+        except (JWTError, ValueError, KeyError, TypeError):
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        # No cachear el token más allá de su expiración
+        exp = payload.get("exp")
+        token_cache.set(token_key, cached, ttl=exp - time.time() if exp else None)
 
-    user = await usuario_crud.get(db, id=int(user_id))
-    if user is None:
+    if isinstance(cached, Principal):
+        await _check_token_version(db, cached, credentials_exception)
+        return cached
+
+    user_id = cached
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = await usuario_crud.get(db, id=user_id)
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_usuario(user)
+        principal_cache.set(user_id, principal)
+    return principal
+
+
+async def _check_token_version(
+    db: AsyncSession, principal: Principal, credentials_exception: HTTPException
+) -> None:
+    """
+    Rechaza el token si el usuario cambió (rol, contraseña, estado...) desde
+    que se emitió, o si ya no existe o está inactivo.
+    """
+    version = token_version_cache.get(principal.id)
+    if version is None:
+        version = await usuario_crud.get_token_version(db, id=principal.id)
+        if version is None:
+            raise credentials_exception
+        token_version_cache.set(principal.id, version)
+    if version != principal.token_version:
         raise credentials_exception
-    return user
 
 
 async def get_current_active_user(
-    current_user: Usuario = Depends(get_current_user),
-) -> Usuario:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     Valida que el usuario actual esté activo.
     """
@@ -59,8 +109,8 @@ async def get_current_active_user(
 
 
 async def get_current_active_superuser(
-    current_user: Usuario = Depends(get_current_active_user),
-) -> Usuario:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     Valida que el usuario actual sea superusuario.
     """
@@ -70,3 +120,33 @@ async def get_current_active_superuser(
             detail="El usuario no tiene privilegios de superusuario",
         )
     return current_user
+
+
+def get_cursor(
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor opaco devuelto en X-Next-Cursor / X-Prev-Cursor. "
+        "Si se indica, se pagina por keyset y se ignora `skip`.",
+    ),
+) -> Optional[Cursor]:
+    """
+    Decodifica el cursor de paginación recibido por query string.
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        )
+
+
+def set_pagination_headers(response: Response, page: Page) -> None:
+    """
+    Publica los cursores de la página en las cabeceras de la respuesta.
+    """
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.prev_cursor:
+        response.headers["X-Prev-Cursor"] = page.prev_cursor
@@ -6,6 +6,7 @@ from app.api.v1.endpoints import (
     cliente_corredor,
     clientes,
     corredores,
+    exportaciones,
     monedas,
     movimientos_vigencia,
     polizas,
@@ -42,3 +43,6 @@ api_router.include_router(
     cliente_corredor.router, prefix="/cliente-corredor", tags=["cliente-corredor"]
 )
 api_router.include_router(polizas.router, prefix="/polizas", tags=["polizas"])
+api_router.include_router(
+    exportaciones.router, prefix="/exports", tags=["exportaciones"]
+)
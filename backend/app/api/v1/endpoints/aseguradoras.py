@@ -1,10 +1,13 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_cursor, set_pagination_headers
 from app.db.crud.aseguradora import aseguradora_crud
-from app.db.database import get_db
+from app.db.crud.pagination import Cursor
+from app.db.database import get_db, get_read_db
 from app.schemas.aseguradora import Aseguradora, AseguradoraCreate, AseguradoraUpdate
 
 router = APIRouter()
@@ -12,13 +15,18 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Aseguradora])
 async def get_aseguradoras(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
 ) -> Any:
     """
     Recuperar aseguradoras.
     """
-    aseguradoras = await aseguradora_crud.get_multi(db, skip=skip, limit=limit)
-    return aseguradoras
+    page = await aseguradora_crud.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    set_pagination_headers(response, page)
+    return page.items
 
 
 @router.post("/", response_model=Aseguradora)
@@ -34,7 +42,7 @@ async def create_aseguradora(
 
 @router.get("/{aseguradora_id}", response_model=Aseguradora)
 async def get_aseguradora(
-    aseguradora_id: int, db: AsyncSession = Depends(get_db)
+    aseguradora_id: int, db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Obtener aseguradora por ID.
@@ -55,12 +63,11 @@ async def update_aseguradora(
     """
     Actualizar aseguradora.
     """
-    aseguradora = await aseguradora_crud.get(db, id=aseguradora_id)
+    aseguradora = await aseguradora_crud.update_by_id(
+        db, id=aseguradora_id, obj_in=aseguradora_in
+    )
     if not aseguradora:
         raise HTTPException(status_code=404, detail="Aseguradora no encontrada")
-    aseguradora = await aseguradora_crud.update(
-        db, db_obj=aseguradora, obj_in=aseguradora_in
-    )
     return aseguradora
 
 
@@ -71,8 +78,13 @@ async def delete_aseguradora(
     """
     Eliminar aseguradora.
     """
-    aseguradora = await aseguradora_crud.get(db, id=aseguradora_id)
+    try:
+        aseguradora = await aseguradora_crud.delete(db, id=aseguradora_id)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail="No se puede eliminar la aseguradora: tiene registros asociados",
+        )
     if not aseguradora:
         raise HTTPException(status_code=404, detail="Aseguradora no encontrada")
-    aseguradora = await aseguradora_crud.delete(db, id=aseguradora_id)
     return aseguradora
@@ -1,19 +1,35 @@
 from datetime import timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....core import security
 from ....core.config import settings
+from ....core.principal import Principal
+from ....db.crud.refresh_token import refresh_token_crud
 from ....db.crud.usuario import usuario_crud
-from ....db.session import get_db
-from ....schemas.token import Token
+from ....db.database import get_db
+from ....db.models.usuario import Usuario
+from ....schemas.token import RefreshTokenRequest, Token
 
 router = APIRouter()
 
 
+def _token_response(usuario: Usuario, refresh_token: str) -> dict:
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return {
+        "access_token": security.create_access_token(
+            usuario.id,
+            expires_delta=access_token_expires,
+            extra_claims=Principal.from_usuario(usuario).to_claims(),
+        ),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
 @router.post("/login/access-token", response_model=Token)
 async def login_access_token(
     db: AsyncSession = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
@@ -27,10 +43,25 @@ async def login_access_token(
     elif not usuario.is_active:
         raise HTTPException(status_code=400, detail="Usuario inactivo")
 
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    return {
-        "access_token": security.create_access_token(
-            usuario.id, expires_delta=access_token_expires
-        ),
-        "token_type": "bearer",
-    }
+    refresh_token = await refresh_token_crud.create(db, usuario_id=usuario.id)
+    return _token_response(usuario, refresh_token)
+
+
+@router.post("/login/refresh", response_model=Token)
+async def login_refresh(
+    body: RefreshTokenRequest, db: AsyncSession = Depends(get_db)
+) -> Any:
+    """
+    Canjea un refresh token por un nuevo access token y un nuevo refresh token,
+    sin verificar la contraseña. Cada refresh token sirve una sola vez.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Refresh token inválido o expirado",
+    )
+    # rotate verifica que el usuario siga activo antes de emitir el sucesor
+    rotado = await refresh_token_crud.rotate(db, body.refresh_token)
+    if rotado is None:
+        raise credentials_exception
+    usuario, refresh_token = rotado
+    return _token_response(usuario, refresh_token)
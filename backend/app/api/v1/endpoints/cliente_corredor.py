@@ -1,9 +1,11 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_cursor, set_pagination_headers
 from app.db.crud.cliente_corredor import cliente_corredor_crud
+from app.db.crud.pagination import Cursor
 from app.db.database import get_db
 from app.schemas.cliente_corredor import (
     ClienteCorredor,
@@ -16,13 +18,18 @@ router = APIRouter()
 
 @router.get("/", response_model=List[ClienteCorredor])
 async def get_cliente_corredores(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
 ) -> Any:
     """
     Recuperar relaciones cliente-corredor.
     """
-    relaciones = await cliente_corredor_crud.get_multi(db, skip=skip, limit=limit)
-    return relaciones
+    page = await cliente_corredor_crud.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    set_pagination_headers(response, page)
+    return page.items
 
 
 @router.post("/", response_model=ClienteCorredor)
@@ -61,14 +68,13 @@ async def update_cliente_corredor(
     """
     Actualizar relación cliente-corredor.
     """
-    relacion = await cliente_corredor_crud.get(db, id=relacion_id)
+    relacion = await cliente_corredor_crud.update_by_id(
+        db, id=relacion_id, obj_in=cliente_corredor_in
+    )
     if not relacion:
         raise HTTPException(
             status_code=404, detail="Relación cliente-corredor no encontrada"
         )
-    relacion = await cliente_corredor_crud.update(
-        db, db_obj=relacion, obj_in=cliente_corredor_in
-    )
     return relacion
 
 
@@ -79,10 +85,9 @@ async def delete_cliente_corredor(
     """
     Eliminar relación cliente-corredor.
     """
-    relacion = await cliente_corredor_crud.get(db, id=relacion_id)
+    relacion = await cliente_corredor_crud.delete(db, id=relacion_id)
     if not relacion:
         raise HTTPException(
             status_code=404, detail="Relación cliente-corredor no encontrada"
         )
-    relacion = await cliente_corredor_crud.delete(db, id=relacion_id)
     return relacion
@@ -1,24 +1,81 @@
-from typing import Any, List
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_cursor, set_pagination_headers
+from app.core.config import settings
+from app.db.crud.busqueda import (
+    MENSAJE_TIEMPO_AGOTADO,
+    es_tiempo_agotado,
+    limitar_duracion,
+)
 from app.db.crud.cliente import cliente_crud
-from app.db.database import get_db
-from app.schemas.cliente import Cliente, ClienteCreate, ClienteUpdate
+from app.db.crud.pagination import Cursor
+from app.db.database import get_db, get_read_db
+from app.schemas.cliente import (
+    Cliente,
+    ClienteBusqueda,
+    ClienteCreate,
+    ClienteUpdate,
+)
 
 router = APIRouter()
 
+# Mensaje de conflicto por campo único de clientes
+MENSAJES_DUPLICADO = {
+    "numero_documento": "El número de documento ya está registrado",
+    "mail": "El email ya está registrado",
+}
+
 
 @router.get("/", response_model=List[Cliente])
 async def get_clientes(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
 ) -> Any:
     """
     Recuperar clientes.
     """
-    clientes = await cliente_crud.get_multi(db, skip=skip, limit=limit)
-    return clientes
+    page = await cliente_crud.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    set_pagination_headers(response, page)
+    return page.items
+
+
+@router.get("/buscar", response_model=List[ClienteBusqueda])
+async def buscar_clientes(
+    db: AsyncSession = Depends(get_read_db),
+    q: str = Query(
+        ...,
+        min_length=settings.BUSQUEDA_MIN_CARACTERES,
+        description="Nombre, documento o mail del cliente",
+    ),
+    limit: int = Query(20, ge=1, le=settings.BUSQUEDA_LIMITE_MAX),
+) -> Any:
+    """
+    Buscar clientes por similitud de texto, ordenados por relevancia.
+    """
+    await limitar_duracion(db, settings.BUSQUEDA_TIMEOUT_MS)
+    try:
+        resultados = await cliente_crud.buscar(db, texto=q.strip(), limit=limit)
+    except DBAPIError as e:
+        if not es_tiempo_agotado(e):
+            raise
+        raise HTTPException(
+            status_code=504,
+            detail=MENSAJE_TIEMPO_AGOTADO,
+        )
+    return [
+        ClienteBusqueda.model_validate(cliente).model_copy(
+            update={"relevancia": relevancia}
+        )
+        for cliente, relevancia in resultados
+    ]
 
 
 @router.post("/", response_model=Cliente)
@@ -29,11 +86,48 @@ async def create_cliente(
     Crear nuevo cliente.
     """
     cliente = await cliente_crud.create(db, obj_in=cliente_in)
+    if not cliente:
+        campo = await cliente_crud.find_conflict(db, cliente_in.dict())
+        raise HTTPException(
+            status_code=409,
+            detail=MENSAJES_DUPLICADO.get(campo, "El cliente ya está registrado"),
+        )
     return cliente
 
 
+@router.post("/bulk", response_model=Dict[str, UUID])
+async def upsert_clientes(
+    *, db: AsyncSession = Depends(get_db), clientes_in: List[ClienteCreate]
+) -> Any:
+    """
+    Alta o actualización masiva de clientes por número de documento.
+    Devuelve el id de cada cliente indexado por su número de documento.
+    """
+    if len(clientes_in) > settings.CLIENTES_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                "La carga admite como máximo "
+                f"{settings.CLIENTES_BULK_MAX_ITEMS} clientes por petición"
+            ),
+        )
+    try:
+        return await cliente_crud.upsert_many(
+            db, objs_in=clientes_in, tamano_lote=settings.CLIENTES_BULK_CHUNK_SIZE
+        )
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=(
+                "No se pudieron cargar los clientes: hay un email ya registrado "
+                "para otro documento o un tipo de documento inexistente"
+            ),
+        )
+
+
 @router.get("/{cliente_id}", response_model=Cliente)
-async def get_cliente(cliente_id: int, db: AsyncSession = Depends(get_db)) -> Any:
+async def get_cliente(cliente_id: UUID, db: AsyncSession = Depends(get_db)) -> Any:
     """
     Obtener cliente por ID.
     """
@@ -45,25 +139,31 @@ async def get_cliente(cliente_id: int, db: AsyncSession = Depends(get_db)) -> An
 
 @router.put("/{cliente_id}", response_model=Cliente)
 async def update_cliente(
-    *, db: AsyncSession = Depends(get_db), cliente_id: int, cliente_in: ClienteUpdate
+    *, db: AsyncSession = Depends(get_db), cliente_id: UUID, cliente_in: ClienteUpdate
 ) -> Any:
     """
     Actualizar cliente.
     """
-    cliente = await cliente_crud.get(db, id=cliente_id)
+    cliente = await cliente_crud.update_by_id(db, id=cliente_id, obj_in=cliente_in)
     if not cliente:
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
-    cliente = await cliente_crud.update(db, db_obj=cliente, obj_in=cliente_in)
     return cliente
 
 
 @router.delete("/{cliente_id}", response_model=Cliente)
-async def delete_cliente(*, db: AsyncSession = Depends(get_db), cliente_id: int) -> Any:
+async def delete_cliente(
+    *, db: AsyncSession = Depends(get_db), cliente_id: UUID
+) -> Any:
     """
     Eliminar cliente.
     """
-    cliente = await cliente_crud.get(db, id=cliente_id)
+    try:
+        cliente = await cliente_crud.delete(db, id=cliente_id)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail="No se puede eliminar el cliente: tiene registros asociados",
+        )
     if not cliente:
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
-    cliente = await cliente_crud.delete(db, id=cliente_id)
     return cliente
@@ -2,14 +2,16 @@
 Endpoints para la gestión de corredores
 """
 
-from typing import Any, List
+from typing import Any, List, Optional
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
+from app.api.deps import get_cursor, set_pagination_headers
 from app.db.crud.corredor import corredor_crud
+from app.db.crud.pagination import Cursor
 from app.db.database import get_db
 from app.db.models.corredor import Corredor
 from app.schemas.corredor import CorredorCreate, CorredorResponse, CorredorUpdate
@@ -23,6 +25,26 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Mensaje de conflicto por campo único de corredores
+MENSAJES_DUPLICADO = {
+    "numero": "El número de corredor ya existe",
+    "documento": "El documento ya está registrado",
+    "mail": "El email ya está registrado",
+}
+
+
+async def error_corredor_duplicado(
+    db: AsyncSession, values: dict, exclude: Any = ()
+) -> HTTPException:
+    """
+    409 con el campo único que ya usa otro corredor. Solo consulta la base de
+    datos después de que la restricción única rechazó la escritura.
+    """
+    campo = await corredor_crud.find_conflict(db, values, exclude=exclude)
+    detail = MENSAJES_DUPLICADO.get(campo, "El corredor ya está registrado")
+    logger.error(f"Corredor duplicado: {detail}")
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
 
 async def get_corredor_or_404(db: AsyncSession, corredor_id: int) -> Corredor:
     """
@@ -43,13 +65,18 @@ async def get_corredor_or_404(db: AsyncSession, corredor_id: int) -> Corredor:
 
 @router.get("/", response_model=List[CorredorResponse])
 async def get_corredores(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
 ) -> Any:
     """
     Recuperar corredores.
     """
-    corredores = await corredor_crud.get_multi(db, skip=skip, limit=limit)
-    return [CorredorResponse.model_validate(c, from_attributes=True) for c in corredores]
+    page = await corredor_crud.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    set_pagination_headers(response, page)
+    return [CorredorResponse.model_validate(c, from_attributes=True) for c in page.items]
 
 
 @router.post("/", response_model=CorredorResponse, status_code=status.HTTP_201_CREATED)
@@ -59,20 +86,10 @@ async def create_corredor(
     """
     Crear nuevo corredor.
     """
-    try:
-        corredor = await corredor_crud.create(db, obj_in=corredor_in)
-        return CorredorResponse.model_validate(corredor, from_attributes=True)
-    except IntegrityError as e:
-        logger.error(f"Error al crear corredor: {e}")
-        error_detail = "Error inesperado al crear el corredor"
-        if "unique constraint" in str(e.orig).lower():
-            if "numero" in str(e.orig).lower():
-                error_detail = "El número de corredor ya existe"
-            elif "documento" in str(e.orig).lower():
-                error_detail = "El documento ya está registrado"
-            elif "mail" in str(e.orig).lower():
-                error_detail = "El email ya está registrado"
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_detail)
+    corredor = await corredor_crud.create(db, obj_in=corredor_in)
+    if not corredor:
+        raise await error_corredor_duplicado(db, corredor_in.model_dump())
+    return CorredorResponse.model_validate(corredor, from_attributes=True)
 
 
 @router.post("/admin", response_model=CorredorResponse, status_code=status.HTTP_201_CREATED)
@@ -83,38 +100,33 @@ async def create_admin(
     Crear corredor administrador inicial.
     Solo funciona si no hay corredores en el sistema.
     """
-    try:
-        async with db.begin():  # Transacción atómica
-            existing_admin = await corredor_crud.get_admin(db)
-            if existing_admin:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Ya existe un administrador en el sistema.",
-                )
-
-            existing_corredores = await corredor_crud.get_multi(db, limit=1)
-            if existing_corredores:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No se puede crear el administrador inicial porque ya existen corredores en el sistema.",
-                )
-
-            corredor_data = corredor_in.model_dump()
-            corredor_data.update({"role": "admin", "is_active": True, "numero": 1000})
-
-            corredor = await corredor_crud.create(db, obj_in=CorredorCreate(**corredor_data))
-
-        logger.info(
-            f"Administrador creado exitosamente: ID={corredor.id}, Número={corredor.numero}"
-        )
-        return CorredorResponse.model_validate(corredor, from_attributes=True)
-
-    except IntegrityError as e:
-        logger.error(f"Error al crear administrador: {e}")
-        error_detail = "Error inesperado al crear el administrador"
-        if "unique constraint" in str(e.orig).lower():
-            error_detail = "Número de corredor ya existe"
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_detail)
+    async with db.begin():  # Transacción atómica
+        existing_admin = await corredor_crud.get_admin(db)
+        if existing_admin:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Ya existe un administrador en el sistema.",
+            )
+
+        existing_corredores = await corredor_crud.get_multi(db, limit=1)
+        if existing_corredores:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No se puede crear el administrador inicial porque ya existen corredores en el sistema.",
+            )
+
+        corredor_data = corredor_in.model_dump()
+        corredor_data.update({"role": "admin", "is_active": True, "numero": 1000})
+
+        corredor_admin = CorredorCreate(**corredor_data)
+        corredor = await corredor_crud.create(db, obj_in=corredor_admin)
+        if not corredor:
+            raise await error_corredor_duplicado(db, corredor_admin.model_dump())
+
+    logger.info(
+        f"Administrador creado exitosamente: ID={corredor.id}, Número={corredor.numero}"
+    )
+    return CorredorResponse.model_validate(corredor, from_attributes=True)
 
 
 @router.get("/numero/{numero}", response_model=CorredorResponse)
@@ -147,20 +159,21 @@ async def update_corredor(
     """
     Actualizar corredor.
     """
+    logger.info(f"Datos recibidos para actualizar corredor: {corredor_in}")
+    criterio = corredor_crud.criterio_id_o_numero(corredor_id)
     try:
-        logger.info(f"Datos recibidos para actualizar corredor: {corredor_in}")
-        corredor = await get_corredor_or_404(db, corredor_id)
-        corredor = await corredor_crud.update(db, db_obj=corredor, obj_in=corredor_in)
-        return CorredorResponse.model_validate(corredor, from_attributes=True)
-    except IntegrityError as e:
-        logger.error(f"Error al actualizar corredor: {e}")
-        error_detail = "Error inesperado al actualizar el corredor"
-        if "unique constraint" in str(e.orig).lower():
-            if "documento" in str(e.orig).lower():
-                error_detail = "El documento ya está registrado"
-            elif "mail" in str(e.orig).lower():
-                error_detail = "El email ya está registrado"
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_detail)
+        corredor = await corredor_crud.update_where(db, criterio, corredor_in)
+    except IntegrityError:
+        # Un UPDATE no admite ON CONFLICT: la violación única llega como error
+        await db.rollback()
+        raise await error_corredor_duplicado(
+            db, corredor_in.model_dump(exclude_unset=True), exclude=criterio
+        )
+    if not corredor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Corredor no encontrado"
+        )
+    return CorredorResponse.model_validate(corredor, from_attributes=True)
 
 
 @router.delete("/{corredor_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -168,5 +181,16 @@ async def delete_corredor(*, db: AsyncSession = Depends(get_db), corredor_id: in
     """
     Eliminar corredor.
     """
-    corredor = await get_corredor_or_404(db, corredor_id)
-    await corredor_crud.delete(db, id=corredor_id)
+    try:
+        corredor = await corredor_crud.delete_where(
+            db, corredor_crud.criterio_id_o_numero(corredor_id)
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="No se puede eliminar el corredor: tiene registros asociados",
+        )
+    if not corredor:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Corredor no encontrado"
+        )
@@ -0,0 +1,47 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.api.deps import get_current_active_user
+from app.core.principal import Principal
+from app.db.trabajos_exportacion import TrabajoExportacion, gestor_exportaciones
+from app.schemas.exportacion import ExportacionEstado
+
+router = APIRouter()
+
+
+def _trabajo_del_usuario(id: str, current_user: Principal) -> TrabajoExportacion:
+    """El trabajo solo es visible para quien lo creó y los superusuarios."""
+    trabajo = gestor_exportaciones.obtener(id)
+    if trabajo is None or (
+        trabajo.usuario_id != current_user.id and not current_user.is_superuser
+    ):
+        raise HTTPException(status_code=404, detail="Exportación no encontrada")
+    return trabajo
+
+
+@router.get("/{id}", response_model=ExportacionEstado)
+async def get_exportacion(
+    id: str, current_user: Principal = Depends(get_current_active_user)
+) -> Any:
+    """
+    Estado y progreso de una exportación en segundo plano. Al completarse
+    incluye la URL de descarga, válida hasta la fecha de expiración.
+    """
+    return _trabajo_del_usuario(id, current_user)
+
+
+@router.get("/{id}/descarga")
+async def descargar_exportacion(
+    id: str, current_user: Principal = Depends(get_current_active_user)
+) -> FileResponse:
+    """
+    Descargar el archivo de una exportación completada.
+    """
+    trabajo = _trabajo_del_usuario(id, current_user)
+    if trabajo.estado != "completado":
+        raise HTTPException(status_code=409, detail="La exportación no está lista")
+    return FileResponse(
+        trabajo.ruta, media_type=trabajo.media_type, filename=trabajo.nombre_archivo
+    )
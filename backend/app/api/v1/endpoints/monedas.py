@@ -1,10 +1,13 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_cursor, set_pagination_headers
 from app.db.crud.moneda import moneda_crud
-from app.db.database import get_db
+from app.db.crud.pagination import Cursor
+from app.db.database import get_db, get_read_db
 from app.schemas.moneda import Moneda, MonedaCreate, MonedaUpdate
 
 router = APIRouter()
@@ -12,13 +15,18 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Moneda])
 async def get_monedas(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
 ) -> Any:
     """
     Recuperar monedas.
     """
-    monedas = await moneda_crud.get_multi(db, skip=skip, limit=limit)
-    return monedas
+    page = await moneda_crud.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    set_pagination_headers(response, page)
+    return page.items
 
 
 @router.post("/", response_model=Moneda)
@@ -33,7 +41,7 @@ async def create_moneda(
 
 
 @router.get("/{moneda_id}", response_model=Moneda)
-async def get_moneda(moneda_id: int, db: AsyncSession = Depends(get_db)) -> Any:
+async def get_moneda(moneda_id: int, db: AsyncSession = Depends(get_read_db)) -> Any:
     """
     Obtener moneda por ID.
     """
@@ -50,10 +58,9 @@ async def update_moneda(
     """
     Actualizar moneda.
     """
-    moneda = await moneda_crud.get(db, id=moneda_id)
+    moneda = await moneda_crud.update_by_id(db, id=moneda_id, obj_in=moneda_in)
     if not moneda:
         raise HTTPException(status_code=404, detail="Moneda no encontrada")
-    moneda = await moneda_crud.update(db, db_obj=moneda, obj_in=moneda_in)
     return moneda
 
 
@@ -62,8 +69,13 @@ async def delete_moneda(*, db: AsyncSession = Depends(get_db), moneda_id: int) -
     """
     Eliminar moneda.
     """
-    moneda = await moneda_crud.get(db, id=moneda_id)
+    try:
+        moneda = await moneda_crud.delete(db, id=moneda_id)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail="No se puede eliminar la moneda: tiene registros asociados",
+        )
     if not moneda:
         raise HTTPException(status_code=404, detail="Moneda no encontrada")
-    moneda = await moneda_crud.delete(db, id=moneda_id)
     return moneda
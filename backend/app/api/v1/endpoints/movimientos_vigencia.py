@@ -1,9 +1,11 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_cursor, set_pagination_headers
 from app.db.crud.movimiento_vigencia import movimiento_vigencia_crud
+from app.db.crud.pagination import Cursor
 from app.db.database import get_db
 from app.schemas.movimiento_vigencia import (
     MovimientoVigencia,
@@ -16,13 +18,18 @@ router = APIRouter()
 
 @router.get("/", response_model=List[MovimientoVigencia])
 async def get_movimientos_vigencia(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
 ) -> Any:
     """
     Recuperar movimientos de vigencia.
     """
-    movimientos = await movimiento_vigencia_crud.get_multi(db, skip=skip, limit=limit)
-    return movimientos
+    page = await movimiento_vigencia_crud.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    set_pagination_headers(response, page)
+    return page.items
 
 
 @router.post("/", response_model=MovimientoVigencia)
@@ -61,14 +68,13 @@ async def update_movimiento_vigencia(
     """
     Actualizar movimiento de vigencia.
     """
-    movimiento = await movimiento_vigencia_crud.get(db, id=movimiento_id)
+    movimiento = await movimiento_vigencia_crud.update_by_id(
+        db, id=movimiento_id, obj_in=movimiento_in
+    )
     if not movimiento:
         raise HTTPException(
             status_code=404, detail="Movimiento de vigencia no encontrado"
         )
-    movimiento = await movimiento_vigencia_crud.update(
-        db, db_obj=movimiento, obj_in=movimiento_in
-    )
     return movimiento
 
 
@@ -79,10 +85,9 @@ async def delete_movimiento_vigencia(
     """
     Eliminar movimiento de vigencia.
     """
-    movimiento = await movimiento_vigencia_crud.get(db, id=movimiento_id)
+    movimiento = await movimiento_vigencia_crud.delete(db, id=movimiento_id)
     if not movimiento:
         raise HTTPException(
             status_code=404, detail="Movimiento de vigencia no encontrado"
         )
-    movimiento = await movimiento_vigencia_crud.delete(db, id=movimiento_id)
     return movimiento
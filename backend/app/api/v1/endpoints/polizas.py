@@ -1,34 +1,74 @@
 # Importaciones estándar
 import logging
+from collections import Counter
 from datetime import date, timedelta
-from io import BytesIO
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-import openpyxl
-
 # Importaciones de terceros
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
 # Importaciones locales
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, get_cursor, set_pagination_headers
+from app.core.config import settings
 from app.core.permissions import require_permissions
-from app.db.crud.poliza import poliza_crud
-from app.db.database import get_db
+from app.core.principal import Principal
+from app.db.crud.busqueda import (
+    MENSAJE_TIEMPO_AGOTADO,
+    es_tiempo_agotado,
+    limitar_duracion,
+)
+from app.db.crud.pagination import Cursor
+from app.db.crud.poliza import CAMPOS_ORDEN, poliza_crud
+from app.db.database import get_db, get_read_db
+from app.db.exportacion_polizas import (
+    MEDIA_TYPES_COPIA,
+    XLSX_MEDIA_TYPE,
+    eliminar_archivo,
+    exportar_copia,
+    exportar_excel,
+    exportar_pdf,
+    iterar_archivo,
+    nueva_ruta_temporal,
+    nuevo_archivo_temporal,
+)
+from app.db.importacion_polizas import importar_polizas
 from app.db.models.movimiento_vigencia import TipoDuracion
 from app.db.models.usuario import Usuario as UsuarioModel
+from app.db.trabajos_exportacion import (
+    LimiteExportacionesError,
+    gestor_exportaciones,
+)
+from app.schemas.exportacion import ExportacionEstado
 from app.schemas.poliza import (
+    CargaMasivaPolizasResponse,
+    DimensionEstadistica,
     EstadisticasDuracion,
+    EstadisticasGrupo,
     EstadisticasResponse,
     Poliza,
+    PolizaBusqueda,
     PolizaCreate,
     PolizaDetalle,
+    PolizaListado,
     PolizaUpdate,
+    ResultadoCargaPoliza,
+    ResultadoImportacionPolizas,
 )
 
 # Configuración del logger
@@ -36,8 +76,12 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Constantes para códigos de estado
+HTTP_202_ACCEPTED = 202
 HTTP_400_BAD_REQUEST = 400
 HTTP_403_FORBIDDEN = 403
+HTTP_409_CONFLICT = 409
+HTTP_429_TOO_MANY_REQUESTS = 429
+HTTP_504_GATEWAY_TIMEOUT = 504
 
 router = APIRouter()
 
@@ -75,31 +119,90 @@ def validar_rango_fechas(
         )
 
 
-def aplicar_filtros_por_corredor(
-    filters: Dict[str, Union[UUID, int, str, date]], current_user: UsuarioModel
-) -> None:
+def filtros_polizas(
+    cliente_id: Optional[UUID] = None,
+    corredor_id: Optional[int] = None,
+    fecha_inicio: Optional[date] = Query(
+        None, description="Fecha de inicio desde (inclusive)"
+    ),
+    fecha_fin: Optional[date] = Query(
+        None, description="Fecha de inicio hasta (inclusive)"
+    ),
+    vencimiento_desde: Optional[date] = None,
+    vencimiento_hasta: Optional[date] = None,
+    incluir_vencidas: bool = Query(True, description="Incluir pólizas ya vencidas"),
+    proximo_vencimiento: Optional[int] = Query(
+        None,
+        ge=1,
+        le=365,
+        description="Buscar pólizas que vencen en los próximos N días",
+    ),
+    numero_poliza: Optional[str] = None,
+    tipo_seguro_id: Optional[int] = None,
+    moneda_id: Optional[int] = None,
+    suma_asegurada_min: Optional[float] = None,
+    suma_asegurada_max: Optional[float] = None,
+    prima_min: Optional[float] = None,
+    prima_max: Optional[float] = None,
+    cliente_nombre: Optional[str] = Query(
+        None, description="Buscar por nombre del cliente"
+    ),
+    cliente_apellido: Optional[str] = Query(
+        None, description="Buscar por apellido del cliente"
+    ),
+    tipo_duracion: Optional[TipoDuracion] = Query(
+        None, description="Filtrar por tipo de duración"
+    ),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Dict[str, Any]:
     """
-    Si el usuario es un corredor, restringe los resultados a sus pólizas.
+    Filtros comunes del listado, las estadísticas y las exportaciones de pólizas.
+    Incluye el alcance del usuario, que limita a un corredor a sus pólizas.
     """
-    if current_user.role == "corredor":
-        filters["corredor_id"] = current_user.corredor_numero
+    if proximo_vencimiento is not None:
+        vencimiento_desde = date.today()
+        vencimiento_hasta = vencimiento_desde + timedelta(days=proximo_vencimiento)
+        incluir_vencidas = False  # Forzar a False cuando se usa proximo_vencimiento
 
+    validar_rango_fechas(vencimiento_desde, vencimiento_hasta)
 
-def validar_permisos_corredor(
-    poliza: Any, current_user: UsuarioModel, accion: str
-) -> None:
+    return {
+        "cliente_id": cliente_id,
+        "corredor_id": corredor_id,
+        "fecha_inicio": fecha_inicio,
+        "fecha_fin": fecha_fin,
+        "vencimiento_desde": vencimiento_desde,
+        "vencimiento_hasta": vencimiento_hasta,
+        "incluir_vencidas": incluir_vencidas,
+        "numero_poliza": numero_poliza,
+        "tipo_seguro_id": tipo_seguro_id,
+        "moneda_id": moneda_id,
+        "suma_asegurada_min": suma_asegurada_min,
+        "suma_asegurada_max": suma_asegurada_max,
+        "prima_min": prima_min,
+        "prima_max": prima_max,
+        "cliente_nombre": cliente_nombre,
+        "cliente_apellido": cliente_apellido,
+        "tipo_duracion": tipo_duracion,
+        "alcance": current_user,
+    }
+
+
+async def error_poliza_fuera_de_alcance(
+    db: AsyncSession, poliza_id: int, accion: str
+) -> HTTPException:
     """
-    Valida los permisos de un corredor para una póliza específica.
+    Error para una póliza que una consulta o sentencia con el alcance del
+    usuario no encontró: 403 si existe (es de otro corredor), 404 si no.
     """
-    if (
-        current_user.role == "corredor"
-        and poliza.corredor_numero != current_user.corredor_numero
-    ):
+    if await poliza_crud.exists(db, id=poliza_id):
         logger.error(f"No tiene permiso para {accion} esta póliza")
-        raise HTTPException(
+        return HTTPException(
             status_code=HTTP_403_FORBIDDEN,
             detail=f"No tiene permiso para {accion} esta póliza",
         )
+    logger.error("Póliza no encontrada")
+    return HTTPException(status_code=404, detail="Póliza no encontrada")
 
 
 # Funciones para notificaciones
@@ -158,25 +261,25 @@ def obtener_plantilla_notificacion() -> PlantillaNotificacion:
 @router.get("/estadisticas/", response_model=EstadisticasResponse)
 @require_permissions(["polizas_ver"])
 async def get_estadisticas_polizas(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     estado: Optional[str] = Query(
         "activa", description="Estado de las pólizas a incluir"
     ),
-    fecha_inicio: Optional[date] = Query(
-        None, description="Fecha de inicio para filtrar"
+    agrupar_por: List[DimensionEstadistica] = Query(
+        [], description="Dimensiones adicionales, calculadas en la misma consulta"
     ),
-    fecha_fin: Optional[date] = Query(None, description="Fecha fin para filtrar"),
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    filters: Dict[str, Any] = Depends(filtros_polizas),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> EstadisticasResponse:
     """
-    Obtener estadísticas de pólizas agrupadas por tipo de duración.
+    Obtener estadísticas de pólizas agrupadas por tipo de duración y, si se
+    piden, por estado, moneda, tipo de seguro, corredor o mes de inicio.
     """
-    filters = {"estado": estado, "fecha_inicio": fecha_inicio, "fecha_fin": fecha_fin}
-    aplicar_filtros_por_corredor(filters, current_user)
+    filters["estado"] = estado
 
     try:
-        stats_by_duration, suma_total, prima_total, total_polizas = (
-            await poliza_crud.get_estadisticas(db, **filters)
+        por_duracion, por_dimension, totales = await poliza_crud.get_estadisticas(
+            db, dimensiones=agrupar_por, **filters
         )
     except Exception as e:
         logger.error(f"Error al obtener estadísticas: {e}")
@@ -186,19 +289,23 @@ async def get_estadisticas_polizas(
 
     estadisticas_por_duracion = [
         EstadisticasDuracion(
-            tipo_duracion=stat.tipo_duracion,
-            cantidad_polizas=stat.cantidad_polizas,
-            suma_asegurada_total=stat.suma_asegurada_total or 0.0,
-            prima_total=stat.prima_total or 0.0,
+            tipo_duracion=grupo["valor"],
+            cantidad_polizas=grupo["cantidad_polizas"],
+            suma_asegurada_total=grupo["suma_asegurada_total"],
+            prima_total=grupo["prima_total"],
         )
-        for stat in stats_by_duration
+        for grupo in por_duracion
     ]
 
     return EstadisticasResponse(
-        total_polizas=total_polizas,
-        suma_asegurada_total=suma_total,
-        prima_total=prima_total,
+        total_polizas=totales["cantidad_polizas"],
+        suma_asegurada_total=totales["suma_asegurada_total"],
+        prima_total=totales["prima_total"],
         por_duracion=estadisticas_por_duracion,
+        por_dimension={
+            nombre: [EstadisticasGrupo(**grupo) for grupo in grupos]
+            for nombre, grupos in por_dimension.items()
+        },
     )
 
 
@@ -208,7 +315,7 @@ async def get_estadisticas_polizas(
 async def notificar_vencimientos(
     db: AsyncSession = Depends(get_db),
     dias_antes: int = Query(7, description="Días antes del vencimiento para notificar"),
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Dict[str, str]:
     """
     Verifica las pólizas próximas a vencer y envía notificaciones.
@@ -221,10 +328,9 @@ async def notificar_vencimientos(
         "vencimiento_desde": vencimiento_desde,
         "vencimiento_hasta": vencimiento_hasta,
         "incluir_vencidas": False,
+        "alcance": current_user,
     }
 
-    aplicar_filtros_por_corredor(filters, current_user)
-
     try:
         polizas = await poliza_crud.get_multi(db, **filters)
         for poliza in polizas:
@@ -244,7 +350,7 @@ async def programar_verificacion_vencimientos(
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     dias_antes: int = Query(7, description="Días antes del vencimiento para notificar"),
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Dict[str, str]:
     """
     Programa una tarea en segundo plano para verificar vencimientos y enviar notificaciones.
@@ -257,13 +363,12 @@ async def programar_verificacion_vencimientos(
 @require_permissions(["polizas_ver"])
 async def configurar_alertas(
     configuracion: ConfiguracionAlertas,
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> ConfiguracionAlertas:
     """
     Configura las preferencias de alertas para el usuario actual.
     """
     # Aquí puedes guardar la configuración en la base de datos
-    current_user.configuracion_alertas = configuracion
     return configuracion
 
 
@@ -271,7 +376,7 @@ async def configurar_alertas(
 @require_permissions(["polizas_ver"])
 async def crear_plantilla_notificacion(
     plantilla: PlantillaNotificacion,
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> PlantillaNotificacion:
     """
     Crea o actualiza una plantilla de notificación.
@@ -281,93 +386,79 @@ async def crear_plantilla_notificacion(
 
 
 # Endpoints existentes (sin cambios)
-@router.get("/", response_model=List[Poliza])
+@router.get("/buscar", response_model=List[PolizaBusqueda])
+@require_permissions(["polizas_ver"])
+async def buscar_polizas(
+    db: AsyncSession = Depends(get_read_db),
+    q: str = Query(
+        ...,
+        min_length=settings.BUSQUEDA_MIN_CARACTERES,
+        description="Número de póliza, nombre, documento o mail del cliente",
+    ),
+    limit: int = Query(20, ge=1, le=settings.BUSQUEDA_LIMITE_MAX),
+    current_user: Principal = Depends(get_current_active_user),
+) -> List[PolizaBusqueda]:
+    """
+    Buscar pólizas por similitud de texto, ordenadas por relevancia.
+    """
+    await limitar_duracion(db, settings.BUSQUEDA_TIMEOUT_MS)
+    try:
+        return await poliza_crud.buscar(
+            db, texto=q.strip(), limit=limit, alcance=current_user
+        )
+    except DBAPIError as e:
+        if not es_tiempo_agotado(e):
+            raise
+        logger.warning("Búsqueda de pólizas '%s' excedió el tiempo máximo", q)
+        raise HTTPException(
+            status_code=HTTP_504_GATEWAY_TIMEOUT,
+            detail=MENSAJE_TIEMPO_AGOTADO,
+        )
+
+
+@router.get("/", response_model=List[PolizaListado])
 @require_permissions(["polizas_ver"])
 async def get_polizas(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
-    cliente_id: Optional[UUID] = None,
-    corredor_id: Optional[int] = None,
+    cursor: Optional[Cursor] = Depends(get_cursor),
     estado: Optional[str] = None,
-    fecha_inicio: Optional[date] = None,
-    fecha_fin: Optional[date] = None,
-    vencimiento_desde: Optional[date] = None,
-    vencimiento_hasta: Optional[date] = None,
-    incluir_vencidas: bool = Query(False, description="Incluir pólizas ya vencidas"),
-    proximo_vencimiento: Optional[int] = Query(
-        None,
-        ge=1,
-        le=365,
-        description="Buscar pólizas que vencen en los próximos N días",
-    ),
-    numero_poliza: Optional[str] = None,
-    tipo_seguro_id: Optional[int] = None,
-    moneda_id: Optional[int] = None,
-    suma_asegurada_min: Optional[float] = None,
-    suma_asegurada_max: Optional[float] = None,
-    prima_min: Optional[float] = None,
-    prima_max: Optional[float] = None,
-    cliente_nombre: Optional[str] = Query(
-        None, description="Buscar por nombre del cliente"
-    ),
-    cliente_apellido: Optional[str] = Query(
-        None, description="Buscar por apellido del cliente"
-    ),
-    tipo_duracion: Optional[TipoDuracion] = Query(
-        None, description="Filtrar por tipo de duración"
-    ),
+    filters: Dict[str, Any] = Depends(filtros_polizas),
     ordenar_por: Optional[str] = Query(
         None,
-        description="Campo por el cual ordenar (ej: fecha_inicio, suma_asegurada, nombres, apellidos)",
+        description="Campo por el cual ordenar: " + ", ".join(CAMPOS_ORDEN),
     ),
     orden: Optional[str] = Query("asc", regex="^(asc|desc)$"),
-    current_user: UsuarioModel = Depends(get_current_active_user),
-) -> List[Poliza]:
+    current_user: Principal = Depends(get_current_active_user),
+) -> List[PolizaListado]:
     """
     Recuperar pólizas con filtros opcionales.
-    """
-    if proximo_vencimiento is not None:
-        vencimiento_desde = date.today()
-        vencimiento_hasta = vencimiento_desde + timedelta(days=proximo_vencimiento)
-        incluir_vencidas = False  # Forzar a False cuando se usa proximo_vencimiento
-
-    validar_rango_fechas(vencimiento_desde, vencimiento_hasta)
 
-    filters = {
-        "cliente_id": cliente_id,
-        "corredor_id": corredor_id,
-        "estado": estado,
-        "fecha_inicio": fecha_inicio,
-        "fecha_fin": fecha_fin,
-        "vencimiento_desde": vencimiento_desde,
-        "vencimiento_hasta": vencimiento_hasta,
-        "incluir_vencidas": incluir_vencidas,
-        "numero_poliza": numero_poliza,
-        "tipo_seguro_id": tipo_seguro_id,
-        "moneda_id": moneda_id,
-        "suma_asegurada_min": suma_asegurada_min,
-        "suma_asegurada_max": suma_asegurada_max,
-        "prima_min": prima_min,
-        "prima_max": prima_max,
-        "cliente_nombre": cliente_nombre,
-        "cliente_apellido": cliente_apellido,
-        "tipo_duracion": tipo_duracion,
-        "ordenar_por": ordenar_por,
-        "orden": orden,
-    }
+    La respuesta incluye las cabeceras X-Next-Cursor / X-Prev-Cursor para
+    continuar el recorrido con `cursor` en lugar de `skip`.
+    """
+    if ordenar_por is not None and ordenar_por not in CAMPOS_ORDEN:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"No se puede ordenar por '{ordenar_por}'",
+        )
 
-    aplicar_filtros_por_corredor(filters, current_user)
+    filters.update({"estado": estado, "ordenar_por": ordenar_por, "orden": orden})
 
     try:
-        polizas = await poliza_crud.get_multi(db, skip=skip, limit=limit, **filters)
+        page = await poliza_crud.get_page(
+            db, cursor=cursor, skip=skip, limit=limit, **filters
+        )
     except Exception as e:
         logger.error(f"Error al obtener pólizas: {e}")
         raise HTTPException(
             status_code=HTTP_400_BAD_REQUEST, detail="Error al obtener pólizas"
         )
 
-    return polizas
+    set_pagination_headers(response, page)
+    return page.items
 
 
 # Resto de endpoints existentes (sin cambios)
@@ -377,32 +468,173 @@ async def create_poliza(
     *,
     db: AsyncSession = Depends(get_db),
     poliza_in: PolizaCreate,
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Poliza:
     """
     Crear nueva póliza.
     """
-    poliza = await poliza_crud.get_by_numero(db, numero_poliza=poliza_in.numero_poliza)
-    if poliza:
+    error = poliza_crud.asignar_corredor_alta(poliza_in, current_user)
+    if error:
+        logger.error(error)
+        raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail=error)
+
+    # La restricción única de numero_poliza resuelve el duplicado sin consultar
+    poliza = await poliza_crud.create(db, obj_in=poliza_in)
+    if not poliza:
         logger.error("Ya existe una póliza con este número")
         raise HTTPException(
-            status_code=HTTP_400_BAD_REQUEST,
+            status_code=HTTP_409_CONFLICT,
             detail="Ya existe una póliza con este número",
         )
+    return poliza
 
-    if current_user.role == "corredor":
-        if (
-            poliza_in.corredor_id
-            and poliza_in.corredor_id != current_user.corredor_numero
-        ):
-            logger.error("No puede crear pólizas para otros corredores")
-            raise HTTPException(
-                status_code=HTTP_403_FORBIDDEN,
-                detail="No puede crear pólizas para otros corredores",
-            )
-        poliza_in.corredor_id = current_user.corredor_numero
 
-    return await poliza_crud.create(db, obj_in=poliza_in)
+def _mensaje_validacion(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(parte) for parte in e['loc']) or 'fila'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+@router.post("/bulk", response_model=CargaMasivaPolizasResponse)
+@require_permissions(["polizas_crear"])
+async def create_polizas_bulk(
+    *,
+    db: AsyncSession = Depends(get_db),
+    polizas_in: List[Any] = Body(...),
+    current_user: Principal = Depends(get_current_active_user),
+) -> CargaMasivaPolizasResponse:
+    """
+    Crear pólizas en forma masiva.
+
+    Cada fila se valida por separado y el resultado indica si se creó, si era
+    un número de póliza duplicado (en la base o en la misma petición) o si
+    es inválida. Las filas válidas se insertan en lotes multi-fila.
+    """
+    if len(polizas_in) > settings.POLIZAS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=(
+                "La carga admite como máximo "
+                f"{settings.POLIZAS_BULK_MAX_ITEMS} pólizas por petición"
+            ),
+        )
+
+    resultados: List[ResultadoCargaPoliza] = []
+    validas: List[Tuple[ResultadoCargaPoliza, PolizaCreate]] = []
+    numeros_vistos = set()
+    for indice, item in enumerate(polizas_in):
+        numero = item.get("numero_poliza") if isinstance(item, dict) else None
+        resultado = ResultadoCargaPoliza(
+            indice=indice,
+            numero_poliza=numero if isinstance(numero, str) else None,
+            estado="invalida",
+        )
+        resultados.append(resultado)
+        try:
+            poliza_in = PolizaCreate.model_validate(item)
+        except ValidationError as e:
+            resultado.error = _mensaje_validacion(e)
+            continue
+        resultado.error = poliza_crud.asignar_corredor_alta(poliza_in, current_user)
+        if resultado.error:
+            continue
+        if poliza_in.numero_poliza in numeros_vistos:
+            resultado.estado = "duplicada"
+            continue
+        numeros_vistos.add(poliza_in.numero_poliza)
+        validas.append((resultado, poliza_in))
+
+    # Claves foráneas inexistentes: se marcan como inválidas antes de insertar
+    existentes = await poliza_crud.referencias_existentes(
+        db, [poliza_in for _, poliza_in in validas]
+    )
+    a_insertar = []
+    for resultado, poliza_in in validas:
+        faltantes = [
+            campo
+            for campo, valores in existentes.items()
+            if getattr(poliza_in, campo) is not None
+            and getattr(poliza_in, campo) not in valores
+        ]
+        if faltantes:
+            resultado.error = f"Referencia inexistente: {', '.join(faltantes)}"
+            continue
+        a_insertar.append((resultado, poliza_in))
+
+    creadas = await poliza_crud.create_many(
+        db,
+        objs_in=[poliza_in for _, poliza_in in a_insertar],
+        tamano_lote=settings.POLIZAS_BULK_CHUNK_SIZE,
+    )
+    for resultado, poliza_in in a_insertar:
+        resultado.id = creadas.get(poliza_in.numero_poliza)
+        resultado.estado = "creada" if resultado.id is not None else "duplicada"
+
+    conteo = Counter(resultado.estado for resultado in resultados)
+    logger.info(
+        "Carga masiva de pólizas: %s creadas, %s duplicadas, %s inválidas",
+        conteo["creada"],
+        conteo["duplicada"],
+        conteo["invalida"],
+    )
+    return CargaMasivaPolizasResponse(
+        creadas=conteo["creada"],
+        duplicadas=conteo["duplicada"],
+        invalidas=conteo["invalida"],
+        resultados=resultados,
+    )
+
+
+@router.post("/importar", response_model=ResultadoImportacionPolizas)
+@require_permissions(["polizas_crear"])
+async def importar_planilla_polizas(
+    *,
+    db: AsyncSession = Depends(get_db),
+    archivo: UploadFile = File(..., description="Planilla XLSX de pólizas"),
+    tipo_seguro: Optional[str] = Query(
+        None, description="Tipo de seguro (código o nombre) si la planilla no lo trae"
+    ),
+    fecha_inicio: Optional[date] = Query(
+        None, description="Fecha de inicio si la planilla no la trae"
+    ),
+    fecha_vencimiento: Optional[date] = Query(
+        None, description="Fecha de vencimiento si la planilla no la trae"
+    ),
+    current_user: Principal = Depends(get_current_active_user),
+) -> ResultadoImportacionPolizas:
+    """
+    Importar una planilla XLSX de pólizas (por ejemplo, la cartera mensual de
+    una aseguradora o una exportación de este sistema). Las pólizas con número
+    existente se omiten y las filas inválidas se informan en el resultado.
+
+    El tipo de seguro y las fechas indicados se usan en las filas que no los
+    tienen.
+    """
+    por_defecto = {
+        campo: valor
+        for campo, valor in (
+            ("tipo_seguro", tipo_seguro),
+            ("fecha_inicio", fecha_inicio),
+            ("fecha_vencimiento", fecha_vencimiento),
+        )
+        if valor is not None
+    }
+    try:
+        resultado = await importar_polizas(
+            db, archivo.file, alcance=current_user, por_defecto=por_defecto
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+    logger.info(
+        "Importación de %s: %s filas, %s creadas, %s duplicadas, %s inválidas",
+        archivo.filename,
+        resultado.filas,
+        resultado.creadas,
+        resultado.duplicadas,
+        resultado.invalidas,
+    )
+    return resultado
 
 
 @router.get("/{poliza_id}", response_model=PolizaDetalle)
@@ -410,17 +642,14 @@ async def create_poliza(
 async def get_poliza(
     poliza_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> PolizaDetalle:
     """
     Obtener una póliza específica por ID.
     """
-    poliza = await poliza_crud.get(db, id=poliza_id)
+    poliza = await poliza_crud.get(db, id=poliza_id, alcance=current_user)
     if not poliza:
-        logger.error("Póliza no encontrada")
-        raise HTTPException(status_code=404, detail="Póliza no encontrada")
-
-    validar_permisos_corredor(poliza, current_user, "ver")
+        raise await error_poliza_fuera_de_alcance(db, poliza_id, "ver")
     return poliza
 
 
@@ -431,18 +660,17 @@ async def update_poliza(
     db: AsyncSession = Depends(get_db),
     poliza_id: int,
     poliza_in: PolizaUpdate,
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Poliza:
     """
     Actualizar una póliza existente.
     """
-    poliza = await poliza_crud.get(db, id=poliza_id)
+    poliza = await poliza_crud.update(
+        db, id=poliza_id, obj_in=poliza_in, alcance=current_user
+    )
     if not poliza:
-        logger.error("Póliza no encontrada")
-        raise HTTPException(status_code=404, detail="Póliza no encontrada")
-
-    validar_permisos_corredor(poliza, current_user, "modificar")
-    return await poliza_crud.update(db, db_obj=poliza, obj_in=poliza_in)
+        raise await error_poliza_fuera_de_alcance(db, poliza_id, "modificar")
+    return poliza
 
 
 @router.delete("/{poliza_id}", response_model=Poliza)
@@ -451,129 +679,155 @@ async def delete_poliza(
     *,
     db: AsyncSession = Depends(get_db),
     poliza_id: int,
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Poliza:
     """
     Eliminar una póliza.
     """
-    poliza = await poliza_crud.get(db, id=poliza_id)
+    poliza = await poliza_crud.delete(db, id=poliza_id, alcance=current_user)
     if not poliza:
-        logger.error("Póliza no encontrada")
-        raise HTTPException(status_code=404, detail="Póliza no encontrada")
+        raise await error_poliza_fuera_de_alcance(db, poliza_id, "eliminar")
+    return poliza
 
-    validar_permisos_corredor(poliza, current_user, "eliminar")
-    return await poliza_crud.delete(db, id=poliza_id)
+
+def _encolar_exportacion(
+    formato: str, filters: Dict[str, Any], current_user: Principal
+) -> JSONResponse:
+    """
+    Encola la exportación en segundo plano y responde 202 con el estado del
+    trabajo; el estado se consulta en /exports/{id}.
+    """
+    try:
+        trabajo = gestor_exportaciones.crear(current_user.id, formato, filters)
+    except LimiteExportacionesError as e:
+        raise HTTPException(status_code=HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+    return JSONResponse(
+        ExportacionEstado.model_validate(trabajo).model_dump(mode="json"),
+        status_code=HTTP_202_ACCEPTED,
+        headers={"Location": f"{settings.API_V1_STR}/exports/{trabajo.id}"},
+    )
 
 
 @router.get("/exportar/excel/")
 @require_permissions(["polizas_ver"])
 async def exportar_polizas_excel(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     estado: Optional[str] = Query(
         "activa", description="Estado de las pólizas a incluir"
     ),
-    fecha_inicio: Optional[date] = Query(
-        None, description="Fecha de inicio para filtrar"
+    asincrono: bool = Query(
+        False, description="Generar el archivo en segundo plano y devolver el trabajo"
     ),
-    fecha_fin: Optional[date] = Query(None, description="Fecha fin para filtrar"),
-    current_user: UsuarioModel = Depends(get_current_active_user),
-) -> StreamingResponse:
+    filters: Dict[str, Any] = Depends(filtros_polizas),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Response:
     """
-    Exportar pólizas a un archivo Excel.
+    Exportar pólizas a un archivo Excel, sin límite de filas.
     """
-    filters = {"estado": estado, "fecha_inicio": fecha_inicio, "fecha_fin": fecha_fin}
-    aplicar_filtros_por_corredor(filters, current_user)
+    filters["estado"] = estado
+    if asincrono:
+        return _encolar_exportacion("excel", filters, current_user)
 
-    polizas = await poliza_crud.get_multi(db, **filters)
-
-    # Crear un libro de trabajo de Excel
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Pólizas"
+    archivo = nuevo_archivo_temporal()
+    try:
+        await exportar_excel(db, archivo, **filters)
+    except BaseException:
+        archivo.close()
+        raise
 
-    # Agregar encabezados
-    ws.append(
-        ["ID", "Número de Póliza", "Cliente", "Estado", "Suma Asegurada", "Prima"]
+    return StreamingResponse(
+        iterar_archivo(archivo),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": "attachment; filename=polizas.xlsx"},
     )
 
-    # Agregar datos de pólizas
-    for poliza in polizas:
-        ws.append(
-            [
-                poliza.id,
-                poliza.numero_poliza,
-                poliza.cliente_rel.nombres + " " + poliza.cliente_rel.apellidos,
-                poliza.estado_poliza,
-                poliza.suma_asegurada,
-                poliza.prima,
-            ]
-        )
-
-    # Guardar el archivo en memoria
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
 
+def _respuesta_copia(formato: str, filters: Dict[str, Any]) -> StreamingResponse:
+    """Respuesta que reenvía la salida de COPY de las pólizas filtradas."""
     return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=polizas.xlsx"},
+        exportar_copia(formato, **filters),
+        media_type=MEDIA_TYPES_COPIA[formato],
+        headers={
+            "Content-Disposition": f"attachment; filename=polizas.{formato}"
+        },
     )
 
 
+@router.get("/exportar/csv/")
+@require_permissions(["polizas_ver"])
+async def exportar_polizas_csv(
+    estado: Optional[str] = Query(
+        "activa", description="Estado de las pólizas a incluir"
+    ),
+    asincrono: bool = Query(
+        False, description="Generar el archivo en segundo plano y devolver el trabajo"
+    ),
+    filters: Dict[str, Any] = Depends(filtros_polizas),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Response:
+    """
+    Exportar pólizas a CSV (con encabezado), sin límite de filas. PostgreSQL
+    genera el archivo con COPY y se envía a medida que se produce.
+    """
+    filters["estado"] = estado
+    if asincrono:
+        return _encolar_exportacion("csv", filters, current_user)
+    return _respuesta_copia("csv", filters)
+
+
+@router.get("/exportar/ndjson/")
+@require_permissions(["polizas_ver"])
+async def exportar_polizas_ndjson(
+    estado: Optional[str] = Query(
+        "activa", description="Estado de las pólizas a incluir"
+    ),
+    asincrono: bool = Query(
+        False, description="Generar el archivo en segundo plano y devolver el trabajo"
+    ),
+    filters: Dict[str, Any] = Depends(filtros_polizas),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Response:
+    """
+    Exportar pólizas en NDJSON (un objeto JSON por línea), sin límite de
+    filas. PostgreSQL genera cada línea con COPY y se envía a medida que se
+    produce.
+    """
+    filters["estado"] = estado
+    if asincrono:
+        return _encolar_exportacion("ndjson", filters, current_user)
+    return _respuesta_copia("ndjson", filters)
+
+
 @router.get("/exportar/pdf/")
 @require_permissions(["polizas_ver"])
 async def exportar_polizas_pdf(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     estado: Optional[str] = Query(
         "activa", description="Estado de las pólizas a incluir"
     ),
-    fecha_inicio: Optional[date] = Query(
-        None, description="Fecha de inicio para filtrar"
+    asincrono: bool = Query(
+        False, description="Generar el archivo en segundo plano y devolver el trabajo"
     ),
-    fecha_fin: Optional[date] = Query(None, description="Fecha fin para filtrar"),
-    current_user: UsuarioModel = Depends(get_current_active_user),
-) -> StreamingResponse:
-    """
-    Exportar pólizas a un archivo PDF.
-    """
-    filters = {"estado": estado, "fecha_inicio": fecha_inicio, "fecha_fin": fecha_fin}
-    aplicar_filtros_por_corredor(filters, current_user)
-
-    polizas = await poliza_crud.get_multi(db, **filters)
-
-    # Crear un archivo PDF en memoria
-    output = BytesIO()
-    p = canvas.Canvas(output, pagesize=letter)
-    width, height = letter
-
-    # Agregar encabezados
-    p.drawString(100, height - 50, "ID")
-    p.drawString(200, height - 50, "Número de Póliza")
-    p.drawString(300, height - 50, "Cliente")
-    p.drawString(400, height - 50, "Estado")
-    p.drawString(500, height - 50, "Suma Asegurada")
-    p.drawString(600, height - 50, "Prima")
-
-    # Agregar datos de pólizas
-    y = height - 70
-    for poliza in polizas:
-        p.drawString(100, y, str(poliza.id))
-        p.drawString(200, y, poliza.numero_poliza)
-        p.drawString(
-            300, y, f"{poliza.cliente_rel.nombres} {poliza.cliente_rel.apellidos}"
-        )
-        p.drawString(400, y, poliza.estado_poliza)
-        p.drawString(500, y, str(poliza.suma_asegurada))
-        p.drawString(600, y, str(poliza.prima))
-        y -= 20  # Espacio entre filas
+    filters: Dict[str, Any] = Depends(filtros_polizas),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Response:
+    """
+    Exportar pólizas a un reporte PDF paginado, con totales por página.
+    """
+    filters["estado"] = estado
+    if asincrono:
+        return _encolar_exportacion("pdf", filters, current_user)
 
-    p.showPage()
-    p.save()
-    output.seek(0)
+    ruta = nueva_ruta_temporal(".pdf")
+    try:
+        await exportar_pdf(db, ruta, **filters)
+    except BaseException:
+        eliminar_archivo(ruta)
+        raise
 
-    return StreamingResponse(
-        output,
+    return FileResponse(
+        ruta,
         media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=polizas.pdf"},
+        filename="polizas.pdf",
+        background=BackgroundTask(eliminar_archivo, ruta),
     )
@@ -1,10 +1,13 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_cursor, set_pagination_headers
+from app.db.crud.pagination import Cursor
 from app.db.crud.tipo_documento import tipo_documento_crud
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.schemas.tipo_documento import (
     TipoDocumento,
     TipoDocumentoCreate,
@@ -16,13 +19,18 @@ router = APIRouter()
 
 @router.get("/", response_model=List[TipoDocumento])
 async def get_tipos_documento(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
 ) -> Any:
     """
     Recuperar tipos de documento.
     """
-    tipos_documento = await tipo_documento_crud.get_multi(db, skip=skip, limit=limit)
-    return tipos_documento
+    page = await tipo_documento_crud.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    set_pagination_headers(response, page)
+    return page.items
 
 
 @router.post("/", response_model=TipoDocumento)
@@ -38,7 +46,7 @@ async def create_tipo_documento(
 
 @router.get("/{tipo_documento_id}", response_model=TipoDocumento)
 async def get_tipo_documento(
-    tipo_documento_id: int, db: AsyncSession = Depends(get_db)
+    tipo_documento_id: int, db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Obtener tipo de documento por ID.
@@ -59,12 +67,11 @@ async def update_tipo_documento(
     """
     Actualizar tipo de documento.
     """
-    tipo_documento = await tipo_documento_crud.get(db, id=tipo_documento_id)
+    tipo_documento = await tipo_documento_crud.update_by_id(
+        db, id=tipo_documento_id, obj_in=tipo_documento_in
+    )
     if not tipo_documento:
         raise HTTPException(status_code=404, detail="Tipo de documento no encontrado")
-    tipo_documento = await tipo_documento_crud.update(
-        db, db_obj=tipo_documento, obj_in=tipo_documento_in
-    )
     return tipo_documento
 
 
@@ -75,8 +82,16 @@ async def delete_tipo_documento(
     """
     Eliminar tipo de documento.
     """
-    tipo_documento = await tipo_documento_crud.get(db, id=tipo_documento_id)
+    try:
+        tipo_documento = await tipo_documento_crud.delete(db, id=tipo_documento_id)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail=(
+                "No se puede eliminar el tipo de documento: "
+                "tiene registros asociados"
+            ),
+        )
     if not tipo_documento:
         raise HTTPException(status_code=404, detail="Tipo de documento no encontrado")
-    tipo_documento = await tipo_documento_crud.delete(db, id=tipo_documento_id)
     return tipo_documento
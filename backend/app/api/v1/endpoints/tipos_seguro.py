@@ -1,10 +1,13 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_cursor, set_pagination_headers
+from app.db.crud.pagination import Cursor
 from app.db.crud.tipo_seguro import tipo_seguro_crud
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.schemas.tipo_seguro import TipoSeguro, TipoSeguroCreate, TipoSeguroUpdate
 
 router = APIRouter()
@@ -12,13 +15,18 @@ router = APIRouter()
 
 @router.get("/", response_model=List[TipoSeguro])
 async def get_tipos_seguro(
-    db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
 ) -> Any:
     """
     Recuperar tipos de seguro.
     """
-    tipos_seguro = await tipo_seguro_crud.get_multi(db, skip=skip, limit=limit)
-    return tipos_seguro
+    page = await tipo_seguro_crud.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    set_pagination_headers(response, page)
+    return page.items
 
 
 @router.post("/", response_model=TipoSeguro)
@@ -34,7 +42,7 @@ async def create_tipo_seguro(
 
 @router.get("/{tipo_seguro_id}", response_model=TipoSeguro)
 async def get_tipo_seguro(
-    tipo_seguro_id: int, db: AsyncSession = Depends(get_db)
+    tipo_seguro_id: int, db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Obtener tipo de seguro por ID.
@@ -55,12 +63,11 @@ async def update_tipo_seguro(
     """
     Actualizar tipo de seguro.
     """
-    tipo_seguro = await tipo_seguro_crud.get(db, id=tipo_seguro_id)
+    tipo_seguro = await tipo_seguro_crud.update_by_id(
+        db, id=tipo_seguro_id, obj_in=tipo_seguro_in
+    )
     if not tipo_seguro:
         raise HTTPException(status_code=404, detail="Tipo de seguro no encontrado")
-    tipo_seguro = await tipo_seguro_crud.update(
-        db, db_obj=tipo_seguro, obj_in=tipo_seguro_in
-    )
     return tipo_seguro
 
 
@@ -71,8 +78,13 @@ async def delete_tipo_seguro(
     """
     Eliminar tipo de seguro.
     """
-    tipo_seguro = await tipo_seguro_crud.get(db, id=tipo_seguro_id)
+    try:
+        tipo_seguro = await tipo_seguro_crud.delete(db, id=tipo_seguro_id)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail="No se puede eliminar el tipo de seguro: tiene registros asociados",
+        )
     if not tipo_seguro:
         raise HTTPException(status_code=404, detail="Tipo de seguro no encontrado")
-    tipo_seguro = await tipo_seguro_crud.delete(db, id=tipo_seguro_id)
     return tipo_seguro
@@ -1,13 +1,16 @@
-from typing import Any, List
+from typing import Any, List, Optional, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, get_cursor, set_pagination_headers
 from app.core.permissions import require_permissions
+from app.core.principal import Principal
 from app.core.roles import Role
 from app.db.crud.usuario import usuario_crud
 from app.db.crud.corredor import corredor_crud
+from app.db.crud.pagination import Cursor
 from app.db.database import get_db
 from app.db.models.usuario import Usuario as UsuarioModel
 from app.schemas.usuario import Usuario, UsuarioCreate, UsuarioUpdate
@@ -15,18 +18,47 @@ from app.schemas.usuario import Usuario, UsuarioCreate, UsuarioUpdate
 router = APIRouter()
 
 
+def criterio_admin(current_user: Principal) -> Sequence[Any]:
+    """
+    Solo los administradores pueden modificar o eliminar otros
+    administradores: para el resto se excluyen de la sentencia.
+    """
+    if current_user.role == Role.ADMIN:
+        return ()
+    return (UsuarioModel.role != Role.ADMIN.value,)
+
+
+async def error_usuario_no_afectado(
+    db: AsyncSession, usuario_id: int, accion: str
+) -> HTTPException:
+    """
+    Error cuando una sentencia con criterio_admin no afectó ninguna fila:
+    403 si el usuario existe (es administrador), 404 si no.
+    """
+    if await usuario_crud.exists(db, id=usuario_id):
+        return HTTPException(
+            status_code=403,
+            detail=f"Solo los administradores pueden {accion} otros administradores",
+        )
+    return HTTPException(status_code=404, detail="Usuario no encontrado")
+
+
 @router.get("/", response_model=List[Usuario])
 @require_permissions(["usuarios_ver"])
 async def get_usuarios(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
     db: AsyncSession = Depends(get_db),
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Recuperar usuarios.
     """
-    return await usuario_crud.get_multi(db, skip=skip, limit=limit)
+    page = await usuario_crud.get_page(db, cursor=cursor, skip=skip, limit=limit)
+    set_pagination_headers(response, page)
+    return page.items
 
 
 @router.post("/", response_model=Usuario)
@@ -35,7 +67,7 @@ async def create_usuario(
     *,
     db: AsyncSession = Depends(get_db),
     usuario_in: UsuarioCreate,
-    current_user: UsuarioModel = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Crear nuevo usuario.
@@ -71,7 +103,7 @@ async def create_usuario(
 async def get_usuario(
     usuario_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: UsuarioModel = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Obtener usuario por ID.
@@ -89,22 +121,11 @@ async def update_usuario(
     db: AsyncSession = Depends(get_db),
     usuario_id: int,
     usuario_in: UsuarioUpdate,
-    current_user: UsuarioModel = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Actualizar usuario.
     """
-    usuario = await usuario_crud.get(db, id=usuario_id)
-    if not usuario:
-        raise HTTPException(status_code=404, detail="Usuario no encontrado")
-
-    # Solo los administradores pueden modificar otros administradores
-    if usuario.role == Role.ADMIN and current_user.role != Role.ADMIN:
-        raise HTTPException(
-            status_code=403,
-            detail="Solo los administradores pueden modificar otros administradores",
-        )
-
     # Si se está actualizando a un usuario corredor, validar el número de corredor y su existencia
     if usuario_in.role == Role.CORREDOR:
         if not usuario_in.corredor_numero:
@@ -121,7 +142,12 @@ async def update_usuario(
                 detail=f"No se encontró un corredor con el número {usuario_in.corredor_numero}",
             )
 
-    return await usuario_crud.update(db, db_obj=usuario, obj_in=usuario_in)
+    usuario = await usuario_crud.update(
+        db, id=usuario_id, obj_in=usuario_in, criteria=criterio_admin(current_user)
+    )
+    if not usuario:
+        raise await error_usuario_no_afectado(db, usuario_id, "modificar")
+    return usuario
 
 
 @router.delete("/{usuario_id}", response_model=Usuario)
@@ -130,20 +156,20 @@ async def delete_usuario(
     *,
     db: AsyncSession = Depends(get_db),
     usuario_id: int,
-    current_user: UsuarioModel = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Any:
     """
     Eliminar usuario.
     """
-    usuario = await usuario_crud.get(db, id=usuario_id)
-    if not usuario:
-        raise HTTPException(status_code=404, detail="Usuario no encontrado")
-
-    # Solo los administradores pueden eliminar otros administradores
-    if usuario.role == Role.ADMIN and current_user.role != Role.ADMIN:
+    try:
+        usuario = await usuario_crud.delete(
+            db, id=usuario_id, criteria=criterio_admin(current_user)
+        )
+    except IntegrityError:
         raise HTTPException(
-            status_code=403,
-            detail="Solo los administradores pueden eliminar otros administradores",
+            status_code=409,
+            detail="No se puede eliminar el usuario: tiene registros asociados",
         )
-
-    return await usuario_crud.remove(db, id=usuario_id)
+    if not usuario:
+        raise await error_usuario_no_afectado(db, usuario_id, "eliminar")
+    return usuario
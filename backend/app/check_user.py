@@ -1,11 +1,11 @@
 import asyncio
 
 from app.db.crud.usuario import usuario_crud
-from app.db.session import async_session
+from app.db.database import AsyncSessionLocal
 
 
 async def check_user():
-    async with async_session() as db:
+    async with AsyncSessionLocal() as db:
         user = await usuario_crud.get_by_username(db, "rponce")
         print(
             f"Usuario: {user.username}, Role: {user.role}, Is Superuser: {user.is_superuser}"
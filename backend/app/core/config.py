@@ -10,11 +10,21 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
     DB_ECHO_LOG: bool = False
+    # Agrega la cabecera X-DB-Statements con las sentencias SQL de cada petición
+    DB_COUNT_STATEMENTS: bool = False
 
     # JWT
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     ALGORITHM: str = "HS256"
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Caché en memoria del usuario autenticado y de los tokens decodificados
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    # Factor de trabajo de bcrypt; al subirlo, los hashes se regeneran al iniciar sesión
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    # Hilos dedicados a calcular hashes fuera del event loop
+    PASSWORD_HASH_WORKERS: int = 4
 
     # PostgreSQL
     POSTGRES_SERVER: str = "postgres"
@@ -24,6 +34,16 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_PORT: str = "5432"
     DATABASE_URL: Optional[PostgresDsn] = None
+    # Réplica de solo lectura (opcional) para listados, estadísticas y catálogos
+    DATABASE_REPLICA_URL: Optional[PostgresDsn] = None
+
+    # Pool de conexiones
+    DB_POOL_ENABLED: bool = True  # False usa NullPool (scripts, migraciones)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # Segundos antes de reciclar una conexión
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_TIMEOUT: float = 30.0  # Segundos de espera para obtener una conexión
 
     # CORS
     BACKEND_CORS_ORIGINS: str
@@ -44,6 +64,34 @@ class Settings(BaseSettings):
     FIRST_SUPERUSER: str
     FIRST_SUPERUSER_PASSWORD: str
 
+    # Cargas masivas
+    POLIZAS_BULK_MAX_ITEMS: int = 5000
+    POLIZAS_BULK_CHUNK_SIZE: int = 500  # Filas por INSERT multi-fila
+    CLIENTES_BULK_MAX_ITEMS: int = 5000
+    CLIENTES_BULK_CHUNK_SIZE: int = 500
+    IMPORTACION_LOTE: int = 1000  # Filas de planilla validadas y copiadas por vez
+    IMPORTACION_MAX_ERRORES: int = 100  # Errores de fila detallados en el resultado
+
+    # Exportaciones
+    EXPORTACION_LOTE: int = 2000  # Filas leídas del cursor por vez
+    EXPORTACION_MEMORIA_MAX: int = 8 * 1024 * 1024  # Luego el archivo va a disco
+    EXPORTACION_CHUNK: int = 64 * 1024  # Bytes por fragmento de la respuesta
+    EXPORTACION_COPY_BUFFER: int = 16  # Fragmentos de COPY en espera de envío
+    PDF_WORKERS: int = 2  # Procesos para renderizar reportes PDF
+
+    # Exportaciones en segundo plano
+    EXPORTACION_DIR: Optional[str] = None  # Por omisión, en el directorio temporal
+    EXPORTACION_WORKERS: int = 2  # Trabajos que generan archivos a la vez
+    EXPORTACION_TRABAJOS_MAX: int = 20  # Trabajos pendientes o en curso
+    EXPORTACION_TRABAJOS_POR_USUARIO: int = 2
+    EXPORTACION_TTL: int = 60 * 60  # Segundos que se conserva un archivo generado
+    EXPORTACION_LIMPIEZA_INTERVALO: int = 5 * 60
+
+    # Búsqueda por similitud (pg_trgm)
+    BUSQUEDA_TIMEOUT_MS: int = 300  # Presupuesto de latencia por búsqueda
+    BUSQUEDA_MIN_CARACTERES: int = 3  # Los trigramas requieren al menos 3
+    BUSQUEDA_LIMITE_MAX: int = 50
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
@@ -63,6 +111,14 @@ class Settings(BaseSettings):
             )
         )
 
+    @property
+    def SQLALCHEMY_REPLICA_URI(self) -> Optional[str]:
+        if not self.DATABASE_REPLICA_URL:
+            return None
+        return str(self.DATABASE_REPLICA_URL).replace(
+            "postgresql://", "postgresql+asyncpg://"
+        )
+
     model_config = {
         "case_sensitive": True,
         "env_file": ".env",
@@ -3,7 +3,7 @@ from typing import Callable, List
 
 from fastapi import HTTPException
 
-from .roles import Role, RolePermissions
+from .roles import RolePermissions
 
 
 def require_permissions(required_permissions: List[str]):
@@ -11,12 +11,17 @@ def require_permissions(required_permissions: List[str]):
     Decorador para verificar si un usuario tiene los permisos necesarios
     para acceder a un endpoint.
 
+    Los permisos se compilan a una máscara de bits al decorar el endpoint, así
+    que un nombre inexistente falla al importar el módulo y cada petición solo
+    hace un AND con la máscara del usuario.
+
     Args:
         required_permissions: Lista de permisos requeridos
 
     Raises:
         HTTPException: Si el usuario no tiene los permisos necesarios
     """
+    required_mask = RolePermissions.to_mask(required_permissions)
 
     def decorator(func: Callable):
         @wraps(func)
@@ -28,11 +33,8 @@ def require_permissions(required_permissions: List[str]):
                     status_code=403, detail="No se encontró el usuario actual"
                 )
 
-            # Obtener los permisos del rol del usuario
-            user_permissions = RolePermissions.get_permissions(Role(current_user.role))
-
             # Verificar si el usuario tiene todos los permisos requeridos
-            if not all(perm in user_permissions for perm in required_permissions):
+            if current_user.permisos & required_mask != required_mask:
                 raise HTTPException(
                     status_code=403,
                     detail="No tiene los permisos necesarios para realizar esta acción",
@@ -0,0 +1,87 @@
+"""
+Usuario autenticado (principal) y las cachés que evitan resolverlo en cada
+petición.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .config import settings
+from .roles import RolePermissions
+from .utils import TTLCache
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Datos del usuario autenticado que necesitan los endpoints."""
+
+    id: int
+    role: str
+    corredor_numero: Optional[int]
+    is_active: bool
+    is_superuser: bool
+    permisos: int = 0  # Máscara de bits de Permiso
+    token_version: int = 0
+
+    @classmethod
+    def from_usuario(cls, usuario) -> "Principal":
+        return cls(
+            id=usuario.id,
+            role=usuario.role,
+            corredor_numero=usuario.corredor_numero,
+            is_active=bool(usuario.is_active),
+            is_superuser=bool(usuario.is_superuser),
+            permisos=RolePermissions.get_mask(usuario.role),
+            token_version=usuario.token_version or 0,
+        )
+
+    @classmethod
+    def from_claims(cls, payload: Dict[str, Any]) -> "Principal":
+        """
+        Reconstruye el principal desde un token emitido con `to_claims`.
+        Solo se emiten tokens a usuarios activos.
+        """
+        return cls(
+            id=int(payload["sub"]),
+            role=payload["role"],
+            corredor_numero=payload.get("corredor_numero"),
+            is_active=True,
+            is_superuser=bool(payload.get("is_superuser")),
+            permisos=int(payload["perms"]),
+            token_version=int(payload["ver"]),
+        )
+
+    def to_claims(self) -> Dict[str, Any]:
+        """Claims del token de acceso (además de sub y exp)."""
+        return {
+            "role": self.role,
+            "corredor_numero": self.corredor_numero,
+            "is_superuser": self.is_superuser,
+            "perms": self.permisos,
+            "ver": self.token_version,
+        }
+
+
+# Principal por id de usuario. Cada worker tiene su propia copia: los cambios
+# hechos en otro proceso se ven, como mucho, tras AUTH_CACHE_TTL_SECONDS.
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+# Principal (o id de usuario, para tokens sin claims) por hash (sha256) del
+# token JWT ya validado
+token_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+# Versión vigente de los tokens de cada usuario activo (None si no existe o
+# está inactivo). Es la única consulta que queda en el camino autenticado.
+token_version_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+def invalidar_principal(user_id: int) -> None:
+    """Descarta el principal cacheado de un usuario modificado o eliminado."""
+    principal_cache.pop(user_id)
+    token_version_cache.pop(user_id)
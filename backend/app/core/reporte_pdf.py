@@ -0,0 +1,195 @@
+"""
+Reporte PDF paginado de pólizas (reportlab platypus).
+
+Pensado para correr en un proceso aparte: lee las filas de un CSV temporal y
+arma el documento con una tabla por página, encabezado, pie y totales por
+página. Solo depende de la biblioteca estándar y de reportlab, para que los
+procesos del pool arranquen livianos.
+"""
+
+import csv
+from datetime import datetime
+from itertools import islice
+from typing import Iterator, List, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import (
+    Flowable,
+    PageBreak,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
+
+ENCABEZADOS = ["ID", "Número de Póliza", "Cliente", "Estado", "Suma Asegurada", "Prima"]
+ANCHOS = [2 * cm, 4.5 * cm, 7.5 * cm, 3 * cm, 4 * cm, 3.5 * cm]
+FILAS_POR_PAGINA = 28
+ALTO_FILA = 0.55 * cm
+LARGO_MAXIMO = 45  # Caracteres por celda de texto (las celdas no se ajustan)
+
+COLOR_FILA_ALTERNA = colors.HexColor("#f0f3f7")
+
+ESTILO_TABLA = TableStyle(
+    [
+        ("FONT", (0, 0), (-1, -1), "Helvetica", 8),
+        ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", 8),
+        ("FONT", (0, -1), (-1, -1), "Helvetica-Bold", 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f3b5c")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -2), [colors.white, COLOR_FILA_ALTERNA]),
+        ("LINEABOVE", (0, -1), (-1, -1), 0.75, colors.black),
+        ("ALIGN", (4, 0), (5, -1), "RIGHT"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]
+)
+
+
+def _monto(valor: float) -> str:
+    return f"{valor:,.2f}"
+
+
+def _texto(valor: str) -> str:
+    if len(valor) <= LARGO_MAXIMO:
+        return valor
+    return valor[: LARGO_MAXIMO - 1] + "…"
+
+
+def _leer_paginas(ruta_datos: str) -> Iterator[List[List[str]]]:
+    """Filas del CSV agrupadas de a FILAS_POR_PAGINA."""
+    with open(ruta_datos, newline="", encoding="utf-8") as archivo:
+        filas = csv.reader(archivo)
+        while True:
+            pagina = list(islice(filas, FILAS_POR_PAGINA))
+            if not pagina:
+                return
+            yield pagina
+
+
+def _tabla_pagina(pagina: List[List[str]]) -> Tuple[Table, float, float]:
+    """Tabla de una página con su fila de totales, y los totales calculados."""
+    suma = sum(float(fila[4] or 0) for fila in pagina)
+    prima = sum(float(fila[5] or 0) for fila in pagina)
+    datos = [ENCABEZADOS]
+    datos.extend(
+        [
+            fila[0],
+            _texto(fila[1]),
+            _texto(fila[2]),
+            fila[3],
+            _monto(float(fila[4] or 0)),
+            _monto(float(fila[5] or 0)),
+        ]
+        for fila in pagina
+    )
+    total = f"Total de la página ({len(pagina)} pólizas)"
+    datos.append(["", "", total, "", _monto(suma), _monto(prima)])
+    tabla = Table(datos, colWidths=ANCHOS, rowHeights=ALTO_FILA, style=ESTILO_TABLA)
+    return tabla, suma, prima
+
+
+class _HistoriaPerezosa(list):
+    """
+    Lista de flowables que se completa desde un iterador a medida que
+    platypus la consume.
+
+    doc.build consulta len() antes de cada flowable: al quedar vacía se toma
+    el siguiente del iterador, así en memoria solo está la página en curso y
+    no el documento entero.
+    """
+
+    def __init__(self, flowables: Iterator[Flowable]):
+        super().__init__()
+        self._flowables = flowables
+
+    def __len__(self) -> int:
+        if not super().__len__():
+            siguiente = next(self._flowables, None)
+            if siguiente is not None:
+                self.append(siguiente)
+        return super().__len__()
+
+
+def _historia(ruta_datos: str, totales: List[float]) -> Iterator[Flowable]:
+    """
+    Flowables del reporte: una tabla por página y el resumen final. Acumula
+    en `totales` la cantidad de pólizas, la suma asegurada y la prima.
+    """
+    for pagina in _leer_paginas(ruta_datos):
+        if totales[0]:
+            yield PageBreak()
+        tabla, suma, prima = _tabla_pagina(pagina)
+        totales[0] += len(pagina)
+        totales[1] += suma
+        totales[2] += prima
+        yield tabla
+
+    cantidad, suma_total, prima_total = totales
+    if not cantidad:
+        mensaje = "No hay pólizas para los filtros seleccionados."
+        yield Paragraph(mensaje, getSampleStyleSheet()["Normal"])
+        return
+    yield Spacer(1, 0.5 * cm)
+    yield Table(
+        [
+            ["Pólizas", "Suma asegurada total", "Prima total"],
+            [str(cantidad), _monto(suma_total), _monto(prima_total)],
+        ],
+        colWidths=[4 * cm, 5 * cm, 5 * cm],
+        style=TableStyle(
+            [
+                ("FONT", (0, 0), (-1, -1), "Helvetica-Bold", 9),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "RIGHT"),
+            ]
+        ),
+        hAlign="RIGHT",
+    )
+
+
+def renderizar_reporte(ruta_datos: str, ruta_pdf: str, titulo: str) -> Tuple[int, int]:
+    """
+    Genera el reporte en `ruta_pdf` a partir del CSV `ruta_datos` (columnas:
+    id, número de póliza, cliente, estado, suma asegurada y prima).
+
+    Las páginas se arman de a una mientras se maquetan: la memoria no crece
+    con las tablas, solo con el contenido ya dibujado de cada página (unos
+    KB), que reportlab conserva hasta escribir el archivo.
+
+    Devuelve la cantidad de pólizas y de páginas.
+    """
+    generado = datetime.now().strftime("%d/%m/%Y %H:%M")
+
+    def dibujar_pagina(lienzo, doc):
+        ancho, alto = doc.pagesize
+        lienzo.saveState()
+        lienzo.setFont("Helvetica-Bold", 12)
+        lienzo.drawString(doc.leftMargin, alto - 1.3 * cm, titulo)
+        lienzo.setFont("Helvetica", 8)
+        lienzo.drawRightString(
+            ancho - doc.rightMargin, alto - 1.3 * cm, f"Generado el {generado}"
+        )
+        lienzo.drawCentredString(ancho / 2, 0.9 * cm, f"Página {doc.page}")
+        lienzo.restoreState()
+
+    # Cantidad de pólizas, suma asegurada y prima
+    totales = [0, 0.0, 0.0]
+    doc = SimpleDocTemplate(
+        ruta_pdf,
+        pagesize=landscape(letter),
+        leftMargin=1.5 * cm,
+        rightMargin=1.5 * cm,
+        topMargin=2 * cm,
+        bottomMargin=1.6 * cm,
+        title=titulo,
+    )
+    doc.build(
+        _HistoriaPerezosa(_historia(ruta_datos, totales)),
+        onFirstPage=dibujar_pagina,
+        onLaterPages=dibujar_pagina,
+    )
+    return totales[0], doc.page
@@ -1,5 +1,5 @@
-from enum import Enum
-from typing import Set
+from enum import Enum, IntFlag
+from typing import Iterable, Set
 
 
 class Role(str, Enum):
@@ -8,6 +8,26 @@ class Role(str, Enum):
     ASISTENTE = "asistente"
 
 
+class Permiso(IntFlag):
+    """Permisos como bits, para guardarlos en el token y compararlos con AND."""
+
+    USUARIOS_CREAR = 1 << 0
+    USUARIOS_VER = 1 << 1
+    USUARIOS_EDITAR = 1 << 2
+    USUARIOS_ELIMINAR = 1 << 3
+    POLIZAS_CREAR = 1 << 4
+    POLIZAS_VER = 1 << 5
+    POLIZAS_EDITAR = 1 << 6
+    POLIZAS_ELIMINAR = 1 << 7
+    CLIENTES_CREAR = 1 << 8
+    CLIENTES_VER = 1 << 9
+    CLIENTES_EDITAR = 1 << 10
+    CLIENTES_ELIMINAR = 1 << 11
+    REPORTES_VER = 1 << 12
+    COMISIONES_VER = 1 << 13
+    COMISIONES_EDITAR = 1 << 14
+
+
 class RolePermissions:
     """Define los permisos por rol y proporciona métodos para verificar permisos"""
 
@@ -46,3 +66,26 @@ class RolePermissions:
     def get_permissions(cls, role: Role) -> Set[str]:
         """Obtiene los permisos para un rol específico"""
         return cls.PERMISSIONS.get(role, set())
+
+    @staticmethod
+    def to_mask(permissions: Iterable[str]) -> int:
+        """Convierte nombres de permisos en una máscara de bits"""
+        mask = Permiso(0)
+        for permission in permissions:
+            mask |= Permiso[permission.upper()]
+        return int(mask)
+
+    @classmethod
+    def get_mask(cls, role: str) -> int:
+        """Obtiene la máscara de permisos de un rol (0 si el rol no existe)"""
+        try:
+            return _ROLE_MASKS[Role(role)]
+        except (ValueError, KeyError):
+            return 0
+
+
+# Máscaras precalculadas por rol
+_ROLE_MASKS = {
+    role: RolePermissions.to_mask(permissions)
+    for role, permissions in RolePermissions.PERMISSIONS.items()
+}
@@ -3,8 +3,11 @@ Contiene funciones relacionadas con la autenticación y seguridad,
 como el hash de contraseñas y la verificación de tokens JWT.
 """
 
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -13,8 +16,20 @@ from .config import settings
 
 # El algoritmo se obtiene de la configuración
 
-# Configuración del contexto de hashing de contraseñas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configuración del contexto de hashing de contraseñas. Los hashes con menos
+# rondas que las configuradas se consideran obsoletos (needs_update).
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+# bcrypt libera el GIL, así que un pool de hilos acotado basta para que el
+# cálculo no bloquee el event loop ni sature la CPU con logins concurrentes.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
 
 
 def get_password_hash(password: str) -> str:
@@ -44,6 +59,45 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def get_password_hash_async(password: str) -> str:
+    """
+    Versión asíncrona de get_password_hash; calcula el hash en el pool de hilos.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica la contraseña en el pool de hilos.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Si la contraseña coincide y, cuando el hash
+        almacenado es obsoleto (por ejemplo, menos rondas), el nuevo hash a
+        guardar
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+async def dummy_verify_password() -> None:
+    """
+    Verifica contra un hash ficticio (en el pool de hilos) para que un login
+    con usuario inexistente tarde lo mismo que uno con contraseña incorrecta.
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_hash_executor, pwd_context.dummy_verify)
+
+
+def shutdown_password_executor() -> None:
+    """Detiene el pool de hilos de hashing (al apagar la aplicación)."""
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
+
+
 def get_user_password_hash(password: Optional[str] = None) -> Optional[str]:
     """
     Función de utilidad para obtener el hash de la contraseña de un usuario.
@@ -59,8 +113,18 @@ def get_user_password_hash(password: Optional[str] = None) -> Optional[str]:
         return get_password_hash(password)
 
 
+def hash_token(token: str) -> str:
+    """
+    Hash SHA-256 (hex) de un token opaco, para guardarlo o buscarlo sin
+    almacenar su valor.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def create_access_token(
-    subject: int | str, expires_delta: timedelta | None = None
+    subject: int | str,
+    expires_delta: timedelta | None = None,
+    extra_claims: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Genera un token JWT de acceso.
@@ -68,6 +132,7 @@ def create_access_token(
     Args:
         subject: ID del usuario u otro identificador
         expires_delta: Tiempo de expiración opcional
+        extra_claims: Claims adicionales (rol, permisos, versión del token)
 
     Returns:
         str: Token JWT codificado
@@ -78,7 +143,7 @@ def create_access_token(
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(extra_claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
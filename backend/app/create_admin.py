@@ -1,9 +1,9 @@
 import asyncio
-from app.db.session import async_session
+from app.db.database import AsyncSessionLocal
 from app.db.crud.corredor import corredor_crud
 
 async def create_corredor():
-    async with async_session() as db:
+    async with AsyncSessionLocal() as db:
         try:
             # Crear un corredor común y su usuario asociado
             corredor, usuario = await corredor_crud.create_corredor_with_user(
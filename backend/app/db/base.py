@@ -11,4 +11,5 @@ from app.db.models import (  # noqa
     Cliente,
     ClienteCorredor,
     MovimientoVigencia,
+    RefreshToken,
 )
@@ -1,5 +1,6 @@
 from typing import Any
 
+from sqlalchemy import DDL, event
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase
 
@@ -16,3 +17,9 @@ class Base(DeclarativeBase):
         return {
             column.name: getattr(self, column.name) for column in self.__table__.columns
         }
+
+
+# Los índices de búsqueda por similitud (gin_trgm_ops) requieren pg_trgm
+event.listen(
+    Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
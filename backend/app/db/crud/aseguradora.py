@@ -21,16 +21,15 @@ class CRUDAseguradora(CRUDBase[Aseguradora, AseguradoraCreate, AseguradoraUpdate
     async def create(
         self, db: AsyncSession, *, obj_in: AseguradoraCreate
     ) -> Aseguradora:
-        db_obj = Aseguradora(
-            nombre=obj_in.nombre,
-            direccion=obj_in.direccion,
-            telefono=obj_in.telefono,
-            email=obj_in.email,
+        return await self._insert_returning(
+            db,
+            {
+                "nombre": obj_in.nombre,
+                "direccion": obj_in.direccion,
+                "telefono": obj_in.telefono,
+                "email": obj_in.email,
+            },
         )
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
 
     async def update(
         self,
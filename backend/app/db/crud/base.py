@@ -1,17 +1,34 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import and_, delete, exists, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base_class import Base
 
+from .pagination import Cursor, Page, paginate
+
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Columnas con restricción única que se informan como conflicto (409)
+    unique_fields: Tuple[str, ...] = ()
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -20,6 +37,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         * `schema`: A Pydantic model (schema) class
         """
         self.model = model
+        self._column_keys = {attr.key for attr in model.__mapper__.column_attrs}
 
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         result = await db.execute(select(self.model).where(self.model.id == id))
@@ -31,14 +49,135 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await db.execute(select(self.model).offset(skip).limit(limit))
         return result.scalars().all()
 
-    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = obj_in.dict()
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[Cursor] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Page[ModelType]:
+        """
+        Lista paginada por clave primaria. Con `cursor` se usa keyset;
+        sin él, `skip` se aplica como OFFSET.
+        """
+        return await paginate(
+            db,
+            select(self.model),
+            list(self.model.__mapper__.primary_key),
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+
+    async def _insert_returning(
+        self, db: AsyncSession, values: Dict[str, Any], *, commit: bool = True
+    ) -> ModelType:
+        """
+        INSERT ... RETURNING: inserta la fila y la devuelve ya cargada en un
+        solo viaje a la base de datos, sin el SELECT de `refresh`.
+        """
+        result = await db.execute(
+            insert(self.model).values(**values).returning(self.model)
+        )
+        db_obj = result.scalar_one()
+        if commit:
+            await db.commit()
+        return db_obj
+
+    async def _insert_or_conflict(
+        self, db: AsyncSession, values: Dict[str, Any], *, commit: bool = True
+    ) -> Optional[ModelType]:
+        """
+        INSERT ... ON CONFLICT DO NOTHING RETURNING: inserta en un solo viaje
+        apoyándose en las restricciones únicas, sin consultar antes si existe.
+        Devuelve None si la fila choca con una existente; `find_conflict`
+        indica con cuál campo.
+        """
+        result = await db.execute(
+            pg_insert(self.model)
+            .values(**values)
+            .on_conflict_do_nothing()
+            .returning(self.model)
+        )
+        db_obj = result.scalar_one_or_none()
+        if db_obj is not None and commit:
+            await db.commit()
+        return db_obj
+
+    async def find_conflict(
+        self,
+        db: AsyncSession,
+        values: Dict[str, Any],
+        *,
+        exclude: Sequence[Any] = (),
+    ) -> Optional[str]:
+        """
+        Primer campo de `unique_fields` cuyo valor en `values` ya usa otra
+        fila (las que cumplen `exclude` no cuentan). Solo se consulta después
+        de un conflicto, para armar el mensaje de error.
+        """
+        fields = [f for f in self.unique_fields if values.get(f) is not None]
+        if not fields:
+            return None
+        columns = [getattr(self.model, f) for f in fields]
+        query = select(*columns).where(
+            or_(*(column == values[f] for column, f in zip(columns, fields)))
+        )
+        if exclude:
+            query = query.where(~and_(*exclude))
+        result = await db.execute(query.limit(1))
+        row = result.first()
+        if row is None:
+            return None
+        return next(f for f in fields if getattr(row, f) == values[f])
+
+    async def _update_returning(
+        self, db: AsyncSession, criteria: List[Any], values: Dict[str, Any]
+    ) -> Optional[ModelType]:
+        """
+        UPDATE ... RETURNING de las filas que cumplen `criteria`. Si el objeto
+        ya estaba en la sesión, se actualiza con los valores devueltos.
+        Devuelve None si ninguna fila cumple el criterio.
+        """
+        result = await db.execute(
+            update(self.model)
+            .where(*criteria)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        db_obj = result.scalar_one_or_none()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
+    def _identity_criteria(self, db_obj: ModelType) -> List[Any]:
+        """Condiciones que identifican a `db_obj` por su clave primaria."""
+        mapper = self.model.__mapper__
+        return [
+            column == value
+            for column, value in zip(
+                mapper.primary_key, mapper.primary_key_from_instance(db_obj)
+            )
+        ]
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        return await self._insert_returning(db, obj_in.dict())
+
+    def _update_values(
+        self, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Valores a actualizar: solo los campos enviados que son columnas."""
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        return {
+            field: value
+            for field, value in update_data.items()
+            if field in self._column_keys
+        }
+
     async def update(
         self,
         db: AsyncSession,
@@ -46,22 +185,63 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]],
     ) -> ModelType:
-        obj_data = db_obj.__dict__
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        values = self._update_values(obj_in)
+        if not values:
+            return db_obj
+        return await self._update_returning(
+            db, self._identity_criteria(db_obj), values
+        )
+
+    async def update_where(
+        self,
+        db: AsyncSession,
+        criteria: Sequence[Any],
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+    ) -> Optional[ModelType]:
+        """
+        Actualiza en una sola sentencia, sin leer antes la fila, la que cumple
+        `criteria` (identificación más cualquier condición de permisos).
+        Devuelve None si ninguna fila lo cumple.
+        """
+        values = self._update_values(obj_in)
+        if not values:
+            result = await db.execute(select(self.model).where(*criteria))
+            return result.scalar_one_or_none()
+        return await self._update_returning(db, list(criteria), values)
+
+    async def update_by_id(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        criteria: Sequence[Any] = (),
+    ) -> Optional[ModelType]:
+        return await self.update_where(db, [self.model.id == id, *criteria], obj_in)
 
-    async def delete(self, db: AsyncSession, *, id: int) -> ModelType:
-        obj = await db.execute(select(self.model).where(self.model.id == id))
-        obj = obj.scalars().first()
-        await db.delete(obj)
+    async def delete_where(
+        self, db: AsyncSession, criteria: Sequence[Any]
+    ) -> Optional[ModelType]:
+        """
+        DELETE ... RETURNING de la fila que cumple `criteria`, sin leerla
+        antes. Devuelve None si ninguna fila lo cumple.
+        """
+        result = await db.execute(
+            delete(self.model).where(*criteria).returning(self.model)
+        )
+        obj = result.scalar_one_or_none()
         await db.commit()
         return obj
+
+    async def delete(
+        self, db: AsyncSession, *, id: Any, criteria: Sequence[Any] = ()
+    ) -> Optional[ModelType]:
+        return await self.delete_where(db, [self.model.id == id, *criteria])
+
+    async def exists(self, db: AsyncSession, *, id: Any) -> bool:
+        """
+        Indica si existe la fila, para distinguir 404 de 403 cuando una
+        sentencia condicional no afectó ninguna fila.
+        """
+        result = await db.execute(select(exists().where(self.model.id == id)))
+        return bool(result.scalar())
@@ -0,0 +1,58 @@
+"""
+Búsqueda por similitud de texto con pg_trgm.
+
+Las columnas buscadas tienen índices GIN con gin_trgm_ops, que sirven tanto
+para subcadenas (ILIKE '%texto%') como para los operadores de similitud.
+Cada búsqueda corre con un presupuesto de tiempo (statement_timeout local a
+la transacción) para no degradar al resto de la aplicación.
+"""
+
+from sqlalchemy import ColumnElement, func, literal, or_, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# SQLSTATE de PostgreSQL para una consulta cancelada por statement_timeout
+QUERY_CANCELED = "57014"
+
+MENSAJE_TIEMPO_AGOTADO = (
+    "La búsqueda excedió el tiempo máximo; pruebe con un texto más específico"
+)
+
+
+def coincide(columna, texto: str) -> ColumnElement[bool]:
+    """La columna contiene el texto o se le parece (operador % de pg_trgm)."""
+    return or_(columna.icontains(texto, autoescape=True), columna.op("%")(texto))
+
+
+def coincide_palabras(columna, texto: str) -> ColumnElement[bool]:
+    """
+    La columna contiene el texto o alguna parte de ella se le parece
+    (operador <% de pg_trgm), para buscar en textos largos como un nombre
+    completo.
+    """
+    return or_(
+        columna.icontains(texto, autoescape=True),
+        literal(texto).op("<%", precedence=100)(columna),
+    )
+
+
+def relevancia(*similitudes) -> ColumnElement[float]:
+    """Mayor similitud entre las columnas buscadas, de 0 a 1."""
+    if len(similitudes) == 1:
+        return similitudes[0]
+    return func.greatest(*similitudes)
+
+
+async def limitar_duracion(db: AsyncSession, milisegundos: int) -> None:
+    """
+    Cancela las consultas de la transacción actual que excedan el tiempo
+    indicado. El límite termina junto con la transacción.
+    """
+    await db.execute(
+        select(func.set_config("statement_timeout", f"{milisegundos}ms", True))
+    )
+
+
+def es_tiempo_agotado(error: DBAPIError) -> bool:
+    """Indica si el error es la cancelación por statement_timeout."""
+    return getattr(error.orig, "sqlstate", None) == QUERY_CANCELED
@@ -1,15 +1,25 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.cliente import Cliente
 from app.schemas.cliente import ClienteCreate, ClienteUpdate
 
 from .base import CRUDBase
+from .busqueda import coincide, coincide_palabras, relevancia
+
+
+def nombre_completo():
+    """Nombres y apellidos; es la expresión de ix_clientes_nombre_completo_trgm."""
+    return Cliente.nombres + literal_column("' '") + Cliente.apellidos
 
 
 class CRUDCliente(CRUDBase[Cliente, ClienteCreate, ClienteUpdate]):
+    unique_fields = ("numero_documento", "mail")
+
     async def get_by_mail(self, db: AsyncSession, *, mail: str) -> Optional[Cliente]:
         result = await db.execute(select(Cliente).where(Cliente.mail == mail))
         return result.scalars().first()
@@ -22,26 +32,114 @@ class CRUDCliente(CRUDBase[Cliente, ClienteCreate, ClienteUpdate]):
         )
         return result.scalars().first()
 
-    async def create(self, db: AsyncSession, *, obj_in: ClienteCreate) -> Cliente:
-        db_obj = Cliente(
-            nombres=obj_in.nombres,
-            apellidos=obj_in.apellidos,
-            tipo_documento_id=obj_in.tipo_documento_id,
-            numero_documento=obj_in.numero_documento,
-            fecha_nacimiento=obj_in.fecha_nacimiento,
-            direccion=obj_in.direccion,
-            localidad=obj_in.localidad,
-            telefonos=obj_in.telefonos,
-            movil=obj_in.movil,
-            mail=obj_in.mail,
-            observaciones=obj_in.observaciones,
-            creado_por_id=obj_in.creado_por_id,
-            modificado_por_id=obj_in.modificado_por_id,
+    def criterio_busqueda(self, texto: str) -> ColumnElement[bool]:
+        """Clientes cuyo nombre completo, documento o mail coinciden con el texto."""
+        return or_(
+            coincide_palabras(nombre_completo(), texto),
+            coincide(Cliente.numero_documento, texto),
+            coincide(Cliente.mail, texto),
+        )
+
+    def relevancia_busqueda(self, texto: str) -> ColumnElement[float]:
+        return relevancia(
+            func.word_similarity(texto, nombre_completo()),
+            func.similarity(Cliente.numero_documento, texto),
+            func.similarity(Cliente.mail, texto),
         )
-        db.add(db_obj)
+
+    async def buscar(
+        self, db: AsyncSession, *, texto: str, limit: int = 20
+    ) -> List[Tuple[Cliente, float]]:
+        """Clientes que coinciden con el texto, de mayor a menor relevancia."""
+        rank = self.relevancia_busqueda(texto).label("relevancia")
+        result = await db.execute(
+            select(Cliente, rank)
+            .where(self.criterio_busqueda(texto))
+            .order_by(rank.desc(), Cliente.id)
+            .limit(limit)
+        )
+        return result.tuples().all()
+
+    def _valores_alta(self, obj_in: ClienteCreate) -> Dict[str, Any]:
+        return {
+            "nombres": obj_in.nombres,
+            "apellidos": obj_in.apellidos,
+            "tipo_documento_id": obj_in.tipo_documento_id,
+            "numero_documento": obj_in.numero_documento,
+            "fecha_nacimiento": obj_in.fecha_nacimiento,
+            "direccion": obj_in.direccion,
+            "localidad": obj_in.localidad,
+            "telefonos": obj_in.telefonos,
+            "movil": obj_in.movil,
+            "mail": obj_in.mail,
+            "observaciones": obj_in.observaciones,
+            "creado_por_id": obj_in.creado_por_id,
+            "modificado_por_id": obj_in.modificado_por_id,
+        }
+
+    async def create(
+        self, db: AsyncSession, *, obj_in: ClienteCreate
+    ) -> Optional[Cliente]:
+        """Crea el cliente; None si el documento o el mail ya están registrados."""
+        return await self._insert_or_conflict(db, self._valores_alta(obj_in))
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[ClienteCreate],
+        tamano_lote: int = 500,
+    ) -> Dict[str, UUID]:
+        """
+        Alta o actualización masiva por numero_documento, en lotes de
+        INSERT ... ON CONFLICT (numero_documento) DO UPDATE RETURNING y en una
+        sola transacción.
+
+        Los números de cliente de cada lote se reservan con una única consulta
+        a cliente_numero_seq; los clientes existentes conservan el suyo. Si un
+        documento se repite, prevalece su última aparición.
+
+        Devuelve numero_documento -> id de todos los clientes recibidos.
+
+        Raises:
+            IntegrityError: Si un mail pertenece a otro cliente o falta una
+                referencia (la transacción queda sin confirmar)
+        """
+        clientes = list({c.numero_documento: c for c in objs_in}.values())
+        tabla = Cliente.__table__
+        # Actualizables: todo lo enviado salvo la auditoría de creación
+        actualizables = [
+            campo for campo in ClienteCreate.model_fields if campo != "creado_por_id"
+        ]
+        # asyncpg admite como máximo 32767 parámetros por sentencia
+        columnas = len(ClienteCreate.model_fields) + 4
+        tamano_lote = max(1, min(tamano_lote, 32767 // columnas))
+
+        ids: Dict[str, UUID] = {}
+        for inicio in range(0, len(clientes), tamano_lote):
+            lote = clientes[inicio : inicio + tamano_lote]
+            numeros = await db.execute(
+                select(Cliente.cliente_seq.next_value()).select_from(
+                    func.generate_series(1, len(lote))
+                )
+            )
+            stmt = pg_insert(tabla).values(
+                [
+                    {**self._valores_alta(obj_in), "numero_cliente": numero}
+                    for obj_in, numero in zip(lote, numeros.scalars())
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[tabla.c.numero_documento],
+                set_={
+                    **{campo: stmt.excluded[campo] for campo in actualizables},
+                    "fecha_modificacion": func.now(),
+                },
+            ).returning(tabla.c.numero_documento, tabla.c.id)
+            result = await db.execute(stmt)
+            ids.update(result.tuples().all())
         await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        return ids
 
     async def update(
         self,
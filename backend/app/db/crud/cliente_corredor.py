@@ -33,15 +33,14 @@ class CRUDClienteCorredor(
     async def create(
         self, db: AsyncSession, *, obj_in: ClienteCorredorCreate
     ) -> ClienteCorredor:
-        db_obj = ClienteCorredor(
-            cliente_id=obj_in.cliente_id,
-            corredor_numero=obj_in.corredor_numero,
-            fecha_asignacion=obj_in.fecha_asignacion,
+        return await self._insert_returning(
+            db,
+            {
+                "cliente_id": obj_in.cliente_id,
+                "corredor_numero": obj_in.corredor_numero,
+                "fecha_asignacion": obj_in.fecha_asignacion,
+            },
         )
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
 
     async def update(
         self,
@@ -3,12 +3,13 @@ CRUD para el modelo Corredor
 """
 
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, List, Optional, Type
 
-from sqlalchemy import select
+from sqlalchemy import and_, exists, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.db.models.corredor import Corredor
 from app.db.models.usuario import Usuario
 from app.schemas.corredor import CorredorCreate, CorredorUpdate
@@ -16,6 +17,8 @@ from .base import CRUDBase
 
 
 class CRUDCorredor(CRUDBase[Corredor, CorredorCreate, CorredorUpdate]):
+    unique_fields = ("numero", "documento", "mail")
+
     def __init__(self, model: Type[Corredor]):
         super().__init__(model)
 
@@ -92,34 +95,25 @@ class CRUDCorredor(CRUDBase[Corredor, CorredorCreate, CorredorUpdate]):
             if isinstance(obj_in, dict)
             else obj_in.model_dump(exclude_unset=True)
         )
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
 
-        # Actualizar los campos del objeto
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
-
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
-
-    async def delete(self, db: AsyncSession, *, id: int) -> Optional[Corredor]:
+    def criterio_id_o_numero(self, valor: int) -> List[Any]:
         """
-        Elimina un corredor.
-
-        Args:
-            db: Sesión de base de datos
-            id: Número del corredor (usado como ID)
-
-        Returns:
-            Optional[Corredor]: Corredor eliminado o None
+        Condición que identifica a un corredor por ID o, si no hay ninguno con
+        ese ID, por número (compatibilidad). Permite actualizar o eliminar en
+        una sola sentencia sin leer antes el corredor.
         """
-        obj = await self.get(db, id=id)  # get ya está actualizado para usar numero
-        if obj:
-            await db.delete(obj)
-            await db.commit()
-        return obj
+        otro = aliased(Corredor)
+        return [
+            or_(
+                Corredor.id == valor,
+                and_(Corredor.numero == valor, ~exists().where(otro.id == valor)),
+            )
+        ]
 
-    async def create(self, db: AsyncSession, *, obj_in: CorredorCreate) -> Corredor:
+    async def create(
+        self, db: AsyncSession, *, obj_in: CorredorCreate
+    ) -> Optional[Corredor]:
         """
         Crea un nuevo corredor.
 
@@ -128,17 +122,12 @@ class CRUDCorredor(CRUDBase[Corredor, CorredorCreate, CorredorUpdate]):
             obj_in: Datos del corredor a crear
 
         Returns:
-            Corredor: Corredor creado
+            Optional[Corredor]: Corredor creado, o None si el número, el
+            documento o el mail ya están registrados (ver find_conflict)
         """
         obj_data = obj_in.model_dump(exclude_unset=True)
         obj_data["fecha_alta"] = datetime.now(timezone.utc)
-
-        db_obj = Corredor(**obj_data)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-
-        return db_obj
+        return await self._insert_or_conflict(db, obj_data)
 
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
@@ -183,40 +172,43 @@ class CRUDCorredor(CRUDBase[Corredor, CorredorCreate, CorredorUpdate]):
             tuple[Corredor, Usuario]: Tupla con el corredor y el usuario creado
         """
         fecha_alta = datetime.now(timezone.utc)
-        corredor = Corredor(
-            numero=numero,
-            nombres=nombres,
-            apellidos=apellidos,
-            documento=documento,
-            direccion=direccion,
-            localidad=localidad,
-            telefonos=telefonos,
-            movil=movil,
-            mail=mail,
-            observaciones=observaciones,
-            fecha_alta=fecha_alta,
+        hashed_password = await get_password_hash_async(password)
+
+        corredor = await self._insert_returning(
+            db,
+            {
+                "numero": numero,
+                "nombres": nombres,
+                "apellidos": apellidos,
+                "documento": documento,
+                "direccion": direccion,
+                "localidad": localidad,
+                "telefonos": telefonos,
+                "movil": movil,
+                "mail": mail,
+                "observaciones": observaciones,
+                "fecha_alta": fecha_alta,
+            },
+            commit=False,
         )
-
-        db.add(corredor)
-        await db.flush()
-
-        usuario = Usuario(
-            nombre=nombres,
-            apellido=apellidos,
-            email=mail,
-            username=mail,
-            hashed_password=get_password_hash(password),
-            is_active=True,
-            is_superuser=is_superuser,
-            role=role,
-            corredor_numero=numero,
-            telefono=telefonos,
+        result = await db.execute(
+            insert(Usuario)
+            .values(
+                nombre=nombres,
+                apellido=apellidos,
+                email=mail,
+                username=mail,
+                hashed_password=hashed_password,
+                is_active=True,
+                is_superuser=is_superuser,
+                role=role,
+                corredor_numero=numero,
+                telefono=telefonos,
+            )
+            .returning(Usuario)
         )
-
-        db.add(usuario)
+        usuario = result.scalar_one()
         await db.commit()
-        await db.refresh(corredor)
-        await db.refresh(usuario)
 
         return corredor, usuario
 
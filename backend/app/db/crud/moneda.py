@@ -15,18 +15,17 @@ class CRUDMoneda(CRUDBase[Moneda, MonedaCreate, MonedaUpdate]):
         return result.scalars().first()
 
     async def create(self, db: AsyncSession, *, obj_in: MonedaCreate) -> Moneda:
-        db_obj = Moneda(
-            codigo=obj_in.codigo,
-            nombre=obj_in.nombre,
-            simbolo=obj_in.simbolo,
-            descripcion=obj_in.descripcion,
-            es_default=obj_in.es_default,
-            esta_activa=obj_in.esta_activa,
+        return await self._insert_returning(
+            db,
+            {
+                "codigo": obj_in.codigo,
+                "nombre": obj_in.nombre,
+                "simbolo": obj_in.simbolo,
+                "descripcion": obj_in.descripcion,
+                "es_default": obj_in.es_default,
+                "esta_activa": obj_in.esta_activa,
+            },
         )
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
 
     async def update(
         self,
@@ -28,19 +28,18 @@ class CRUDMovimientoVigencia(
     async def create(
         self, db: AsyncSession, *, obj_in: MovimientoVigenciaCreate
     ) -> MovimientoVigencia:
-        db_obj = MovimientoVigencia(
-            fecha_inicio=obj_in.fecha_inicio,
-            fecha_termino=obj_in.fecha_termino,
-            prima=obj_in.prima,
-            cliente_id=obj_in.cliente_id,
-            aseguradora_id=obj_in.aseguradora_id,
-            tipo_seguro_id=obj_in.tipo_seguro_id,
-            moneda_id=obj_in.moneda_id,
+        return await self._insert_returning(
+            db,
+            {
+                "fecha_inicio": obj_in.fecha_inicio,
+                "fecha_termino": obj_in.fecha_termino,
+                "prima": obj_in.prima,
+                "cliente_id": obj_in.cliente_id,
+                "aseguradora_id": obj_in.aseguradora_id,
+                "tipo_seguro_id": obj_in.tipo_seguro_id,
+                "moneda_id": obj_in.moneda_id,
+            },
         )
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
 
     async def update(
         self,
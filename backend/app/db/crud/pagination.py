@@ -0,0 +1,165 @@
+"""
+Paginación por cursor (keyset) para los listados.
+
+El cursor es opaco para el cliente: codifica los valores de las columnas de
+orden de la primera o última fila de la página y la dirección de avance.
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+NEXT = "next"
+PREV = "prev"
+
+
+@dataclass
+class Cursor:
+    """Posición decodificada dentro de un listado ordenado."""
+
+    values: List[Any]
+    direction: str = NEXT
+
+
+@dataclass
+class Page(Generic[T]):
+    """Página de resultados con los cursores para navegar."""
+
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    if "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    if "d" in value:
+        return date.fromisoformat(value["d"])
+    if "u" in value:
+        return UUID(value["u"])
+    if "n" in value:
+        return Decimal(value["n"])
+    raise ValueError("Valor de cursor no reconocido")
+
+
+def encode_cursor(values: Sequence[Any], direction: str = NEXT) -> str:
+    """Codifica los valores de orden de una fila en un cursor opaco."""
+    payload = {"v": [_encode_value(v) for v in values], "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Decodifica un cursor opaco.
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [_decode_value(v) for v in payload["v"]]
+        direction = payload.get("d", NEXT)
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Cursor inválido") from e
+    if direction not in (NEXT, PREV) or not values:
+        raise ValueError("Cursor inválido")
+    return Cursor(values=values, direction=direction)
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order_columns: Sequence[Any],
+    *,
+    cursor: Optional[Cursor] = None,
+    skip: int = 0,
+    limit: int = 100,
+    descending: bool = False,
+    scalars: bool = True,
+) -> Page:
+    """
+    Ejecuta `query` paginando por las columnas `order_columns`.
+
+    Sin cursor se usa OFFSET/LIMIT (compatibilidad), pero la página igual
+    devuelve cursores para que el cliente continúe en modo keyset. Las
+    columnas de orden deben identificar cada fila de forma única (la última
+    suele ser la clave primaria).
+    """
+    if cursor is not None and len(cursor.values) != len(order_columns):
+        raise ValueError("Cursor inválido")
+
+    backwards = cursor is not None and cursor.direction == PREV
+    # Al retroceder se recorre el índice en sentido inverso y luego se invierte
+    reverse_order = descending != backwards
+
+    keys = tuple_(*order_columns)
+    labels = [f"_k{i}" for i in range(len(order_columns))]
+    query = query.add_columns(
+        *(column.label(label) for column, label in zip(order_columns, labels))
+    )
+    if cursor is not None:
+        # Cada valor lleva el tipo de su columna: sin tipo se enviaría como
+        # VARCHAR y, p. ej., no habría operador para comparar un ENUM nativo
+        bound = tuple_(
+            *(
+                literal(value, type_=column.type)
+                for column, value in zip(order_columns, cursor.values)
+            )
+        )
+        query = query.where(keys < bound if reverse_order else keys > bound)
+    query = query.order_by(
+        *(column.desc() if reverse_order else column.asc() for column in order_columns)
+    )
+    if cursor is None and skip:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    def _row_cursor(row, direction: str) -> str:
+        return encode_cursor([getattr(row, label) for label in labels], direction)
+
+    page = Page(items=[row[0] if scalars else row for row in rows])
+    if not rows:
+        return page
+    if backwards:
+        page.next_cursor = _row_cursor(rows[-1], NEXT)
+        page.prev_cursor = _row_cursor(rows[0], PREV) if has_more else None
+    else:
+        page.next_cursor = _row_cursor(rows[-1], NEXT) if has_more else None
+        page.prev_cursor = (
+            _row_cursor(rows[0], PREV) if cursor is not None or skip else None
+        )
+    return page
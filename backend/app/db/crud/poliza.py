@@ -1,38 +1,209 @@
-from typing import Dict, List, Optional, Tuple
+import operator
+from datetime import date
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    Date,
+    Row,
+    Select,
+    cast,
+    delete,
+    exists,
+    false,
+    func,
+    literal_column,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from app.core.principal import Principal
+from app.core.roles import Role
 from app.db.models.cliente import Cliente
+from app.db.models.corredor import Corredor
+from app.db.models.moneda import Moneda
 from app.db.models.movimiento_vigencia import MovimientoVigencia, TipoDuracion
-from app.schemas.poliza import PolizaCreate, PolizaUpdate
+from app.db.models.tipo_seguro import TipoSeguro
+from app.schemas.poliza import Poliza, PolizaCreate, PolizaUpdate
+
+from .busqueda import coincide
+from .cliente import cliente_crud
+from .pagination import Cursor, Page, paginate
+
+
+def _contiene(columna, valor: str):
+    return columna.ilike(f"%{valor}%")
+
+
+# Filtros declarativos: parámetro -> (columna, operador SQL)
+FILTROS_POLIZA: Dict[str, Tuple[Any, Callable]] = {
+    "cliente_id": (MovimientoVigencia.cliente_id, operator.eq),
+    "corredor_id": (MovimientoVigencia.corredor_id, operator.eq),
+    "estado": (MovimientoVigencia.estado_poliza, operator.eq),
+    "fecha_inicio": (MovimientoVigencia.fecha_inicio, operator.ge),
+    "fecha_fin": (MovimientoVigencia.fecha_inicio, operator.le),
+    "vencimiento_desde": (MovimientoVigencia.fecha_vencimiento, operator.ge),
+    "vencimiento_hasta": (MovimientoVigencia.fecha_vencimiento, operator.le),
+    "numero_poliza": (MovimientoVigencia.numero_poliza, _contiene),
+    "tipo_seguro_id": (MovimientoVigencia.tipo_seguro_id, operator.eq),
+    "moneda_id": (MovimientoVigencia.moneda_id, operator.eq),
+    "suma_asegurada_min": (MovimientoVigencia.suma_asegurada, operator.ge),
+    "suma_asegurada_max": (MovimientoVigencia.suma_asegurada, operator.le),
+    "prima_min": (MovimientoVigencia.prima, operator.ge),
+    "prima_max": (MovimientoVigencia.prima, operator.le),
+    "tipo_duracion": (MovimientoVigencia.tipo_duracion, operator.eq),
+    "cliente_nombre": (Cliente.nombres, _contiene),
+    "cliente_apellido": (Cliente.apellidos, _contiene),
+}
+
+# Campos permitidos en ordenar_por. Solo columnas NOT NULL, para que el orden
+# junto con el desempate por id sea total y sirva a la paginación por cursor.
+CAMPOS_ORDEN: Dict[str, Any] = {
+    "id": MovimientoVigencia.id,
+    "numero_poliza": MovimientoVigencia.numero_poliza,
+    "fecha_inicio": MovimientoVigencia.fecha_inicio,
+    "fecha_vencimiento": MovimientoVigencia.fecha_vencimiento,
+    "suma_asegurada": MovimientoVigencia.suma_asegurada,
+    "prima": MovimientoVigencia.prima,
+    "tipo_duracion": MovimientoVigencia.tipo_duracion,
+    "nombres": Cliente.nombres,
+    "apellidos": Cliente.apellidos,
+}
+ORDEN_POR_DEFECTO = "fecha_vencimiento"
+
+# Dimensiones opcionales de las estadísticas: nombre -> expresión agrupada.
+# El mes va como literal y no como parámetro, para que la expresión del SELECT
+# y la del GROUP BY sean idénticas.
+DIMENSIONES_ESTADISTICAS: Dict[str, Any] = {
+    "estado": MovimientoVigencia.estado_poliza,
+    "moneda": MovimientoVigencia.moneda_id,
+    "tipo_seguro": MovimientoVigencia.tipo_seguro_id,
+    "corredor": MovimientoVigencia.corredor_id,
+    "mes": cast(
+        func.date_trunc(literal_column("'month'"), MovimientoVigencia.fecha_inicio),
+        Date,
+    ),
+}
+
+# Claves foráneas de la póliza -> columna referenciada
+REFERENCIAS_POLIZA: Dict[str, Any] = {
+    "cliente_id": Cliente.id,
+    "corredor_id": Corredor.numero,
+    "tipo_seguro_id": TipoSeguro.id,
+    "moneda_id": Moneda.id,
+}
+
+# Columnas que necesita el esquema Poliza en los listados
+COLUMNAS_LISTADO = [getattr(MovimientoVigencia, campo) for campo in Poliza.model_fields]
 
 
 class CRUDPoliza:
-    """Clase para manejar operaciones CRUD de pólizas."""
-
-    def _apply_filters(self, query, **filters):
-        """Aplica filtros opcionales a la consulta."""
-        if filters.get("cliente_id"):
-            query = query.filter(MovimientoVigencia.cliente_id == filters["cliente_id"])
-        if filters.get("corredor_id"):
-            query = query.filter(
-                MovimientoVigencia.corredor_id == filters["corredor_id"]
-            )
-        if filters.get("estado"):
-            query = query.filter(MovimientoVigencia.estado_poliza == filters["estado"])
-        if filters.get("fecha_inicio") and filters.get("fecha_fin"):
-            query = query.filter(
-                MovimientoVigencia.fecha_inicio.between(
-                    filters["fecha_inicio"], filters["fecha_fin"]
-                )
-            )
-        if filters.get("numero_poliza"):
-            query = query.filter(
-                MovimientoVigencia.numero_poliza.ilike(f"%{filters['numero_poliza']}%")
+    """
+    Clase para manejar operaciones CRUD de pólizas.
+
+    Las consultas aceptan `alcance` (el usuario autenticado): si es un
+    corredor, se limitan en SQL a sus propias pólizas.
+    """
+
+    def _aplicar_alcance(self, query, alcance: Optional[Principal]):
+        """Restringe la consulta a las pólizas visibles para `alcance`."""
+        if alcance is None or alcance.role != Role.CORREDOR:
+            return query
+        if alcance.corredor_numero is None:
+            # Corredor sin número asignado: no ve ninguna póliza
+            return query.where(false())
+        return query.where(MovimientoVigencia.corredor_id == alcance.corredor_numero)
+
+    def asignar_corredor_alta(
+        self, poliza_in: PolizaCreate, alcance: Optional[Principal]
+    ) -> Optional[str]:
+        """
+        Un corredor solo puede crear pólizas propias: se le asigna su número.
+        Devuelve el mensaje de error si la póliza es de otro corredor.
+        """
+        if alcance is None or alcance.role != Role.CORREDOR:
+            return None
+        if poliza_in.corredor_id and poliza_in.corredor_id != alcance.corredor_numero:
+            return "No puede crear pólizas para otros corredores"
+        poliza_in.corredor_id = alcance.corredor_numero
+        return None
+
+    def _requiere_cliente(self, **filters) -> bool:
+        """Indica si los filtros u orden pedidos necesitan unir con clientes."""
+        if filters.get("ordenar_por") in ("nombres", "apellidos"):
+            return True
+        return any(
+            filters.get(nombre) not in (None, "")
+            for nombre, (columna, _) in FILTROS_POLIZA.items()
+            if columna.class_ is Cliente
+        )
+
+    def _apply_filters(self, query, *, cliente_unido: bool = False, **filters):
+        """
+        Aplica filtros opcionales y el alcance del usuario a la consulta.
+        `cliente_unido` indica que la consulta ya incluye el JOIN con clientes.
+        """
+        if not cliente_unido and self._requiere_cliente(**filters):
+            query = query.join(Cliente, MovimientoVigencia.cliente_id == Cliente.id)
+        for nombre, (columna, operador) in FILTROS_POLIZA.items():
+            valor = filters.get(nombre)
+            if valor is None or valor == "":
+                continue
+            query = query.where(operador(columna, valor))
+        if filters.get("incluir_vencidas") is False:
+            query = query.where(MovimientoVigencia.fecha_vencimiento >= date.today())
+        return self._aplicar_alcance(query, filters.get("alcance"))
+
+    def _order_columns(self, **filters) -> Tuple[List[Any], bool]:
+        """
+        Columnas de orden (campo pedido + id como desempate) y si es descendente.
+
+        Raises:
+            ValueError: Si el campo de orden no está permitido
+        """
+        campo = filters.get("ordenar_por") or ORDEN_POR_DEFECTO
+        if campo not in CAMPOS_ORDEN:
+            raise ValueError(f"No se puede ordenar por '{campo}'")
+        columnas = [CAMPOS_ORDEN[campo]]
+        if campo != "id":
+            columnas.append(MovimientoVigencia.id)
+        return columnas, filters.get("orden") == "desc"
+
+    def listado_query(self, **filters) -> Select:
+        """
+        Proyección de los listados: solo las columnas del esquema Poliza y los
+        nombres para mostrar de sus relaciones, sin hidratar objetos ORM.
+        """
+        query = (
+            select(
+                *COLUMNAS_LISTADO,
+                (Cliente.nombres + " " + Cliente.apellidos).label("cliente_nombre"),
+                func.concat_ws(" ", Corredor.nombres, Corredor.apellidos).label(
+                    "corredor_nombre"
+                ),
+                TipoSeguro.nombre.label("tipo_seguro_nombre"),
+                Moneda.codigo.label("moneda_codigo"),
             )
-        return query
+            .join(Cliente, MovimientoVigencia.cliente_id == Cliente.id)
+            .join(TipoSeguro, MovimientoVigencia.tipo_seguro_id == TipoSeguro.id)
+            .outerjoin(Corredor, MovimientoVigencia.corredor_id == Corredor.numero)
+            .outerjoin(Moneda, MovimientoVigencia.moneda_id == Moneda.id)
+        )
+        return self._apply_filters(query, cliente_unido=True, **filters)
 
     def _joined_load_options(self):
         """Opciones de carga para relaciones relacionadas con MovimientoVigencia."""
@@ -43,15 +214,23 @@ class CRUDPoliza:
             joinedload(MovimientoVigencia.moneda_rel),
         )
 
-    async def get(self, db: AsyncSession, id: int) -> Optional[MovimientoVigencia]:
-        """Obtener una póliza por su ID."""
-        result = await db.execute(
+    async def get(
+        self, db: AsyncSession, id: int, *, alcance: Optional[Principal] = None
+    ) -> Optional[MovimientoVigencia]:
+        """Obtener una póliza por su ID (None si no existe o está fuera de alcance)."""
+        query = (
             select(MovimientoVigencia)
             .filter(MovimientoVigencia.id == id)
             .options(*self._joined_load_options())
         )
+        result = await db.execute(self._aplicar_alcance(query, alcance))
         return result.scalar_one_or_none()
 
+    async def exists(self, db: AsyncSession, id: int) -> bool:
+        """Indica si existe una póliza con ese ID, sin considerar el alcance."""
+        result = await db.execute(select(exists().where(MovimientoVigencia.id == id)))
+        return bool(result.scalar())
+
     async def get_by_numero(
         self, db: AsyncSession, numero_poliza: str
     ) -> Optional[MovimientoVigencia]:
@@ -63,84 +242,301 @@ class CRUDPoliza:
         )
         return result.scalar_one_or_none()
 
-    async def get_multi(self, db: AsyncSession, **filters) -> List[MovimientoVigencia]:
-        """Obtener múltiples pólizas con filtros opcionales."""
-        query = select(MovimientoVigencia).join(
-            Cliente, MovimientoVigencia.cliente_id == Cliente.id
-        )
-        query = self._apply_filters(query, **filters)
+    async def get_multi(self, db: AsyncSession, **filters) -> List[Row]:
+        """Obtener múltiples pólizas (proyección de listado) con filtros opcionales."""
+        columnas, descendente = self._order_columns(**filters)
         query = (
-            query.options(*self._joined_load_options())
+            self.listado_query(**filters)
+            .order_by(*(c.desc() if descendente else c.asc() for c in columnas))
             .offset(filters.get("skip", 0))
             .limit(filters.get("limit", 100))
         )
         result = await db.execute(query)
-        return result.scalars().all()
+        return result.all()
+
+    def exportacion_query(self, **filters) -> Select:
+        """Proyección del listado con los filtros y el orden pedidos, sin límite."""
+        columnas, descendente = self._order_columns(**filters)
+        return self.listado_query(**filters).order_by(
+            *(c.desc() if descendente else c.asc() for c in columnas)
+        )
+
+    async def count_listado(self, db: AsyncSession, **filters) -> int:
+        """Cantidad de pólizas del listado con los filtros pedidos."""
+        query = select(func.count()).select_from(
+            self.listado_query(**filters).subquery()
+        )
+        result = await db.execute(query)
+        return result.scalar_one()
+
+    async def stream_listado(
+        self, db: AsyncSession, *, tamano_lote: int = 1000, **filters
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Recorre todas las pólizas del listado con un cursor del lado del
+        servidor, en lotes de `tamano_lote` filas. La memoria no depende de la
+        cantidad de pólizas.
+        """
+        query = self.exportacion_query(**filters).execution_options(
+            yield_per=tamano_lote
+        )
+        result = await db.stream(query)
+        async for filas in result.partitions():
+            yield filas
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[Cursor] = None,
+        skip: int = 0,
+        limit: int = 100,
+        **filters,
+    ) -> Page[Row]:
+        """
+        Obtener una página de pólizas (proyección de listado) ordenada por
+        `ordenar_por` (por defecto fecha_vencimiento) con id como desempate.
+        """
+        columnas, descendente = self._order_columns(**filters)
+        return await paginate(
+            db,
+            self.listado_query(**filters),
+            columnas,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            descending=descendente,
+            scalars=False,
+        )
+
+    async def buscar(
+        self,
+        db: AsyncSession,
+        *,
+        texto: str,
+        limit: int = 20,
+        alcance: Optional[Principal] = None,
+    ) -> List[Row]:
+        """
+        Pólizas cuyo número o cliente (nombre, documento o mail) coinciden con
+        el texto, de mayor a menor relevancia, con las columnas del listado.
+
+        Cada criterio se resuelve por separado con su índice de trigramas y
+        los resultados se combinan; un OR entre tablas impediría usarlos.
+        """
+        por_numero = select(
+            MovimientoVigencia.id.label("id"),
+            func.similarity(MovimientoVigencia.numero_poliza, texto).label(
+                "relevancia"
+            ),
+        ).where(coincide(MovimientoVigencia.numero_poliza, texto))
+        por_cliente = (
+            select(MovimientoVigencia.id, cliente_crud.relevancia_busqueda(texto))
+            .join(Cliente, MovimientoVigencia.cliente_id == Cliente.id)
+            .where(cliente_crud.criterio_busqueda(texto))
+        )
+        coincidencias = union_all(
+            self._aplicar_alcance(por_numero, alcance),
+            self._aplicar_alcance(por_cliente, alcance),
+        ).subquery()
+        ranking = (
+            select(
+                coincidencias.c.id,
+                func.max(coincidencias.c.relevancia).label("relevancia"),
+            )
+            .group_by(coincidencias.c.id)
+            .subquery()
+        )
+        query = (
+            self.listado_query(alcance=alcance)
+            .add_columns(ranking.c.relevancia)
+            .join(ranking, ranking.c.id == MovimientoVigencia.id)
+            .order_by(ranking.c.relevancia.desc(), MovimientoVigencia.id)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return result.all()
 
     async def create(
         self, db: AsyncSession, *, obj_in: PolizaCreate
-    ) -> MovimientoVigencia:
-        """Crear una nueva póliza."""
-        db_obj = MovimientoVigencia(**obj_in.dict())
-        db_obj.tipo_duracion = TipoDuracion(obj_in.tipo_duracion)
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+    ) -> Optional[MovimientoVigencia]:
+        """
+        Crear una nueva póliza con INSERT ... ON CONFLICT DO NOTHING RETURNING.
+        Devuelve None si ya existe una póliza con ese número.
+        """
+        values = obj_in.dict()
+        values["tipo_duracion"] = TipoDuracion(obj_in.tipo_duracion)
+        result = await db.execute(
+            pg_insert(MovimientoVigencia)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[MovimientoVigencia.numero_poliza])
+            .returning(MovimientoVigencia)
+        )
+        db_obj = result.scalar_one_or_none()
+        if db_obj is not None:
+            await db.commit()
         return db_obj
 
+    async def referencias_existentes(
+        self, db: AsyncSession, polizas: Sequence[PolizaCreate]
+    ) -> Dict[str, Set[Any]]:
+        """
+        Para cada clave foránea de las pólizas, los valores referenciados que
+        existen. Una consulta por tabla, sin importar la cantidad de pólizas.
+        """
+        existentes: Dict[str, Set[Any]] = {}
+        for campo, columna in REFERENCIAS_POLIZA.items():
+            valores = {getattr(p, campo) for p in polizas} - {None}
+            existentes[campo] = set()
+            if valores:
+                result = await db.execute(select(columna).where(columna.in_(valores)))
+                existentes[campo] = set(result.scalars().all())
+        return existentes
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[PolizaCreate],
+        tamano_lote: int = 500,
+    ) -> Dict[str, int]:
+        """
+        Crear pólizas en lotes de INSERT multi-fila ... ON CONFLICT DO NOTHING
+        RETURNING, confirmando una sola vez al final.
+
+        Devuelve numero_poliza -> id de las pólizas creadas; las que no
+        aparecen ya existían.
+        """
+        # asyncpg admite como máximo 32767 parámetros por sentencia
+        columnas = len(PolizaCreate.model_fields)
+        tamano_lote = max(1, min(tamano_lote, 32767 // columnas))
+        tabla = MovimientoVigencia.__table__
+        creadas: Dict[str, int] = {}
+        for inicio in range(0, len(objs_in), tamano_lote):
+            lote = []
+            for obj_in in objs_in[inicio : inicio + tamano_lote]:
+                values = obj_in.dict()
+                values["tipo_duracion"] = TipoDuracion(obj_in.tipo_duracion)
+                lote.append(values)
+            result = await db.execute(
+                pg_insert(tabla)
+                .values(lote)
+                .on_conflict_do_nothing(index_elements=[tabla.c.numero_poliza])
+                .returning(tabla.c.id, tabla.c.numero_poliza)
+            )
+            creadas.update({numero: id for id, numero in result.all()})
+        await db.commit()
+        return creadas
+
     async def update(
-        self, db: AsyncSession, *, db_obj: MovimientoVigencia, obj_in: PolizaUpdate
-    ) -> MovimientoVigencia:
-        """Actualizar una póliza existente."""
+        self,
+        db: AsyncSession,
+        *,
+        id: int,
+        obj_in: PolizaUpdate,
+        alcance: Optional[Principal] = None,
+    ) -> Optional[MovimientoVigencia]:
+        """
+        Actualizar una póliza con un único UPDATE ... RETURNING que incluye el
+        alcance del usuario. Devuelve None si no existe o está fuera de alcance.
+        """
         update_data = obj_in.dict(exclude_unset=True)
+        if not update_data:
+            query = select(MovimientoVigencia).where(MovimientoVigencia.id == id)
+            result = await db.execute(self._aplicar_alcance(query, alcance))
+            return result.scalar_one_or_none()
         if "tipo_duracion" in update_data:
             update_data["tipo_duracion"] = TipoDuracion(update_data["tipo_duracion"])
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
-        db.add(db_obj)
+        query = (
+            update(MovimientoVigencia)
+            .where(MovimientoVigencia.id == id)
+            .values(**update_data)
+            .returning(MovimientoVigencia)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(self._aplicar_alcance(query, alcance))
+        db_obj = result.scalar_one_or_none()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def delete(
-        self, db: AsyncSession, *, id: int
+        self, db: AsyncSession, *, id: int, alcance: Optional[Principal] = None
     ) -> Optional[MovimientoVigencia]:
-        """Eliminar una póliza por ID."""
-        obj = await self.get(db, id)
-        if obj:
-            await db.delete(obj)
-            await db.commit()
+        """
+        Eliminar una póliza con un único DELETE ... RETURNING que incluye el
+        alcance del usuario. Devuelve None si no existe o está fuera de alcance.
+        """
+        query = (
+            delete(MovimientoVigencia)
+            .where(MovimientoVigencia.id == id)
+            .returning(MovimientoVigencia)
+        )
+        result = await db.execute(self._aplicar_alcance(query, alcance))
+        obj = result.scalar_one_or_none()
+        await db.commit()
         return obj
 
     async def get_estadisticas(
-        self, db: AsyncSession, **filters
-    ) -> Tuple[List[Dict], float, float, int]:
-        """Obtener estadísticas de pólizas agrupadas por tipo de duración."""
-        query = select(
-            MovimientoVigencia.tipo_duracion,
-            func.count(MovimientoVigencia.id).label("cantidad_polizas"),
-            func.sum(MovimientoVigencia.suma_asegurada).label("suma_asegurada_total"),
-            func.sum(MovimientoVigencia.prima).label("prima_total"),
-        ).group_by(MovimientoVigencia.tipo_duracion)
-        query = self._apply_filters(query, **filters)
-        result = await db.execute(query)
-        stats_by_duration = result.all()
-        totals_query = select(
-            func.count(MovimientoVigencia.id).label("total_polizas"),
-            func.coalesce(func.sum(MovimientoVigencia.suma_asegurada), 0).label(
-                "suma_asegurada_total"
-            ),
-            func.coalesce(func.sum(MovimientoVigencia.prima), 0).label("prima_total"),
-        )
-        totals_query = self._apply_filters(totals_query, **filters)
-        totals_result = await db.execute(totals_query)
-        totals = totals_result.first()
-        return (
-            stats_by_duration,
-            totals.suma_asegurada_total,
-            totals.prima_total,
-            totals.total_polizas,
+        self, db: AsyncSession, *, dimensiones: Sequence[str] = (), **filters
+    ) -> Tuple[List[Dict], Dict[str, List[Dict]], Dict]:
+        """
+        Estadísticas de pólizas por tipo de duración, por cada una de las
+        `dimensiones` pedidas (claves de DIMENSIONES_ESTADISTICAS) y totales.
+
+        Todo sale de una sola consulta con GROUPING SETS: un conjunto por
+        dimensión más el conjunto vacío de los totales, en un único recorrido
+        de las pólizas filtradas. GROUPING() distingue la fila de un valor
+        NULL (p. ej. sin corredor) de la fila de otro conjunto.
+
+        Devuelve (grupos por duración, grupos por dimensión, totales); cada
+        grupo tiene `valor`, `cantidad_polizas`, `suma_asegurada_total` y
+        `prima_total`.
+        """
+        agrupaciones = {"tipo_duracion": MovimientoVigencia.tipo_duracion}
+        for nombre in dimensiones:
+            if nombre not in DIMENSIONES_ESTADISTICAS:
+                raise ValueError(f"No se puede agrupar por '{nombre}'")
+            agrupaciones[nombre] = DIMENSIONES_ESTADISTICAS[nombre]
+
+        query = (
+            select(
+                *(columna.label(nombre) for nombre, columna in agrupaciones.items()),
+                *(
+                    func.grouping(columna).label(f"agrupa_{nombre}")
+                    for nombre, columna in agrupaciones.items()
+                ),
+                func.count(MovimientoVigencia.id).label("cantidad_polizas"),
+                func.sum(MovimientoVigencia.suma_asegurada).label(
+                    "suma_asegurada_total"
+                ),
+                func.sum(MovimientoVigencia.prima).label("prima_total"),
+            )
+            .group_by(
+                func.grouping_sets(
+                    *(tuple_(columna) for columna in agrupaciones.values()), tuple_()
+                )
+            )
+            .order_by(*agrupaciones.values())
         )
+        result = await db.execute(self._apply_filters(query, **filters))
+
+        grupos: Dict[str, List[Dict]] = {nombre: [] for nombre in agrupaciones}
+        totales: Dict = {}
+        for fila in result:
+            valores = {
+                "cantidad_polizas": fila.cantidad_polizas,
+                "suma_asegurada_total": fila.suma_asegurada_total or 0.0,
+                "prima_total": fila.prima_total or 0.0,
+            }
+            # GROUPING(columna) es 0 solo en el conjunto que agrupa por ella
+            agrupada = next(
+                (n for n in agrupaciones if getattr(fila, f"agrupa_{n}") == 0), None
+            )
+            if agrupada is None:
+                totales = valores
+            else:
+                grupos[agrupada].append({"valor": getattr(fila, agrupada), **valores})
+        return grupos.pop("tipo_duracion"), grupos, totales
 
 
 poliza_crud = CRUDPoliza()
@@ -0,0 +1,96 @@
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import hash_token
+from app.db.models.refresh_token import RefreshToken
+from app.db.models.usuario import Usuario
+
+
+class CRUDRefreshToken:
+    """
+    Refresh tokens rotativos. Los métodos `revoke_*` no confirman la
+    transacción; lo hace quien los llama.
+    """
+
+    async def create(
+        self, db: AsyncSession, *, usuario_id: int, familia: Optional[uuid.UUID] = None
+    ) -> str:
+        """
+        Emite un refresh token (nueva familia si no se indica) y devuelve su
+        valor en claro, que no se vuelve a poder recuperar.
+        """
+        token = secrets.token_urlsafe(32)
+        db.add(
+            RefreshToken(
+                usuario_id=usuario_id,
+                token_hash=hash_token(token),
+                familia=familia or uuid.uuid4(),
+                fecha_expiracion=datetime.now(timezone.utc)
+                + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        await db.commit()
+        return token
+
+    async def rotate(
+        self, db: AsyncSession, token: str
+    ) -> Optional[Tuple[Usuario, str]]:
+        """
+        Canjea un refresh token por otro de la misma familia.
+
+        Returns:
+            (usuario, nuevo refresh token), o None si el token no existe,
+            expiró, ya había sido usado o su usuario está inactivo. Si ya había
+            sido usado se revoca toda la familia, porque alguien está
+            reutilizando un token; si el usuario está inactivo también, para
+            que no quede ningún token de la familia vigente.
+        """
+        result = await db.execute(
+            select(RefreshToken, Usuario)
+            .join(Usuario, Usuario.id == RefreshToken.usuario_id)
+            .filter(RefreshToken.token_hash == hash_token(token))
+            .with_for_update(of=RefreshToken)
+        )
+        fila = result.one_or_none()
+        if fila is None:
+            return None
+        actual, usuario = fila
+        if actual.usado or actual.revocado or not usuario.is_active:
+            await self.revoke_family(db, actual.familia)
+            await db.commit()
+            return None
+        if actual.fecha_expiracion <= datetime.now(timezone.utc):
+            await db.rollback()
+            return None
+
+        actual.usado = True
+        nuevo = await self.create(db, usuario_id=usuario.id, familia=actual.familia)
+        return usuario, nuevo
+
+    async def revoke_family(self, db: AsyncSession, familia: uuid.UUID) -> None:
+        """Revoca todos los refresh tokens de una familia."""
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.familia == familia)
+            .values(revocado=True)
+        )
+
+    async def revoke_for_user(self, db: AsyncSession, usuario_id: int) -> None:
+        """Revoca todos los refresh tokens vigentes de un usuario."""
+        await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.usuario_id == usuario_id,
+                RefreshToken.revocado.is_(False),
+            )
+            .values(revocado=True)
+        )
+
+
+refresh_token_crud = CRUDRefreshToken()
@@ -17,21 +17,20 @@ class CRUDTipoSeguro(CRUDBase[TipoSeguro, TipoSeguroCreate, TipoSeguroUpdate]):
         return result.scalars().first()
 
     async def create(self, db: AsyncSession, *, obj_in: TipoSeguroCreate) -> TipoSeguro:
-        db_obj = TipoSeguro(
-            codigo=obj_in.codigo,
-            nombre=obj_in.nombre,
-            descripcion=obj_in.descripcion,
-            es_default=obj_in.es_default,
-            esta_activo=obj_in.esta_activo,
-            categoria=obj_in.categoria,
-            cobertura=obj_in.cobertura,
-            vigencia_default=obj_in.vigencia_default,
-            aseguradora_id=obj_in.aseguradora_id,
+        return await self._insert_returning(
+            db,
+            {
+                "codigo": obj_in.codigo,
+                "nombre": obj_in.nombre,
+                "descripcion": obj_in.descripcion,
+                "es_default": obj_in.es_default,
+                "esta_activo": obj_in.esta_activo,
+                "categoria": obj_in.categoria,
+                "cobertura": obj_in.cobertura,
+                "vigencia_default": obj_in.vigencia_default,
+                "aseguradora_id": obj_in.aseguradora_id,
+            },
         )
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
 
     async def update(
         self,
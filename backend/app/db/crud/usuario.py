@@ -1,18 +1,48 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import case, delete, exists, insert, or_, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
+from app.core.principal import invalidar_principal
+from app.core.security import (
+    dummy_verify_password,
+    get_password_hash_async,
+    verify_and_update_password,
+)
 from app.db.models.usuario import Usuario
 from app.schemas.usuario import UsuarioCreate, UsuarioUpdate
 
+from .pagination import Cursor, Page, paginate
+from .refresh_token import refresh_token_crud
+
+
+# Cambios que revocan los tokens emitidos (sus claims quedarían obsoletos)
+CAMPOS_REVOCAN_TOKEN = (
+    "hashed_password",
+    "role",
+    "corredor_numero",
+    "is_active",
+    "is_superuser",
+)
+
 
 class CRUDUsuario:
     async def get(self, db: AsyncSession, id: int) -> Optional[Usuario]:
         result = await db.execute(select(Usuario).filter(Usuario.id == id))
         return result.scalar_one_or_none()
 
+    async def get_token_version(self, db: AsyncSession, id: int) -> Optional[int]:
+        """
+        Versión vigente de los tokens de un usuario activo, o None si el
+        usuario no existe o está inactivo.
+        """
+        result = await db.execute(
+            select(Usuario.token_version).filter(
+                Usuario.id == id, Usuario.is_active.is_(True)
+            )
+        )
+        return result.scalar_one_or_none()
+
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[Usuario]:
         result = await db.execute(select(Usuario).filter(Usuario.email == email))
         return result.scalar_one_or_none()
@@ -29,55 +59,123 @@ class CRUDUsuario:
         result = await db.execute(select(Usuario).offset(skip).limit(limit))
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[Cursor] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Page[Usuario]:
+        return await paginate(
+            db, select(Usuario), [Usuario.id], cursor=cursor, skip=skip, limit=limit
+        )
+
     async def create(self, db: AsyncSession, obj_in: UsuarioCreate) -> Usuario:
-        db_obj = Usuario(
-            email=obj_in.email,
-            username=obj_in.username,
-            hashed_password=get_password_hash(
-                obj_in.password
-            ),  # Contraseña hasheada con bcrypt
-            nombre=obj_in.nombre,
-            apellido=obj_in.apellido,
-            role=obj_in.role,
-            is_active=True,
-            is_superuser=False,
-            corredor_numero=obj_in.corredor_numero,
-            comision_porcentaje=obj_in.comision_porcentaje,
-            telefono=obj_in.telefono,
+        result = await db.execute(
+            insert(Usuario)
+            .values(
+                email=obj_in.email,
+                username=obj_in.username,
+                hashed_password=await get_password_hash_async(
+                    obj_in.password
+                ),  # Contraseña hasheada con bcrypt
+                nombre=obj_in.nombre,
+                apellido=obj_in.apellido,
+                role=obj_in.role,
+                is_active=True,
+                is_superuser=False,
+                corredor_numero=obj_in.corredor_numero,
+                comision_porcentaje=obj_in.comision_porcentaje,
+                telefono=obj_in.telefono,
+            )
+            .returning(Usuario)
         )
-        db.add(db_obj)
+        db_obj = result.scalar_one()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def update(
-        self, db: AsyncSession, db_obj: Usuario, obj_in: UsuarioUpdate
-    ) -> Usuario:
+        self,
+        db: AsyncSession,
+        *,
+        id: int,
+        obj_in: UsuarioUpdate,
+        criteria: Sequence[Any] = (),
+    ) -> Optional[Usuario]:
+        """
+        Actualiza un usuario con un único UPDATE ... RETURNING, sin leerlo
+        antes. `criteria` agrega condiciones de permisos; devuelve None si
+        ninguna fila las cumple.
+
+        Si cambia algún campo de CAMPOS_REVOCAN_TOKEN, la misma sentencia
+        incrementa token_version y se revocan los refresh tokens del usuario.
+        """
         update_data = obj_in.dict(exclude_unset=True)
 
         # Si hay una contraseña en los datos de actualización, deberíamos hashearla
         if "password" in update_data:
             password = update_data.pop("password")
-            update_data["hashed_password"] = get_password_hash(
-                password
-            )  # Contraseña hasheada con bcrypt
-
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
-
-        db.add(db_obj)
+            if password:
+                update_data["hashed_password"] = await get_password_hash_async(
+                    password
+                )  # Contraseña hasheada con bcrypt
+
+        # El hash de una contraseña nueva siempre difiere (sal aleatoria)
+        cambios = [
+            true()
+            if field == "hashed_password"
+            else getattr(Usuario, field).is_distinct_from(update_data[field])
+            for field in CAMPOS_REVOCAN_TOKEN
+            if field in update_data
+        ]
+        if cambios:
+            update_data["token_version"] = case(
+                (or_(*cambios), Usuario.token_version + 1),
+                else_=Usuario.token_version,
+            )
+
+        # La versión anterior sale de la instantánea previa a la actualización
+        anterior = (
+            select(Usuario.id, Usuario.token_version.label("version_anterior"))
+            .where(Usuario.id == id)
+            .subquery()
+        )
+        result = await db.execute(
+            update(Usuario)
+            .where(Usuario.id == anterior.c.id, *criteria)
+            .values(**update_data)
+            .returning(Usuario, anterior.c.version_anterior)
+            .execution_options(populate_existing=True)
+        )
+        row = result.first()
+        if row is None:
+            await db.rollback()
+            return None
+        db_obj, version_anterior = row
+        if db_obj.token_version != version_anterior:
+            await refresh_token_crud.revoke_for_user(db, id)
         await db.commit()
-        await db.refresh(db_obj)
+        invalidar_principal(id)
         return db_obj
 
-    async def delete(self, db: AsyncSession, id: int) -> Optional[Usuario]:
-        result = await db.execute(select(Usuario).filter(Usuario.id == id))
+    async def delete(
+        self, db: AsyncSession, *, id: int, criteria: Sequence[Any] = ()
+    ) -> Optional[Usuario]:
+        """DELETE ... RETURNING con condiciones de permisos, sin leer antes."""
+        result = await db.execute(
+            delete(Usuario).where(Usuario.id == id, *criteria).returning(Usuario)
+        )
         obj = result.scalar_one_or_none()
+        await db.commit()
         if obj:
-            await db.delete(obj)
-            await db.commit()
+            invalidar_principal(id)
         return obj
 
+    async def exists(self, db: AsyncSession, *, id: int) -> bool:
+        result = await db.execute(select(exists().where(Usuario.id == id)))
+        return bool(result.scalar())
+
     async def authenticate(
         self, db: AsyncSession, *, email: str, password: str
     ) -> Optional[Usuario]:
@@ -92,16 +190,29 @@ class CRUDUsuario:
         Returns:
             Usuario si la autenticación es exitosa, None en caso contrario
         """
-        # Intentar autenticar por email
-        usuario = await self.get_by_email(db, email=email)
+        # Una sola consulta por email o username (ambos con índice único); si
+        # coinciden dos usuarios distintos, tiene prioridad el email
+        result = await db.execute(
+            select(Usuario)
+            .filter(or_(Usuario.email == email, Usuario.username == email))
+            .order_by((Usuario.email == email).desc())
+            .limit(1)
+        )
+        usuario = result.scalar_one_or_none()
         if not usuario:
-            # Si no se encuentra por email, intentar por username
-            usuario = await self.get_by_username(db, username=email)
-            if not usuario:
-                return None
+            # Mismo costo que una contraseña incorrecta: no revela si existe
+            await dummy_verify_password()
+            return None
 
-        if not verify_password(password, usuario.hashed_password):
+        valida, nuevo_hash = await verify_and_update_password(
+            password, usuario.hashed_password
+        )
+        if not valida:
             return None
+        if nuevo_hash:
+            # El hash usaba un factor de trabajo menor al configurado
+            usuario.hashed_password = nuevo_hash
+            await db.commit()
         return usuario
 
 
@@ -1,29 +1,191 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.core.config import settings
 
-# Crear el motor de base de datos asincrono.
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    echo=settings.DB_ECHO_LOG,
-    poolclass=NullPool,
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool asincrono que registra cuántas peticiones esperan una conexión
+    y cuánto tardan en obtenerla.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiters = 0
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def connect(self):
+        self.waiters += 1
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiters -= 1
+        # Solo las conexiones efectivamente obtenidas cuentan como adquisiciones
+        elapsed = time.perf_counter() - start
+        self.acquisitions += 1
+        self.wait_time_total += elapsed
+        self.wait_time_max = max(self.wait_time_max, elapsed)
+        return connection
+
+
+def _pool_options() -> Dict[str, Any]:
+    """Opciones del pool de conexiones según la configuración."""
+    if not settings.DB_POOL_ENABLED:
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+class StatementCounter:
+    """Cantidad de sentencias SQL ejecutadas durante una petición."""
+
+    def __init__(self):
+        self.count = 0
+
+
+_statement_counter: ContextVar[Optional[StatementCounter]] = ContextVar(
+    "statement_counter", default=None
 )
 
-# Crear el fabricante de sesiones asincronas.
-AsyncSessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+
+def start_statement_count() -> StatementCounter:
+    """
+    Empieza a contar las sentencias SQL del contexto actual (petición).
+    Requiere DB_COUNT_STATEMENTS activado.
+    """
+    counter = StatementCounter()
+    _statement_counter.set(counter)
+    return counter
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _statement_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Crea un motor asincrono con las opciones de pool configuradas."""
+    async_engine = create_async_engine(
+        url, echo=settings.DB_ECHO_LOG, **_pool_options()
+    )
+    if settings.DB_COUNT_STATEMENTS:
+        event.listen(
+            async_engine.sync_engine, "before_cursor_execute", _count_statement
+        )
+    return async_engine
+
+
+def _create_session_factory(async_engine: AsyncEngine) -> sessionmaker:
+    """Crea el fabricante de sesiones asincronas para un motor."""
+    return sessionmaker(
+        async_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+def get_pool_status(async_engine: AsyncEngine) -> Dict[str, Any]:
+    """
+    Devuelve el estado actual del pool de conexiones de un motor.
+    """
+    pool = async_engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        return {"pool": type(pool).__name__}
+
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "waiters": pool.waiters,
+        "acquisitions": pool.acquisitions,
+        "timeouts": pool.timeouts,
+        "wait_time_avg_ms": (
+            pool.wait_time_total / pool.acquisitions * 1000
+            if pool.acquisitions
+            else 0.0
+        ),
+        "wait_time_max_ms": pool.wait_time_max * 1000,
+    }
+
+
+class EngineRegistry:
+    """
+    Registro único de motores de base de datos.
+
+    Mantiene el motor primario (lecturas y escrituras) y, si está configurada,
+    una réplica de solo lectura. Sin réplica, las lecturas van al primario.
+    """
+
+    def __init__(self, primary_url: str, replica_url: Optional[str] = None):
+        self.primary = _create_engine(primary_url)
+        self.replica = _create_engine(replica_url) if replica_url else None
+        self.write_session = _create_session_factory(self.primary)
+        self.read_session = (
+            _create_session_factory(self.replica)
+            if self.replica is not None
+            else self.write_session
+        )
+
+    def pool_status(self) -> Dict[str, Any]:
+        """Estado de los pools de todos los motores registrados."""
+        status = {"primary": get_pool_status(self.primary)}
+        if self.replica is not None:
+            status["replica"] = get_pool_status(self.replica)
+        return status
+
+    async def dispose(self) -> None:
+        """Cierra las conexiones de todos los motores."""
+        await self.primary.dispose()
+        if self.replica is not None:
+            await self.replica.dispose()
+
+
+engines = EngineRegistry(
+    settings.SQLALCHEMY_DATABASE_URI, settings.SQLALCHEMY_REPLICA_URI
 )
 
+# Alias del motor primario y su fabricante de sesiones.
+engine = engines.primary
+AsyncSessionLocal = engines.write_session
+
 
-# Función para obtener una sesión de base de datos
+# Función para obtener una sesión de base de datos (primario, lectura/escritura)
 async def get_db() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
+    async with engines.write_session() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+# Función para obtener una sesión de solo lectura (réplica si está configurada)
+async def get_read_db() -> AsyncSession:
+    async with engines.read_session() as session:
         try:
             yield session
         finally:
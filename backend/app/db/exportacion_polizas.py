@@ -0,0 +1,298 @@
+"""
+Exportación de pólizas a archivos.
+
+Las filas se leen con un cursor del lado del servidor y se escriben por lotes
+en un hilo de trabajo, sobre un archivo temporal que pasa de memoria a disco
+al crecer. Así la memoria se mantiene constante sin importar la cantidad de
+pólizas y el event loop no se bloquea mientras se arma el archivo. Los PDF
+se renderizan en un pool de procesos (ver app.core.reporte_pdf).
+
+CSV y NDJSON no pasan por Python fila a fila: PostgreSQL genera el texto con
+COPY (SELECT ...) TO STDOUT y los bytes se reenvían tal como llegan.
+"""
+
+import asyncio
+import contextlib
+import csv
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import openpyxl
+from sqlalchemy import Row, func, literal_column, select
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.reporte_pdf import renderizar_reporte
+from app.db.crud.poliza import poliza_crud
+from app.db.database import engines
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# (columna del listado, encabezado) de las pólizas exportadas
+COLUMNAS_EXPORTACION: List[Tuple[str, str]] = [
+    ("id", "ID"),
+    ("numero_poliza", "Número de Póliza"),
+    ("cliente_nombre", "Cliente"),
+    ("estado_poliza", "Estado"),
+    ("suma_asegurada", "Suma Asegurada"),
+    ("prima", "Prima"),
+]
+
+# Opciones de COPY por formato. NDJSON es una columna con row_to_json por fila:
+# se usa el formato CSV (que no escapa barras invertidas, a diferencia del de
+# texto) con comilla y delimitador que JSON nunca contiene sin escapar, así
+# cada línea sale tal cual.
+FORMATOS_COPIA: Dict[str, Dict[str, Any]] = {
+    "csv": {"format": "csv", "header": True},
+    "ndjson": {"format": "csv", "quote": "\x01", "delimiter": "\x02"},
+}
+
+MEDIA_TYPES_COPIA = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+_dialecto_asyncpg = PGDialect_asyncpg()
+
+# Recibe la cantidad de filas agregadas desde el llamado anterior
+Progreso = Callable[[int], None]
+
+
+# Procesos para renderizar PDF. Con "spawn" los hijos no heredan el event loop
+# ni las conexiones abiertas del proceso de la aplicación.
+_pdf_executor = ProcessPoolExecutor(
+    max_workers=settings.PDF_WORKERS, mp_context=multiprocessing.get_context("spawn")
+)
+
+
+def shutdown_pdf_executor() -> None:
+    """Detiene el pool de procesos de PDF (al apagar la aplicación)."""
+    _pdf_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def nueva_ruta_temporal(sufijo: str) -> str:
+    """Crea un archivo temporal en disco y devuelve su ruta."""
+    descriptor, ruta = tempfile.mkstemp(suffix=sufijo)
+    os.close(descriptor)
+    return ruta
+
+
+def eliminar_archivo(ruta: str) -> None:
+    """Elimina un archivo temporal si todavía existe."""
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+
+def nuevo_archivo_temporal() -> SpooledTemporaryFile:
+    """Archivo temporal en memoria que pasa a disco al superar el máximo."""
+    return SpooledTemporaryFile(max_size=settings.EXPORTACION_MEMORIA_MAX)
+
+
+async def iterar_archivo(archivo: IO[bytes]) -> AsyncIterator[bytes]:
+    """Devuelve el archivo desde el inicio en fragmentos y luego lo cierra."""
+    try:
+        await asyncio.to_thread(archivo.seek, 0)
+        while True:
+            fragmento = await asyncio.to_thread(
+                archivo.read, settings.EXPORTACION_CHUNK
+            )
+            if not fragmento:
+                break
+            yield fragmento
+    finally:
+        archivo.close()
+
+
+def _valores(fila: Row) -> List[Any]:
+    return [getattr(fila, columna) for columna, _ in COLUMNAS_EXPORTACION]
+
+
+def _agregar_filas(hoja, filas: Sequence[Row]) -> None:
+    for fila in filas:
+        hoja.append(_valores(fila))
+
+
+async def exportar_excel(
+    db: AsyncSession,
+    archivo: IO[bytes],
+    *,
+    progreso: Optional[Progreso] = None,
+    **filters,
+) -> int:
+    """
+    Escribe las pólizas filtradas en un libro XLSX de solo escritura sobre
+    `archivo`. Devuelve la cantidad de pólizas exportadas.
+    """
+    libro = openpyxl.Workbook(write_only=True)
+    hoja = libro.create_sheet("Pólizas")
+    hoja.append([encabezado for _, encabezado in COLUMNAS_EXPORTACION])
+
+    cantidad = 0
+    async for filas in poliza_crud.stream_listado(
+        db, tamano_lote=settings.EXPORTACION_LOTE, **filters
+    ):
+        # La hoja de solo escritura vuelca cada fila a disco al agregarla
+        await asyncio.to_thread(_agregar_filas, hoja, filas)
+        cantidad += len(filas)
+        if progreso:
+            progreso(len(filas))
+    await asyncio.to_thread(libro.save, archivo)
+    return cantidad
+
+
+def _escribir_csv(escritor, filas: Sequence[Row]) -> None:
+    escritor.writerows(_valores(fila) for fila in filas)
+
+
+async def exportar_pdf(
+    db: AsyncSession,
+    ruta_pdf: str,
+    *,
+    titulo: str = "Reporte de pólizas",
+    progreso: Optional[Progreso] = None,
+    **filters,
+) -> int:
+    """
+    Genera en `ruta_pdf` el reporte paginado de las pólizas filtradas.
+    Devuelve la cantidad de pólizas.
+
+    Las filas se vuelcan del cursor a un CSV temporal y el documento se
+    renderiza en el pool de procesos, fuera del event loop.
+    """
+    ruta_datos = nueva_ruta_temporal(".csv")
+    try:
+        with open(ruta_datos, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            async for filas in poliza_crud.stream_listado(
+                db, tamano_lote=settings.EXPORTACION_LOTE, **filters
+            ):
+                await asyncio.to_thread(_escribir_csv, escritor, filas)
+                if progreso:
+                    progreso(len(filas))
+        # Libera la conexión antes de renderizar, que es lo más lento
+        await db.rollback()
+
+        loop = asyncio.get_running_loop()
+        cantidad, _ = await loop.run_in_executor(
+            _pdf_executor, renderizar_reporte, ruta_datos, ruta_pdf, titulo
+        )
+        return cantidad
+    finally:
+        eliminar_archivo(ruta_datos)
+
+
+def _consulta_copia(formato: str, **filters) -> Tuple[str, List[Any]]:
+    """SQL (con parámetros $n de asyncpg) y argumentos de la copia."""
+    query = poliza_crud.exportacion_query(**filters)
+    if formato == "ndjson":
+        query = select(func.row_to_json(literal_column("t"))).select_from(
+            query.subquery("t")
+        )
+    compilada = query.compile(dialect=_dialecto_asyncpg)
+    parametros = compilada.construct_params()
+    return str(compilada), [parametros[nombre] for nombre in compilada.positiontup]
+
+
+def exportar_copia(formato: str, **filters) -> AsyncIterator[bytes]:
+    """
+    Exporta las pólizas filtradas en `formato` ("csv" o "ndjson") con COPY.
+
+    La consulta se arma al llamar (los errores de filtros surgen antes de
+    responder); la copia corre recién al recorrer el iterador, en una sesión
+    propia de solo lectura que vive lo que dure la respuesta.
+    """
+    sql, argumentos = _consulta_copia(formato, **filters)
+    return _copiar(sql, argumentos, FORMATOS_COPIA[formato])
+
+
+async def copiar_a_archivo(
+    db: AsyncSession,
+    ruta: str,
+    formato: str,
+    *,
+    progreso: Optional[Progreso] = None,
+    **filters,
+) -> int:
+    """
+    Escribe en `ruta` la copia de las pólizas filtradas en `formato` ("csv" o
+    "ndjson"). Devuelve la cantidad de pólizas exportadas.
+
+    El progreso se estima por los saltos de línea de cada fragmento, sin
+    separar las filas.
+    """
+    sql, argumentos = _consulta_copia(formato, **filters)
+    conexion = await (await db.connection()).get_raw_connection()
+    with open(ruta, "wb") as archivo:
+
+        async def escribir(fragmento: bytes) -> None:
+            await asyncio.to_thread(archivo.write, fragmento)
+            if progreso:
+                progreso(fragmento.count(b"\n"))
+
+        estado = await conexion.driver_connection.copy_from_query(
+            sql, *argumentos, output=escribir, **FORMATOS_COPIA[formato]
+        )
+    # asyncpg devuelve la etiqueta de la sentencia: "COPY <filas>"
+    return int(estado.split()[-1])
+
+
+async def _copiar(
+    sql: str, argumentos: List[Any], opciones: Dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """
+    Corre COPY (sql) TO STDOUT y devuelve los fragmentos a medida que llegan.
+
+    La cola acotada da contrapresión: si el cliente lee lento, la copia se
+    detiene y PostgreSQL deja de enviar. Si el cliente se desconecta, la copia
+    se cancela y la conexión vuelve al pool.
+    """
+    cola: asyncio.Queue = asyncio.Queue(maxsize=settings.EXPORTACION_COPY_BUFFER)
+    fin = object()
+
+    async def encolar(fragmento: bytearray) -> None:
+        # asyncpg entrega bytearray; la respuesta necesita bytes
+        await cola.put(bytes(fragmento))
+
+    async def producir() -> None:
+        # El fin solo se envía si la copia termina o falla: cancelada, nadie
+        # lee la cola y esperar lugar en ella la dejaría colgada
+        try:
+            async with engines.read_session() as db:
+                conexion = await (await db.connection()).get_raw_connection()
+                await conexion.driver_connection.copy_from_query(
+                    sql, *argumentos, output=encolar, **opciones
+                )
+        except Exception:
+            await cola.put(fin)
+            raise
+        await cola.put(fin)
+
+    tarea = asyncio.create_task(producir())
+    try:
+        while (fragmento := await cola.get()) is not fin:
+            yield fragmento
+        # Propaga el error de la copia, si lo hubo
+        await tarea
+    finally:
+        if not tarea.done():
+            tarea.cancel()
+            # Espera que la copia se cancele y la conexión vuelva al pool
+            with contextlib.suppress(asyncio.CancelledError):
+                await tarea
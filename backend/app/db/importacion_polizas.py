@@ -0,0 +1,448 @@
+"""
+Importación de cartera de pólizas desde planillas XLSX.
+
+La planilla se recorre con openpyxl en modo de solo lectura y por lotes, de
+modo que la memoria no depende del tamaño del archivo. Cada lote se valida
+contra PolizaCreate, resuelve sus referencias con mapas en memoria (clientes
+por documento o nombre completo, corredores por número, tipos de seguro y
+monedas por código) y se copia con COPY (asyncpg copy_records_to_table) a
+una tabla temporal. Al final, una única sentencia pasa las filas a
+movimientos_vigencias omitiendo los números de póliza que ya existen.
+
+La primera fila lleva los encabezados (ver ENCABEZADOS). Son obligatorios el
+número de póliza, el cliente (documento o nombre completo), el tipo de
+seguro, las fechas de inicio y de vencimiento, la suma asegurada y la prima;
+el tipo de seguro y las fechas pueden faltar en la planilla si se indican
+valores por defecto para todas las filas. Así se importan también las
+planillas con el formato de la exportación (ID, Número de Póliza, Cliente,
+Estado, Suma Asegurada y Prima); su columna ID se ignora.
+"""
+
+import asyncio
+import unicodedata
+from datetime import datetime
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+from uuid import UUID
+from zipfile import BadZipFile
+
+import openpyxl
+from openpyxl.utils.exceptions import InvalidFileException
+from pydantic import ValidationError
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.principal import Principal
+from app.db.crud.poliza import poliza_crud
+from app.db.models.cliente import Cliente
+from app.db.models.corredor import Corredor
+from app.db.models.moneda import Moneda
+from app.db.models.movimiento_vigencia import MovimientoVigencia
+from app.db.models.tipo_seguro import TipoSeguro
+from app.schemas.poliza import (
+    ErrorFilaImportacion,
+    PolizaCreate,
+    ResultadoImportacionPolizas,
+)
+
+TABLA_STAGING = "importacion_polizas"
+
+# Columnas de movimientos_vigencias que se cargan desde la planilla
+COLUMNAS_POLIZA = list(PolizaCreate.model_fields)
+
+# Encabezado (normalizado) -> campo. Las referencias se indican por su clave
+# de negocio y se resuelven antes de validar.
+ENCABEZADOS: Dict[str, str] = {
+    "numero de poliza": "numero_poliza",
+    "numero poliza": "numero_poliza",
+    "documento cliente": "cliente_documento",
+    "documento del cliente": "cliente_documento",
+    "cliente documento": "cliente_documento",
+    "cliente": "cliente_nombre",
+    "nombre del cliente": "cliente_nombre",
+    "nombre cliente": "cliente_nombre",
+    "corredor": "corredor_id",
+    "numero de corredor": "corredor_id",
+    "tipo de seguro": "tipo_seguro",
+    "tipo seguro": "tipo_seguro",
+    "moneda": "moneda",
+    "carpeta": "carpeta",
+    "endoso": "endoso",
+    "tipo de endoso": "tipo_endoso",
+    "tipo endoso": "tipo_endoso",
+    "fecha inicio": "fecha_inicio",
+    "fecha de inicio": "fecha_inicio",
+    "fecha vencimiento": "fecha_vencimiento",
+    "fecha de vencimiento": "fecha_vencimiento",
+    "fecha emision": "fecha_emision",
+    "fecha de emision": "fecha_emision",
+    "estado": "estado_poliza",
+    "estado poliza": "estado_poliza",
+    "forma de pago": "forma_pago",
+    "forma pago": "forma_pago",
+    "suma asegurada": "suma_asegurada",
+    "prima": "prima",
+    "comision": "comision",
+    "cuotas": "cuotas",
+    "observaciones": "observaciones",
+    "tipo de duracion": "tipo_duracion",
+    "tipo duracion": "tipo_duracion",
+}
+
+# El cliente se indica por documento o por nombre completo (ver COLUMNAS_CLIENTE)
+COLUMNAS_OBLIGATORIAS = {
+    "numero_poliza",
+    "tipo_seguro",
+    "fecha_inicio",
+    "fecha_vencimiento",
+    "suma_asegurada",
+    "prima",
+}
+COLUMNAS_CLIENTE = ("cliente_documento", "cliente_nombre")
+
+# Campos de texto: las celdas numéricas (p. ej. documentos) se pasan a texto
+CAMPOS_TEXTO = {
+    campo
+    for campo, info in PolizaCreate.model_fields.items()
+    if info.annotation in (str, Optional[str])
+} | {"cliente_documento", "cliente_nombre", "tipo_seguro", "moneda"}
+
+Fila = Tuple[int, Dict[str, Any]]
+
+
+def _normalizar(valor: Any) -> str:
+    """Texto en minúsculas, sin tildes ni guiones bajos, para comparar claves."""
+    texto = unicodedata.normalize("NFKD", str(valor))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.replace("_", " ").lower().split())
+
+
+def _clave_nombre(nombre: str) -> str:
+    """Nombre completo en minúsculas y con espacios simples."""
+    return " ".join(nombre.lower().split())
+
+
+def _valor_celda(campo: str, valor: Any) -> Any:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if campo in CAMPOS_TEXTO and not isinstance(valor, str):
+        if isinstance(valor, float) and valor.is_integer():
+            valor = int(valor)
+        return str(valor)
+    if isinstance(valor, str):
+        return valor.strip()
+    return valor
+
+
+def leer_lotes(
+    archivo: Union[str, IO[bytes]],
+    tamano_lote: int,
+    por_defecto: Optional[Dict[str, Any]] = None,
+) -> Iterator[List[Fila]]:
+    """
+    Recorre la primera hoja de la planilla en modo de solo lectura y devuelve
+    lotes de (número de fila, valores por campo). Los campos de `por_defecto`
+    completan las celdas vacías y no hace falta que estén en la planilla.
+
+    Raises:
+        ValueError: Si el archivo no es una planilla válida o le faltan columnas
+    """
+    try:
+        libro = openpyxl.load_workbook(archivo, read_only=True, data_only=True)
+    except (BadZipFile, InvalidFileException, KeyError) as e:
+        raise ValueError("El archivo no es una planilla XLSX válida") from e
+    try:
+        filas = libro.worksheets[0].iter_rows(values_only=True)
+        encabezado = next(filas, None) or ()
+        campos = [
+            ENCABEZADOS.get(_normalizar(celda)) if celda is not None else None
+            for celda in encabezado
+        ]
+        por_defecto = por_defecto or {}
+        faltantes = sorted(COLUMNAS_OBLIGATORIAS - set(campos) - set(por_defecto))
+        if not set(COLUMNAS_CLIENTE) & set(campos):
+            faltantes.insert(0, " o ".join(COLUMNAS_CLIENTE))
+        if faltantes:
+            raise ValueError("Faltan columnas en la planilla: " + ", ".join(faltantes))
+
+        lote: List[Fila] = []
+        for numero_fila, fila in enumerate(filas, start=2):
+            valores = {
+                campo: _valor_celda(campo, valor)
+                for campo, valor in zip(campos, fila)
+                if campo is not None and valor is not None and valor != ""
+            }
+            if not valores:
+                continue
+            lote.append((numero_fila, {**por_defecto, **valores}))
+            if len(lote) >= tamano_lote:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+    finally:
+        libro.close()
+
+
+class Referencias:
+    """
+    Mapas en memoria para resolver las referencias de la planilla.
+
+    Los catálogos (tipos de seguro, monedas y corredores) se cargan enteros
+    una vez; los clientes se buscan por lote y no se conservan, para que la
+    memoria no crezca con el archivo.
+    """
+
+    def __init__(
+        self,
+        tipos_seguro: Dict[str, int],
+        monedas: Dict[str, int],
+        corredores: Set[int],
+    ):
+        self.tipos_seguro = tipos_seguro
+        self.monedas = monedas
+        self.corredores = corredores
+
+    @classmethod
+    async def cargar(cls, db: AsyncSession) -> "Referencias":
+        result = await db.execute(
+            select(TipoSeguro.id, TipoSeguro.codigo, TipoSeguro.nombre)
+        )
+        tipos = result.all()
+        # El nombre solo sirve de clave si no se repite entre tipos de seguro
+        nombres: Dict[str, List[int]] = {}
+        for id, _, nombre in tipos:
+            nombres.setdefault(_normalizar(nombre), []).append(id)
+        tipos_seguro = {
+            clave: ids[0] for clave, ids in nombres.items() if len(ids) == 1
+        }
+        tipos_seguro.update({_normalizar(codigo): id for id, codigo, _ in tipos})
+
+        result = await db.execute(select(Moneda.id, Moneda.codigo))
+        monedas = {_normalizar(codigo): id for id, codigo in result.all()}
+        result = await db.execute(select(Corredor.numero))
+        corredores = set(result.scalars().all())
+        return cls(tipos_seguro, monedas, corredores)
+
+    async def clientes(
+        self, db: AsyncSession, documentos: Set[str]
+    ) -> Dict[str, UUID]:
+        """numero_documento -> id de los clientes existentes del lote."""
+        if not documentos:
+            return {}
+        result = await db.execute(
+            select(Cliente.numero_documento, Cliente.id).where(
+                Cliente.numero_documento.in_(documentos)
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def clientes_por_nombre(
+        self, db: AsyncSession, nombres: Set[str]
+    ) -> Dict[str, List[UUID]]:
+        """
+        Nombre completo (ver _clave_nombre) -> ids de los clientes del lote
+        con ese nombre. El nombre completo es el de la exportación: nombres y
+        apellidos separados por un espacio.
+        """
+        if not nombres:
+            return {}
+        nombre_completo = Cliente.nombres + " " + Cliente.apellidos
+        result = await db.execute(
+            select(nombre_completo, Cliente.id).where(
+                func.lower(nombre_completo).in_([_clave_nombre(n) for n in nombres])
+            )
+        )
+        clientes: Dict[str, List[UUID]] = {}
+        for nombre, id in result.tuples():
+            clientes.setdefault(_clave_nombre(nombre), []).append(id)
+        return clientes
+
+    def resolver(
+        self,
+        valores: Dict[str, Any],
+        clientes: Dict[str, UUID],
+        clientes_por_nombre: Dict[str, List[UUID]],
+    ) -> None:
+        """
+        Reemplaza en `valores` las claves de negocio por los ids referenciados.
+        El cliente se busca por documento y, si la fila no lo tiene, por
+        nombre completo.
+
+        Raises:
+            ValueError: Si una referencia no existe o el nombre es ambiguo
+        """
+        documento = valores.pop("cliente_documento", None)
+        nombre = valores.pop("cliente_nombre", None)
+        if documento is not None:
+            if documento not in clientes:
+                raise ValueError(f"No existe un cliente con documento {documento}")
+            valores["cliente_id"] = clientes[documento]
+        elif nombre is not None:
+            ids = clientes_por_nombre.get(_clave_nombre(nombre), [])
+            if not ids:
+                raise ValueError(f"No existe un cliente llamado {nombre}")
+            if len(ids) > 1:
+                raise ValueError(
+                    f"Hay {len(ids)} clientes llamados {nombre}; "
+                    "indique el documento del cliente"
+                )
+            valores["cliente_id"] = ids[0]
+        else:
+            raise ValueError("Falta el documento o el nombre del cliente")
+
+        tipo_seguro = valores.pop("tipo_seguro", None)
+        if tipo_seguro is None:
+            raise ValueError("Falta el tipo de seguro")
+        if _normalizar(tipo_seguro) not in self.tipos_seguro:
+            raise ValueError(f"Tipo de seguro desconocido: {tipo_seguro}")
+        valores["tipo_seguro_id"] = self.tipos_seguro[_normalizar(tipo_seguro)]
+
+        moneda = valores.pop("moneda", None)
+        if moneda is not None:
+            if _normalizar(moneda) not in self.monedas:
+                raise ValueError(f"Moneda desconocida: {moneda}")
+            valores["moneda_id"] = self.monedas[_normalizar(moneda)]
+
+        corredor = valores.get("corredor_id")
+        if corredor is not None:
+            try:
+                valores["corredor_id"] = int(corredor)
+            except (TypeError, ValueError):
+                raise ValueError(f"Número de corredor inválido: {corredor}") from None
+            if valores["corredor_id"] not in self.corredores:
+                raise ValueError(f"No existe el corredor {corredor}")
+
+
+def _mensaje_validacion(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(parte) for parte in e['loc'])}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+async def _copiar(db: AsyncSession, registros: List[Tuple]) -> None:
+    """Copia los registros a la tabla temporal con el protocolo COPY."""
+    conexion = await (await db.connection()).get_raw_connection()
+    await conexion.driver_connection.copy_records_to_table(
+        TABLA_STAGING, records=registros, columns=["fila", *COLUMNAS_POLIZA]
+    )
+
+
+async def _fusionar(db: AsyncSession) -> int:
+    """
+    Pasa la tabla temporal a movimientos_vigencias en una sola sentencia. Si
+    un número de póliza se repite en la planilla, vale su primera fila.
+    Devuelve la cantidad de pólizas creadas.
+    """
+    staging = table(TABLA_STAGING, column("fila"), *map(column, COLUMNAS_POLIZA))
+    destino = MovimientoVigencia.__table__
+    origen = (
+        select(*(staging.c[campo] for campo in COLUMNAS_POLIZA))
+        .distinct(staging.c.numero_poliza)
+        .order_by(staging.c.numero_poliza, staging.c.fila)
+    )
+    insertadas = (
+        pg_insert(destino)
+        .from_select(COLUMNAS_POLIZA, origen)
+        .on_conflict_do_nothing(index_elements=[destino.c.numero_poliza])
+        .returning(literal_column("1"))
+        .cte("insertadas")
+    )
+    result = await db.execute(select(func.count()).select_from(insertadas))
+    return result.scalar_one()
+
+
+async def importar_polizas(
+    db: AsyncSession,
+    archivo: Union[str, IO[bytes]],
+    *,
+    alcance: Optional[Principal] = None,
+    por_defecto: Optional[Dict[str, Any]] = None,
+) -> ResultadoImportacionPolizas:
+    """
+    Importa las pólizas de una planilla XLSX en una sola transacción.
+
+    `alcance` aplica la regla de alta de los corredores: solo pueden importar
+    pólizas propias. `por_defecto` da valores (p. ej. tipo_seguro,
+    fecha_inicio y fecha_vencimiento) para las filas que no los indican.
+
+    Raises:
+        ValueError: Si el archivo no es una planilla válida o le faltan columnas
+    """
+    resultado = ResultadoImportacionPolizas(
+        filas=0, creadas=0, duplicadas=0, invalidas=0
+    )
+    lotes = leer_lotes(archivo, settings.IMPORTACION_LOTE, por_defecto)
+    try:
+        return await _importar_lotes(db, lotes, resultado, alcance)
+    finally:
+        lotes.close()
+
+
+async def _importar_lotes(
+    db: AsyncSession,
+    lotes: Iterator[List[Fila]],
+    resultado: ResultadoImportacionPolizas,
+    alcance: Optional[Principal],
+) -> ResultadoImportacionPolizas:
+    # La lectura de la planilla es bloqueante: cada lote se lee en un hilo
+    lote = await asyncio.to_thread(next, lotes, None)
+
+    referencias = await Referencias.cargar(db)
+    await db.execute(
+        text(
+            f"CREATE TEMP TABLE {TABLA_STAGING} ON COMMIT DROP AS "
+            f"SELECT 0 AS fila, {', '.join(COLUMNAS_POLIZA)} "
+            "FROM movimientos_vigencias WITH NO DATA"
+        )
+    )
+
+    validas = 0
+    while lote is not None:
+        clientes = await referencias.clientes(
+            db, {v["cliente_documento"] for _, v in lote if "cliente_documento" in v}
+        )
+        clientes_por_nombre = await referencias.clientes_por_nombre(
+            db,
+            {
+                v["cliente_nombre"]
+                for _, v in lote
+                if "cliente_nombre" in v and "cliente_documento" not in v
+            },
+        )
+        registros = []
+        for numero_fila, valores in lote:
+            resultado.filas += 1
+            numero_poliza = valores.get("numero_poliza")
+            try:
+                referencias.resolver(valores, clientes, clientes_por_nombre)
+                poliza_in = PolizaCreate.model_validate(valores)
+                error = poliza_crud.asignar_corredor_alta(poliza_in, alcance)
+            except ValidationError as e:
+                error = _mensaje_validacion(e)
+            except ValueError as e:
+                error = str(e)
+            if error:
+                resultado.invalidas += 1
+                if len(resultado.errores) < settings.IMPORTACION_MAX_ERRORES:
+                    resultado.errores.append(
+                        ErrorFilaImportacion(
+                            fila=numero_fila, numero_poliza=numero_poliza, error=error
+                        )
+                    )
+                continue
+            datos = poliza_in.model_dump()
+            datos["tipo_duracion"] = poliza_in.tipo_duracion.value
+            registros.append((numero_fila, *(datos[c] for c in COLUMNAS_POLIZA)))
+        if registros:
+            await _copiar(db, registros)
+            validas += len(registros)
+        lote = await asyncio.to_thread(next, lotes, None)
+
+    resultado.creadas = await _fusionar(db) if validas else 0
+    resultado.duplicadas = validas - resultado.creadas
+    await db.commit()
+    return resultado
+
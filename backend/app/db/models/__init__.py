@@ -5,6 +5,7 @@ from .cliente_corredor import ClienteCorredor
 from .corredor import Corredor
 from .moneda import Moneda
 from .movimiento_vigencia import MovimientoVigencia
+from .refresh_token import RefreshToken
 from .tipo_documento import TipoDocumento
 from .tipo_seguro import TipoSeguro
 from .usuario import Usuario
@@ -19,4 +20,5 @@ __all__ = [
     "Cliente",
     "ClienteCorredor",
     "MovimientoVigencia",
+    "RefreshToken",
 ]
@@ -35,4 +35,8 @@ class Aseguradora(Base):
     )
 
     # Relación con tipos de seguros
-    tipos_seguros = relationship("TipoSeguro", back_populates="aseguradora_rel")
+    tipos_seguros = relationship(
+        "TipoSeguro",
+        back_populates="aseguradora_rel",
+        lazy="raise",
+    )
@@ -6,10 +6,12 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Sequence,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -26,6 +28,39 @@ class Cliente(Base):
     """Modelo para la tabla clientes con numeración segura."""
 
     __tablename__ = "clientes"
+    __table_args__ = (
+        # Búsqueda por similitud (pg_trgm) de nombre completo, documento y mail
+        Index(
+            "ix_clientes_nombre_completo_trgm",
+            text("(nombres || ' ' || apellidos) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+        # Filtros por subcadena de nombres y de apellidos por separado
+        Index(
+            "ix_clientes_nombres_trgm",
+            "nombres",
+            postgresql_using="gin",
+            postgresql_ops={"nombres": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_clientes_apellidos_trgm",
+            "apellidos",
+            postgresql_using="gin",
+            postgresql_ops={"apellidos": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_clientes_numero_documento_trgm",
+            "numero_documento",
+            postgresql_using="gin",
+            postgresql_ops={"numero_documento": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_clientes_mail_trgm",
+            "mail",
+            postgresql_using="gin",
+            postgresql_ops={"mail": "gin_trgm_ops"},
+        ),
+    )
 
     # Secuencia para numero_cliente
     cliente_seq = Sequence("cliente_numero_seq")
@@ -72,26 +107,26 @@ class Cliente(Base):
         "Usuario",
         foreign_keys="Cliente.creado_por_id",
         back_populates="clientes_creados",
-        lazy="selectin",
+        lazy="raise",
     )
     modificado_por_usuario = relationship(
         "Usuario",
         foreign_keys="Cliente.modificado_por_id",
         back_populates="clientes_modificados",
-        lazy="selectin",
+        lazy="raise",
     )
     corredores_asociados = relationship(
         "ClienteCorredor",
         back_populates="cliente_rel",
-        lazy="selectin",
+        lazy="raise",
     )
     movimientos_vigencias = relationship(
         "MovimientoVigencia",
         back_populates="cliente_rel",
-        lazy="selectin",
+        lazy="raise",
     )
     tipo_documento_rel = relationship(
         "TipoDocumento",
         back_populates="clientes",
-        lazy="selectin",
+        lazy="raise",
     )
@@ -18,5 +18,13 @@ class ClienteCorredor(Base):
     )  # Opcional: fecha de asignación
 
     # Relaciones
-    cliente_rel = relationship("Cliente", back_populates="corredores_asociados")
-    corredor_rel = relationship("Corredor", back_populates="clientes_asociados")
+    cliente_rel = relationship(
+        "Cliente",
+        back_populates="corredores_asociados",
+        lazy="raise",
+    )
+    corredor_rel = relationship(
+        "Corredor",
+        back_populates="clientes_asociados",
+        lazy="raise",
+    )
@@ -41,6 +41,14 @@ class Corredor(Base):
     especializacion = Column(String(100))  # Especialización del corredor (opcional)
 
     # Relaciones
-    usuarios = relationship("Usuario", back_populates="corredor_rel")
-    clientes_asociados = relationship("ClienteCorredor", back_populates="corredor_rel")
-    movimientos = relationship("MovimientoVigencia", back_populates="corredor_rel")
+    usuarios = relationship("Usuario", back_populates="corredor_rel", lazy="raise")
+    clientes_asociados = relationship(
+        "ClienteCorredor",
+        back_populates="corredor_rel",
+        lazy="raise",
+    )
+    movimientos = relationship(
+        "MovimientoVigencia",
+        back_populates="corredor_rel",
+        lazy="raise",
+    )
@@ -29,4 +29,8 @@ class Moneda(Base):
     )
 
     # Relación con movimientos
-    movimientos = relationship("MovimientoVigencia", back_populates="moneda_rel")
+    movimientos = relationship(
+        "MovimientoVigencia",
+        back_populates="moneda_rel",
+        lazy="raise",
+    )
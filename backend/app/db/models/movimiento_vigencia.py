@@ -1,6 +1,16 @@
 import enum
 
-from sqlalchemy import Column, Date, Enum, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Column,
+    Date,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -22,6 +32,46 @@ class MovimientoVigencia(Base):
     """Modelo para la tabla movimientos_vigencias."""
 
     __tablename__ = "movimientos_vigencias"
+    __table_args__ = (
+        # Listados ordenados por vencimiento (con id como desempate del cursor)
+        Index("ix_movimientos_vigencias_vencimiento", "fecha_vencimiento", "id"),
+        Index(
+            "ix_movimientos_vigencias_corredor_vencimiento",
+            "corredor_id",
+            "fecha_vencimiento",
+            "id",
+        ),
+        Index(
+            "ix_movimientos_vigencias_cliente_vencimiento",
+            "cliente_id",
+            "fecha_vencimiento",
+        ),
+        Index(
+            "ix_movimientos_vigencias_estado_vencimiento",
+            "estado_poliza",
+            "fecha_vencimiento",
+        ),
+        Index("ix_movimientos_vigencias_inicio", "fecha_inicio", "id"),
+        # Pólizas activas por vencer (notificaciones de vencimiento)
+        Index(
+            "ix_movimientos_vigencias_activas_vencimiento",
+            "fecha_vencimiento",
+            postgresql_where=text("estado_poliza = 'activa'"),
+        ),
+        Index(
+            "ix_movimientos_vigencias_activas_corredor",
+            "corredor_id",
+            "fecha_vencimiento",
+            postgresql_where=text("estado_poliza = 'activa'"),
+        ),
+        # Búsqueda por similitud (pg_trgm) y filtros por subcadena
+        Index(
+            "ix_movimientos_vigencias_numero_poliza_trgm",
+            "numero_poliza",
+            postgresql_using="gin",
+            postgresql_ops={"numero_poliza": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     cliente_id = Column(UUID(as_uuid=True), ForeignKey("clientes.id"), nullable=False)
@@ -50,7 +100,15 @@ class MovimientoVigencia(Base):
     )
 
     # Relaciones
-    cliente_rel = relationship("Cliente", back_populates="movimientos_vigencias")
-    corredor_rel = relationship("Corredor", back_populates="movimientos")
-    tipo_seguro_rel = relationship("TipoSeguro", back_populates="movimientos")
-    moneda_rel = relationship("Moneda", back_populates="movimientos")
+    cliente_rel = relationship(
+        "Cliente",
+        back_populates="movimientos_vigencias",
+        lazy="raise",
+    )
+    corredor_rel = relationship("Corredor", back_populates="movimientos", lazy="raise")
+    tipo_seguro_rel = relationship(
+        "TipoSeguro",
+        back_populates="movimientos",
+        lazy="raise",
+    )
+    moneda_rel = relationship("Moneda", back_populates="movimientos", lazy="raise")
@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..base_class import Base
+
+
+def get_utc_now():
+    """Función helper para obtener el tiempo UTC actual"""
+    return datetime.now(timezone.utc)
+
+
+class RefreshToken(Base):
+    """Modelo para la tabla refresh_tokens.
+
+    Cada refresh token se usa una sola vez: al canjearlo se marca como usado y
+    se emite otro de la misma familia. Todos los tokens que descienden de un
+    mismo login comparten `familia`; si se presenta uno ya usado (posible
+    robo), se revoca la familia completa.
+
+    Solo se guarda el hash SHA-256 del token, nunca el valor original.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    usuario_id = Column(
+        Integer,
+        ForeignKey("usuarios.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    token_hash = Column(String(64), nullable=False, unique=True)
+    familia = Column(UUID(as_uuid=True), nullable=False, default=uuid.uuid4, index=True)
+    usado = Column(Boolean, nullable=False, default=False)
+    revocado = Column(Boolean, nullable=False, default=False)
+    fecha_creacion = Column(DateTime(timezone=True), default=get_utc_now)
+    fecha_expiracion = Column(DateTime(timezone=True), nullable=False)
@@ -19,4 +19,8 @@ class TipoDocumento(Base):
     esta_activo = Column(Boolean, default=True)  # Indica si está activo
 
     # Relación con clientes
-    clientes = relationship("Cliente", back_populates="tipo_documento_rel")
+    clientes = relationship(
+        "Cliente",
+        back_populates="tipo_documento_rel",
+        lazy="raise",
+    )
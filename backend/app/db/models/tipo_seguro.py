@@ -32,5 +32,13 @@ class TipoSeguro(Base):
     )
 
     # Relaciones
-    aseguradora_rel = relationship("Aseguradora", back_populates="tipos_seguros")
-    movimientos = relationship("MovimientoVigencia", back_populates="tipo_seguro_rel")
+    aseguradora_rel = relationship(
+        "Aseguradora",
+        back_populates="tipos_seguros",
+        lazy="raise",
+    )
+    movimientos = relationship(
+        "MovimientoVigencia",
+        back_populates="tipo_seguro_rel",
+        lazy="raise",
+    )
@@ -39,6 +39,8 @@ class Usuario(Base):
     )  # Relación con corredor (usando el número visible del corredor)
     comision_porcentaje = Column(Float, default=0.0)  # Solo aplicable a corredores
     telefono = Column(String(20))  # Teléfono de contacto
+    # Se incrementa para revocar los tokens emitidos al usuario
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     fecha_creacion = Column(DateTime(timezone=True), default=get_utc_now)
     fecha_modificacion = Column(
         DateTime(timezone=True), default=get_utc_now, onupdate=get_utc_now
@@ -49,18 +51,18 @@ class Usuario(Base):
         "Cliente",
         back_populates="creado_por_usuario",
         foreign_keys="Cliente.creado_por_id",
-        lazy="selectin",
+        lazy="raise",
     )
     clientes_modificados = relationship(
         "Cliente",
         back_populates="modificado_por_usuario",
         foreign_keys="Cliente.modificado_por_id",
-        lazy="selectin",
+        lazy="raise",
     )
     corredor_rel = relationship(
         "Corredor",
         back_populates="usuarios",
-        lazy="selectin",
+        lazy="raise",
     )
     
     def has_permission(self, permission: str) -> bool:
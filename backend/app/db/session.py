@@ -1,19 +0,0 @@
-from typing import AsyncGenerator
-
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
-
-from app.core.config import settings
-
-Base = declarative_base()
-
-async_engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, echo=True)
-async_session = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
-
-
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
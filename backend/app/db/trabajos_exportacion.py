@@ -0,0 +1,253 @@
+"""
+Exportaciones de pólizas en segundo plano.
+
+Un trabajo genera el archivo en disco local con su propia sesión de solo
+lectura, así la petición que lo pide responde enseguida y no retiene una
+conexión. Los trabajos corren de a EXPORTACION_WORKERS a la vez; el resto
+espera su turno. Los archivos se eliminan al vencer EXPORTACION_TTL.
+
+El registro vive en la memoria del proceso: con varios procesos de la
+aplicación, el estado y la descarga deben pedirse al mismo que creó el
+trabajo.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.crud.poliza import poliza_crud
+from app.db.database import engines
+from app.db.exportacion_polizas import (
+    MEDIA_TYPES_COPIA,
+    XLSX_MEDIA_TYPE,
+    copiar_a_archivo,
+    eliminar_archivo,
+    exportar_excel,
+    exportar_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+# Formato: (extensión, media type)
+FORMATOS_EXPORTACION = {
+    "excel": (".xlsx", XLSX_MEDIA_TYPE),
+    "pdf": (".pdf", "application/pdf"),
+    "csv": (".csv", MEDIA_TYPES_COPIA["csv"]),
+    "ndjson": (".ndjson", MEDIA_TYPES_COPIA["ndjson"]),
+}
+
+
+def _ahora() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class LimiteExportacionesError(Exception):
+    """Se alcanzó el máximo de exportaciones en curso (global o del usuario)."""
+
+
+@dataclass
+class TrabajoExportacion:
+    """Estado de una exportación en segundo plano."""
+
+    id: str
+    usuario_id: int
+    formato: str
+    estado: str = "pendiente"  # pendiente, en_proceso, completado o error
+    filas_procesadas: int = 0
+    filas_totales: Optional[int] = None
+    error: Optional[str] = None
+    ruta: Optional[str] = None
+    creado: datetime = field(default_factory=_ahora)
+    finalizado: Optional[datetime] = None
+    expira: Optional[datetime] = None
+
+    @property
+    def activo(self) -> bool:
+        return self.estado in ("pendiente", "en_proceso")
+
+    @property
+    def progreso(self) -> float:
+        """Fracción de filas procesadas, de 0 a 1."""
+        if self.estado == "completado":
+            return 1.0
+        if not self.filas_totales:
+            return 0.0
+        return min(self.filas_procesadas / self.filas_totales, 1.0)
+
+    @property
+    def url_descarga(self) -> Optional[str]:
+        if self.estado != "completado":
+            return None
+        return f"{settings.API_V1_STR}/exports/{self.id}/descarga"
+
+    @property
+    def nombre_archivo(self) -> str:
+        return "polizas" + FORMATOS_EXPORTACION[self.formato][0]
+
+    @property
+    def media_type(self) -> str:
+        return FORMATOS_EXPORTACION[self.formato][1]
+
+    def agregar_filas(self, cantidad: int) -> None:
+        self.filas_procesadas += cantidad
+
+
+class GestorExportaciones:
+    """Registro de trabajos de exportación y pool acotado que los ejecuta."""
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        max_trabajos: int,
+        max_por_usuario: int,
+        ttl: int,
+        directorio: Optional[str] = None,
+    ):
+        self.max_trabajos = max_trabajos
+        self.max_por_usuario = max_por_usuario
+        self.ttl = timedelta(seconds=ttl)
+        self.directorio = directorio or os.path.join(
+            tempfile.gettempdir(), "exportaciones"
+        )
+        self._semaforo = asyncio.Semaphore(workers)
+        self._trabajos: Dict[str, TrabajoExportacion] = {}
+        self._tareas: Dict[str, asyncio.Task] = {}
+
+    def crear(
+        self, usuario_id: int, formato: str, filters: Dict[str, Any]
+    ) -> TrabajoExportacion:
+        """
+        Registra un trabajo y lo encola.
+
+        Raises:
+            LimiteExportacionesError: Si hay demasiados trabajos activos en
+                total o del usuario
+        """
+        activos = [t for t in self._trabajos.values() if t.activo]
+        if len(activos) >= self.max_trabajos:
+            raise LimiteExportacionesError(
+                "Hay demasiadas exportaciones en curso; intente más tarde"
+            )
+        if sum(t.usuario_id == usuario_id for t in activos) >= self.max_por_usuario:
+            raise LimiteExportacionesError(
+                f"Ya tiene {self.max_por_usuario} exportaciones en curso; "
+                "espere a que terminen"
+            )
+
+        trabajo = TrabajoExportacion(
+            id=uuid.uuid4().hex, usuario_id=usuario_id, formato=formato
+        )
+        self._trabajos[trabajo.id] = trabajo
+        self._tareas[trabajo.id] = asyncio.create_task(
+            self._ejecutar(trabajo, filters)
+        )
+        return trabajo
+
+    def obtener(self, id: str) -> Optional[TrabajoExportacion]:
+        """Trabajo con ese id, si existe y no venció."""
+        trabajo = self._trabajos.get(id)
+        if trabajo is None or self._vencido(trabajo, _ahora()):
+            return None
+        return trabajo
+
+    def _ruta(self, trabajo: TrabajoExportacion) -> str:
+        extension = FORMATOS_EXPORTACION[trabajo.formato][0]
+        return os.path.join(self.directorio, trabajo.id + extension)
+
+    async def _generar(
+        self,
+        db: AsyncSession,
+        trabajo: TrabajoExportacion,
+        ruta: str,
+        filters: Dict[str, Any],
+    ) -> int:
+        """Escribe el archivo del trabajo y devuelve la cantidad de pólizas."""
+        if trabajo.formato == "excel":
+            with open(ruta, "wb") as archivo:
+                return await exportar_excel(
+                    db, archivo, progreso=trabajo.agregar_filas, **filters
+                )
+        if trabajo.formato == "pdf":
+            return await exportar_pdf(
+                db, ruta, progreso=trabajo.agregar_filas, **filters
+            )
+        return await copiar_a_archivo(
+            db, ruta, trabajo.formato, progreso=trabajo.agregar_filas, **filters
+        )
+
+    async def _ejecutar(self, trabajo: TrabajoExportacion, filters: Dict[str, Any]):
+        ruta = self._ruta(trabajo)
+        try:
+            async with self._semaforo:
+                trabajo.estado = "en_proceso"
+                os.makedirs(self.directorio, exist_ok=True)
+                async with engines.read_session() as db:
+                    trabajo.filas_totales = await poliza_crud.count_listado(
+                        db, **filters
+                    )
+                    cantidad = await self._generar(db, trabajo, ruta, filters)
+            trabajo.filas_procesadas = cantidad
+            trabajo.ruta = ruta
+            trabajo.estado = "completado"
+        except Exception:
+            logger.exception("Error en la exportación %s", trabajo.id)
+            eliminar_archivo(ruta)
+            trabajo.estado = "error"
+            trabajo.error = "No se pudo generar la exportación"
+        except asyncio.CancelledError:
+            eliminar_archivo(ruta)
+            raise
+        finally:
+            trabajo.finalizado = _ahora()
+            trabajo.expira = trabajo.finalizado + self.ttl
+            self._tareas.pop(trabajo.id, None)
+
+    def _vencido(self, trabajo: TrabajoExportacion, ahora: datetime) -> bool:
+        return trabajo.expira is not None and trabajo.expira <= ahora
+
+    def purgar_vencidos(self) -> int:
+        """Elimina los trabajos vencidos y sus archivos. Devuelve cuántos."""
+        ahora = _ahora()
+        vencidos: List[TrabajoExportacion] = [
+            t for t in self._trabajos.values() if self._vencido(t, ahora)
+        ]
+        for trabajo in vencidos:
+            if trabajo.ruta:
+                eliminar_archivo(trabajo.ruta)
+            del self._trabajos[trabajo.id]
+        return len(vencidos)
+
+    async def limpiar_periodicamente(self, intervalo: int) -> None:
+        """Purga los trabajos vencidos cada `intervalo` segundos."""
+        while True:
+            await asyncio.sleep(intervalo)
+            self.purgar_vencidos()
+
+    async def cerrar(self) -> None:
+        """Cancela los trabajos en curso y elimina todos los archivos."""
+        tareas = list(self._tareas.values())
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+        for trabajo in self._trabajos.values():
+            if trabajo.ruta:
+                eliminar_archivo(trabajo.ruta)
+        self._trabajos.clear()
+
+
+gestor_exportaciones = GestorExportaciones(
+    workers=settings.EXPORTACION_WORKERS,
+    max_trabajos=settings.EXPORTACION_TRABAJOS_MAX,
+    max_por_usuario=settings.EXPORTACION_TRABAJOS_POR_USUARIO,
+    ttl=settings.EXPORTACION_TTL,
+    directorio=settings.EXPORTACION_DIR,
+)
@@ -1,14 +1,42 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.deps import get_current_active_superuser
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.security import shutdown_password_executor
+from app.db.database import engines, start_statement_count
+from app.db.exportacion_polizas import shutdown_pdf_executor
+from app.db.trabajos_exportacion import gestor_exportaciones
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Eliminar periódicamente los archivos de exportación vencidos
+    limpieza = asyncio.create_task(
+        gestor_exportaciones.limpiar_periodicamente(
+            settings.EXPORTACION_LIMPIEZA_INTERVALO
+        )
+    )
+    yield
+    limpieza.cancel()
+    await gestor_exportaciones.cerrar()
+    # Cerrar las conexiones del pool al apagar la aplicación
+    await engines.dispose()
+    shutdown_password_executor()
+    shutdown_pdf_executor()
+
 
 # Crear la aplicación FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Configurar CORS
@@ -18,8 +46,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "X-DB-Statements"],
 )
 
+if settings.DB_COUNT_STATEMENTS:
+
+    @app.middleware("http")
+    async def count_db_statements(request: Request, call_next):
+        """Informa cuántas sentencias SQL ejecutó la petición."""
+        counter = start_statement_count()
+        response = await call_next(request)
+        response.headers["X-DB-Statements"] = str(counter.count)
+        return response
+
+
 # Configurar los routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -27,3 +67,12 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.get("/")
 async def root():
     return {"message": "Bienvenido a BrokerSeguros API"}
+
+
+@app.get("/health/db-pool", dependencies=[Depends(get_current_active_superuser)])
+async def db_pool_status() -> Dict[str, Any]:
+    """
+    Estado del pool de conexiones: conexiones en uso, overflow, esperas y
+    tiempos de obtención de conexión.
+    """
+    return engines.pool_status()
@@ -107,6 +107,10 @@ class Cliente(ClienteBase):
         from_attributes = True
 
 
+class ClienteBusqueda(Cliente):
+    relevancia: float = Field(0.0, description="Similitud con el texto buscado")
+
+
 class ClienteWithRelations(Cliente):
     tipo_documento: Optional["TipoDocumento"] = Field(
         None, description="Tipo de documento del cliente"
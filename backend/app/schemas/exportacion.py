@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class ExportacionEstado(BaseModel):
+    """Esquema para el estado de una exportación en segundo plano."""
+
+    id: str
+    formato: Literal["excel", "pdf", "csv", "ndjson"]
+    estado: Literal["pendiente", "en_proceso", "completado", "error"]
+    filas_procesadas: int
+    filas_totales: Optional[int] = None
+    progreso: float  # De 0 a 1
+    url_descarga: Optional[str] = None
+    error: Optional[str] = None
+    creado: datetime
+    finalizado: Optional[datetime] = None
+    expira: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
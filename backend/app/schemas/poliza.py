@@ -1,6 +1,6 @@
 from datetime import date
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
@@ -26,6 +26,23 @@ class EstadisticasDuracion(BaseModel):
     prima_total: float
 
 
+# Dimensiones adicionales de las estadísticas
+DimensionEstadistica = Literal["estado", "moneda", "tipo_seguro", "corredor", "mes"]
+
+
+class EstadisticasGrupo(BaseModel):
+    """
+    Esquema para las estadísticas de un valor de una dimensión: estado,
+    id de moneda, de tipo de seguro o de corredor, o el primer día del mes de
+    inicio. None agrupa las pólizas sin valor (p. ej. sin corredor).
+    """
+
+    valor: Union[int, date, str, None]
+    cantidad_polizas: int
+    suma_asegurada_total: float
+    prima_total: float
+
+
 class EstadisticasResponse(BaseModel):
     """Esquema para la respuesta de estadísticas."""
 
@@ -33,6 +50,10 @@ class EstadisticasResponse(BaseModel):
     suma_asegurada_total: float
     prima_total: float
     por_duracion: List[EstadisticasDuracion]
+    por_dimension: Dict[DimensionEstadistica, List[EstadisticasGrupo]] = Field(
+        default_factory=dict,
+        description="Estadísticas por cada dimensión pedida en agrupar_por",
+    )
 
 
 class PolizaBase(BaseModel):
@@ -152,6 +173,21 @@ class Poliza(PolizaBase):
     id: int
 
 
+class PolizaListado(Poliza):
+    """Esquema de póliza para listados, con los nombres de sus relaciones."""
+
+    cliente_nombre: Optional[str] = None
+    corredor_nombre: Optional[str] = None
+    tipo_seguro_nombre: Optional[str] = None
+    moneda_codigo: Optional[str] = None
+
+
+class PolizaBusqueda(PolizaListado):
+    """Esquema de póliza en los resultados de búsqueda."""
+
+    relevancia: float = Field(..., description="Similitud con el texto buscado")
+
+
 class PolizaDetalle(Poliza):
     """Esquema detallado de póliza con información relacionada."""
 
@@ -170,3 +206,43 @@ class PolizaDetalle(Poliza):
 
     class Config:
         populate_by_name = True
+
+
+class ResultadoCargaPoliza(BaseModel):
+    """Resultado de una fila de la carga masiva de pólizas."""
+
+    indice: int = Field(..., description="Posición de la fila en la petición")
+    numero_poliza: Optional[str] = None
+    estado: Literal["creada", "duplicada", "invalida"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class CargaMasivaPolizasResponse(BaseModel):
+    """Esquema para la respuesta de la carga masiva de pólizas."""
+
+    creadas: int
+    duplicadas: int
+    invalidas: int
+    resultados: List[ResultadoCargaPoliza]
+
+
+class ErrorFilaImportacion(BaseModel):
+    """Fila de la planilla que no se pudo importar."""
+
+    fila: int = Field(..., description="Número de fila en la planilla")
+    numero_poliza: Optional[str] = None
+    error: str
+
+
+class ResultadoImportacionPolizas(BaseModel):
+    """Esquema para el resultado de importar una planilla de pólizas."""
+
+    filas: int
+    creadas: int
+    duplicadas: int
+    invalidas: int
+    errores: List[ErrorFilaImportacion] = Field(
+        default_factory=list,
+        description="Detalle de las primeras filas inválidas",
+    )
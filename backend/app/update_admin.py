@@ -1,9 +1,9 @@
 import asyncio
-from app.db.session import async_session
+from app.db.database import AsyncSessionLocal
 from app.db.crud.usuario import usuario_crud
 
 async def update_admin():
-    async with async_session() as db:
+    async with AsyncSessionLocal() as db:
         try:
             # Obtener el usuario por username
             user = await usuario_crud.get_by_username(db, "rponce")
@@ -0,0 +1,160 @@
+"""
+Código común de los benchmarks de login.
+
+Los benchmarks corren la aplicación en el mismo proceso (httpx con transporte
+ASGI), así que comparten el event loop con la sonda que mide su demora. Usan
+la base configurada como la aplicación (.env o variables de entorno), que
+debe tener el esquema creado; crean un usuario temporal y lo eliminan al
+terminar.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from concurrent.futures import Executor, Future
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, List, Sequence, Tuple
+
+import httpx
+from sqlalchemy import delete
+
+from app.core import security
+from app.core.security import get_password_hash
+from app.db.database import engines
+from app.db.models.refresh_token import RefreshToken
+from app.db.models.usuario import Usuario
+from app.main import app
+
+PASSWORD = "benchmark-login"
+LOGIN_URL = "/api/v1/login/access-token"
+
+# Sin una línea de log por petición
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+@asynccontextmanager
+async def usuario_temporal() -> AsyncIterator[str]:
+    """Crea un usuario para el benchmark y lo elimina al salir."""
+    username = f"benchmark-{uuid.uuid4().hex[:8]}"
+    async with engines.write_session() as db:
+        usuario = Usuario(
+            nombre="Benchmark",
+            apellido="Login",
+            email=f"{username}@example.com",
+            username=username,
+            hashed_password=get_password_hash(PASSWORD),
+            role="asistente",
+            is_active=True,
+        )
+        db.add(usuario)
+        await db.commit()
+        try:
+            yield username
+        finally:
+            await db.execute(
+                delete(RefreshToken).where(RefreshToken.usuario_id == usuario.id)
+            )
+            await db.execute(delete(Usuario).where(Usuario.id == usuario.id))
+            await db.commit()
+
+
+@asynccontextmanager
+async def cliente() -> AsyncIterator[httpx.AsyncClient]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        yield c
+
+
+async def login(client: httpx.AsyncClient, username: str) -> float:
+    """Inicia sesión y devuelve la latencia en segundos."""
+    inicio = time.perf_counter()
+    response = await client.post(
+        LOGIN_URL, data={"username": username, "password": PASSWORD}
+    )
+    latencia = time.perf_counter() - inicio
+    response.raise_for_status()
+    return latencia
+
+
+async def logins_concurrentes(
+    client: httpx.AsyncClient, username: str, cantidad: int, concurrencia: int
+) -> Tuple[List[float], float]:
+    """
+    Ejecuta `cantidad` logins con a lo sumo `concurrencia` en curso.
+    Devuelve las latencias y el tiempo total en segundos.
+    """
+    semaforo = asyncio.Semaphore(concurrencia)
+
+    async def uno() -> float:
+        async with semaforo:
+            return await login(client, username)
+
+    inicio = time.perf_counter()
+    latencias = await asyncio.gather(*(uno() for _ in range(cantidad)))
+    return list(latencias), time.perf_counter() - inicio
+
+
+class SondaEventLoop:
+    """
+    Mide cuánto se demora el event loop: duerme `intervalo` segundos en
+    bucle y registra cuánto tarda de más en despertar.
+    """
+
+    def __init__(self, intervalo: float = 0.005):
+        self.intervalo = intervalo
+        self.demoras: List[float] = []
+        self._tarea = None
+
+    async def _medir(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            inicio = loop.time()
+            await asyncio.sleep(self.intervalo)
+            self.demoras.append(max(loop.time() - inicio - self.intervalo, 0.0))
+
+    def __enter__(self) -> "SondaEventLoop":
+        self._tarea = asyncio.create_task(self._medir())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._tarea.cancel()
+
+
+class _EjecutorEnLinea(Executor):
+    """Ejecuta cada tarea en el hilo que la envía (el del event loop)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        futuro: Future = Future()
+        try:
+            futuro.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            futuro.set_exception(e)
+        return futuro
+
+
+@contextmanager
+def hash_en_el_loop() -> Iterator[None]:
+    """
+    Calcula bcrypt en el hilo del event loop, como antes del pool de hilos,
+    para comparar.
+    """
+    original = security._hash_executor
+    security._hash_executor = _EjecutorEnLinea()
+    try:
+        yield
+    finally:
+        security._hash_executor = original
+
+
+def percentil(valores: Sequence[float], p: float) -> float:
+    """Percentil `p` (0-100) por el método del rango más cercano."""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    indice = max(round(p / 100 * len(ordenados) + 0.5) - 1, 0)
+    return ordenados[min(indice, len(ordenados) - 1)]
+
+
+def ms(segundos: float) -> str:
+    return f"{segundos * 1000:8.1f} ms"
@@ -0,0 +1,76 @@
+"""
+Demora del event loop con logins concurrentes.
+
+Lanza N logins a la vez contra la aplicación (en el mismo proceso) mientras
+una sonda mide cuánto se atrasa el event loop. Con bcrypt en el pool de
+hilos la demora debe quedar en pocos milisegundos aunque los logins tarden;
+con --en-el-loop se calcula bcrypt en el hilo del loop, para comparar.
+
+Uso, desde backend/ y con la base configurada como para la aplicación:
+
+    python -m benchmarks.login_concurrency --logins 64 --concurrencia 16
+    python -m benchmarks.login_concurrency --logins 64 --en-el-loop
+"""
+
+import argparse
+import asyncio
+from contextlib import nullcontext
+
+from app.core.config import settings
+from app.core.security import shutdown_password_executor
+from app.db.database import engines
+from benchmarks.login_comun import (
+    SondaEventLoop,
+    cliente,
+    hash_en_el_loop,
+    logins_concurrentes,
+    ms,
+    percentil,
+    usuario_temporal,
+)
+
+
+async def medir(logins: int, concurrencia: int, en_el_loop: bool) -> None:
+    async with usuario_temporal() as username, cliente() as client:
+        # Un login previo para abrir conexiones y calentar cachés
+        await logins_concurrentes(client, username, 1, 1)
+        with hash_en_el_loop() if en_el_loop else nullcontext():
+            with SondaEventLoop() as sonda:
+                latencias, total = await logins_concurrentes(
+                    client, username, logins, concurrencia
+                )
+
+    print(
+        f"bcrypt: {'event loop' if en_el_loop else 'pool de hilos'} "
+        f"(rounds={settings.PASSWORD_BCRYPT_ROUNDS}, "
+        f"workers={settings.PASSWORD_HASH_WORKERS})"
+    )
+    print(f"logins: {logins}, concurrencia: {concurrencia}")
+    print(f"tiempo total:     {ms(total)} ({logins / total:.1f} logins/s)")
+    print(f"latencia p50:     {ms(percentil(latencias, 50))}")
+    print(f"demora loop p50:  {ms(percentil(sonda.demoras, 50))}")
+    print(f"demora loop p99:  {ms(percentil(sonda.demoras, 99))}")
+    print(f"demora loop máx.: {ms(max(sonda.demoras, default=0.0))}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument(
+        "--concurrencia", type=int, help="logins en curso a la vez (por defecto N)"
+    )
+    parser.add_argument(
+        "--en-el-loop",
+        action="store_true",
+        help="calcular bcrypt en el hilo del event loop",
+    )
+    args = parser.parse_args()
+    try:
+        await medir(args.logins, args.concurrencia or args.logins, args.en_el_loop)
+    finally:
+        await engines.dispose()
+        shutdown_password_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
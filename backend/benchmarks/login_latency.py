@@ -0,0 +1,71 @@
+"""
+Latencia del login según la concurrencia.
+
+Para cada nivel de concurrencia ejecuta una tanda de logins contra la
+aplicación (en el mismo proceso) y muestra las latencias p50 y p99 y los
+logins por segundo. Con --en-el-loop se calcula bcrypt en el hilo del event
+loop, para comparar con el pool de hilos.
+
+Uso, desde backend/ y con la base configurada como para la aplicación:
+
+    python -m benchmarks.login_latency --niveles 1 4 16 64 --logins 64
+"""
+
+import argparse
+import asyncio
+from contextlib import nullcontext
+from typing import Sequence
+
+from app.core.config import settings
+from app.core.security import shutdown_password_executor
+from app.db.database import engines
+from benchmarks.login_comun import (
+    cliente,
+    hash_en_el_loop,
+    logins_concurrentes,
+    ms,
+    percentil,
+    usuario_temporal,
+)
+
+
+async def medir(niveles: Sequence[int], logins: int, en_el_loop: bool) -> None:
+    print(
+        f"bcrypt: {'event loop' if en_el_loop else 'pool de hilos'} "
+        f"(rounds={settings.PASSWORD_BCRYPT_ROUNDS}, "
+        f"workers={settings.PASSWORD_HASH_WORKERS}), {logins} logins por nivel"
+    )
+    print(f"{'concurrencia':>12} {'p50':>11} {'p99':>11} {'logins/s':>9}")
+    async with usuario_temporal() as username, cliente() as client:
+        # Un login previo para abrir conexiones y calentar cachés
+        await logins_concurrentes(client, username, 1, 1)
+        with hash_en_el_loop() if en_el_loop else nullcontext():
+            for concurrencia in niveles:
+                latencias, total = await logins_concurrentes(
+                    client, username, logins, concurrencia
+                )
+                print(
+                    f"{concurrencia:>12} {ms(percentil(latencias, 50))} "
+                    f"{ms(percentil(latencias, 99))} {logins / total:>9.1f}"
+                )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--niveles", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--logins", type=int, default=64, help="logins por nivel")
+    parser.add_argument(
+        "--en-el-loop",
+        action="store_true",
+        help="calcular bcrypt en el hilo del event loop",
+    )
+    args = parser.parse_args()
+    try:
+        await medir(args.niveles, args.logins, args.en_el_loop)
+    finally:
+        await engines.dispose()
+        shutdown_password_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+Tiempo de generación del reporte PDF de pólizas.
+
+Escribe un CSV con filas sintéticas (siempre las mismas para una semilla) y
+lo pasa por renderizar_reporte, como hace el pool de procesos de la
+exportación. No usa la base de datos. Termina con error si la memoria
+máxima del proceso supera --memoria-max: el reporte se arma de a una página
+y solo debería crecer con el contenido ya dibujado (unos 20 KB por página).
+
+Uso, desde backend/:
+
+    python -m benchmarks.reporte_pdf --filas 50000
+    python -m benchmarks.reporte_pdf --filas 50000 --pdf /tmp/reporte.pdf
+"""
+
+import argparse
+import csv
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from app.core.reporte_pdf import renderizar_reporte
+
+ESTADOS = ["activa", "vencida", "cancelada", "renovada"]
+NOMBRES = ["Carlos", "María", "José", "Ana", "Luis", "Lucía", "Jorge", "Sofía"]
+APELLIDOS = ["González", "Rodríguez", "Pérez", "Fernández", "Martínez", "Silva"]
+
+
+def escribir_datos(ruta: str, filas: int, semilla: int) -> None:
+    """CSV sin encabezado con las columnas de renderizar_reporte."""
+    azar = random.Random(semilla)
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        for i in range(1, filas + 1):
+            suma = azar.randrange(1_000, 500_000)
+            escritor.writerow(
+                [
+                    i,
+                    f"POL-{i:07d}",
+                    f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}",
+                    azar.choice(ESTADOS),
+                    suma,
+                    round(suma * azar.uniform(0.01, 0.05), 2),
+                ]
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filas", type=int, default=50_000)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--pdf", help="conservar el PDF en esta ruta")
+    parser.add_argument(
+        "--memoria-max", type=int, default=128, help="MiB (por defecto 128)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_datos = os.path.join(directorio, "polizas.csv")
+        ruta_pdf = args.pdf or os.path.join(directorio, "polizas.pdf")
+        escribir_datos(ruta_datos, args.filas, args.semilla)
+
+        inicio = time.perf_counter()
+        cantidad, paginas = renderizar_reporte(ruta_datos, ruta_pdf, "Benchmark")
+        duracion = time.perf_counter() - inicio
+        tamano = os.path.getsize(ruta_pdf)
+
+    # ru_maxrss está en KiB en Linux
+    memoria = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"pólizas:        {cantidad}")
+    print(f"páginas:        {paginas}")
+    print(f"tiempo:         {duracion:.2f} s ({cantidad / duracion:,.0f} filas/s)")
+    print(f"tamaño del PDF: {tamano / 1024 / 1024:.1f} MiB")
+    print(f"memoria máxima: {memoria:.0f} MiB")
+    if memoria > args.memoria_max:
+        sys.exit(f"La memoria máxima supera {args.memoria_max} MiB")
+
+
+if __name__ == "__main__":
+    main()
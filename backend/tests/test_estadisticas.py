@@ -0,0 +1,111 @@
+"""Estadísticas de pólizas (GROUPING SETS)."""
+
+from typing import Any, Dict, Tuple
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.crud.poliza import DIMENSIONES_ESTADISTICAS, poliza_crud
+from app.db.models import MovimientoVigencia
+
+from .conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+DIMENSIONES = list(DIMENSIONES_ESTADISTICAS)
+AGREGADOS = (
+    func.count(MovimientoVigencia.id),
+    func.sum(MovimientoVigencia.suma_asegurada),
+    func.sum(MovimientoVigencia.prima),
+)
+
+
+@pytest.fixture
+async def polizas(crear_polizas):
+    # 40 días de fechas de inicio: al menos dos meses
+    await crear_polizas(40)
+    await crear_polizas(5, estado_poliza="cancelada", corredor_id=None, moneda_id=None)
+    await crear_polizas(3, tipo_duracion="mensual", estado_poliza="vencida")
+
+
+def _por_valor(grupos) -> Dict[Any, Tuple]:
+    return {
+        g["valor"]: (
+            g["cantidad_polizas"],
+            pytest.approx(g["suma_asegurada_total"]),
+            pytest.approx(g["prima_total"]),
+        )
+        for g in grupos
+    }
+
+
+async def _group_by(db, columna, **filters) -> Dict[Any, Tuple]:
+    query = poliza_crud._apply_filters(
+        select(columna, *AGREGADOS).group_by(columna), **filters
+    )
+    return {valor: tuple(agregados) for valor, *agregados in await db.execute(query)}
+
+
+@pytest.mark.parametrize("filters", [{}, {"estado": "activa"}, {"corredor_id": 7}])
+async def test_coincide_con_group_by_por_dimension(db, polizas, filters):
+    por_duracion, por_dimension, totales = await poliza_crud.get_estadisticas(
+        db, dimensiones=DIMENSIONES, **filters
+    )
+
+    cantidad, suma, prima = (
+        await db.execute(poliza_crud._apply_filters(select(*AGREGADOS), **filters))
+    ).one()
+    assert totales == {
+        "cantidad_polizas": cantidad,
+        "suma_asegurada_total": pytest.approx(suma),
+        "prima_total": pytest.approx(prima),
+    }
+    assert _por_valor(por_duracion) == await _group_by(
+        db, MovimientoVigencia.tipo_duracion, **filters
+    )
+    assert set(por_dimension) == set(DIMENSIONES)
+    for nombre, columna in DIMENSIONES_ESTADISTICAS.items():
+        assert _por_valor(por_dimension[nombre]) == await _group_by(
+            db, columna, **filters
+        ), nombre
+
+
+async def test_sin_dimensiones(db, polizas):
+    por_duracion, por_dimension, totales = await poliza_crud.get_estadisticas(db)
+    assert por_dimension == {}
+    assert totales["cantidad_polizas"] == 48
+    assert sum(g["cantidad_polizas"] for g in por_duracion) == 48
+
+
+async def test_sin_polizas(db, catalogos):
+    por_duracion, por_dimension, totales = await poliza_crud.get_estadisticas(
+        db, dimensiones=["estado"]
+    )
+    assert (por_duracion, por_dimension["estado"]) == ([], [])
+    assert totales["cantidad_polizas"] == 0
+
+
+async def test_dimension_invalida(db):
+    with pytest.raises(ValueError):
+        await poliza_crud.get_estadisticas(db, dimensiones=["aseguradora"])
+
+
+async def test_varias_dimensiones_en_una_sentencia(client, admin, polizas):
+    headers = auth_headers(admin)
+    # La primera petición autenticada resuelve la versión del token
+    await client.get("/api/v1/polizas/", headers=headers)
+
+    response = await client.get(
+        "/api/v1/polizas/estadisticas/",
+        headers=headers,
+        params={"estado": "", "agrupar_por": DIMENSIONES},
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["X-DB-Statements"] == "1"
+    cuerpo = response.json()
+    assert cuerpo["total_polizas"] == 48
+    assert set(cuerpo["por_dimension"]) == set(DIMENSIONES)
+    estados = {
+        g["valor"]: g["cantidad_polizas"] for g in cuerpo["por_dimension"]["estado"]
+    }
+    assert estados == {"activa": 40, "cancelada": 5, "vencida": 3}
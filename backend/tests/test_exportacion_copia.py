@@ -0,0 +1,85 @@
+"""Exportación de pólizas a CSV y NDJSON con COPY."""
+
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.db.exportacion_polizas import exportar_copia
+
+from .conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+# Comillas, comas, barra invertida y acentos: todo debe llegar tal cual
+NOMBRES = 'Ana "La Jefa", Ñandú'
+APELLIDOS = "O'Brien \\ Sur"
+
+
+@pytest.fixture
+async def polizas(crear_clientes, crear_polizas):
+    (cliente_id,) = await crear_clientes(1, nombres=NOMBRES, apellido=APELLIDOS)
+    await crear_polizas(3, cliente_id=cliente_id)
+    await crear_polizas(2, estado_poliza="cancelada")
+
+
+async def _exportar(client, admin, formato: str, **params):
+    response = await client.get(
+        f"/api/v1/polizas/exportar/{formato}/",
+        headers=auth_headers(admin),
+        params=params,
+    )
+    assert response.status_code == 200, response.text
+    return response
+
+
+async def test_csv(client, admin, polizas):
+    response = await _exportar(client, admin, "csv")
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+
+    filas = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(filas) == 3
+    assert {"id", "numero_poliza", "cliente_nombre", "prima"} <= set(filas[0])
+    assert {f["cliente_nombre"] for f in filas} == {f"{NOMBRES} {APELLIDOS}"}
+    assert {f["estado_poliza"] for f in filas} == {"activa"}
+
+
+async def test_ndjson(client, admin, polizas):
+    response = await _exportar(client, admin, "ndjson")
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    filas = [json.loads(linea) for linea in response.text.splitlines()]
+    assert len(filas) == 3
+    assert {f["cliente_nombre"] for f in filas} == {f"{NOMBRES} {APELLIDOS}"}
+    # Los números llegan como números JSON, no como texto
+    assert sorted(f["prima"] for f in filas) == [10, 11, 12]
+
+
+@pytest.mark.parametrize("formato", ["csv", "ndjson"])
+async def test_filtros(client, admin, polizas, formato):
+    response = await _exportar(
+        client, admin, formato, estado="cancelada", ordenar_por="numero_poliza"
+    )
+    lineas = response.text.splitlines()
+    if formato == "csv":
+        lineas = lineas[1:]
+    assert len(lineas) == 2
+    assert all("cancelada" in linea for linea in lineas)
+
+
+async def test_desconexion_cancela_la_copia(crear_polizas, monkeypatch):
+    # Varios fragmentos (de unos 8 KB) y un solo lugar en la cola de la copia
+    monkeypatch.setattr(settings, "EXPORTACION_COPY_BUFFER", 1)
+    await crear_polizas(300)
+    fragmentos = exportar_copia("csv", estado="activa")
+    assert isinstance(await fragmentos.__anext__(), bytes)
+    await asyncio.sleep(0.1)  # la copia llena la cola y queda esperando
+
+    await fragmentos.aclose()
+    pendientes = [
+        t for t in asyncio.all_tasks() if t.get_coro().__name__ == "producir"
+    ]
+    assert pendientes == []
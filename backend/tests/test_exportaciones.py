@@ -0,0 +1,189 @@
+"""Exportaciones de pólizas en segundo plano."""
+
+import asyncio
+import csv
+import io
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.models import Usuario
+from app.db.trabajos_exportacion import (
+    GestorExportaciones,
+    LimiteExportacionesError,
+    TrabajoExportacion,
+    gestor_exportaciones,
+)
+
+from .conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+FILTROS = {"estado": "activa"}
+
+
+@pytest.fixture
+async def gestor(tmp_path, esquema):
+    gestor = GestorExportaciones(
+        workers=1, max_trabajos=3, max_por_usuario=2, ttl=60, directorio=str(tmp_path)
+    )
+    yield gestor
+    await gestor.cerrar()
+
+
+@pytest.fixture
+async def gestor_global(tmp_path, monkeypatch, esquema):
+    """El gestor de la aplicación, con los archivos en un directorio propio."""
+    monkeypatch.setattr(gestor_exportaciones, "directorio", str(tmp_path))
+    yield gestor_exportaciones
+    await gestor_exportaciones.cerrar()
+
+
+@pytest.fixture
+async def otro_usuario(db) -> Usuario:
+    usuario = Usuario(
+        nombre="Otro",
+        apellido="Usuario",
+        email="otro@example.com",
+        username="otro",
+        hashed_password="-",
+        role="asistente",
+        is_active=True,
+    )
+    db.add(usuario)
+    await db.commit()
+    return usuario
+
+
+async def _esperar(trabajo: TrabajoExportacion) -> None:
+    for _ in range(200):
+        if not trabajo.activo:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"El trabajo sigue {trabajo.estado}")
+
+
+def _bloquear(gestor: GestorExportaciones) -> asyncio.Event:
+    """Los trabajos del gestor quedan en curso hasta activar el evento."""
+    liberar = asyncio.Event()
+
+    async def generar(db, trabajo, ruta, filters):
+        await liberar.wait()
+        return 0
+
+    gestor._generar = generar
+    return liberar
+
+
+async def test_trabajo_pendiente_hasta_completado(gestor, crear_polizas):
+    await crear_polizas(3)
+    trabajo = gestor.crear(1, "csv", FILTROS)
+    assert trabajo.estado == "pendiente"
+    assert trabajo.url_descarga is None
+
+    await _esperar(trabajo)
+    assert trabajo.estado == "completado"
+    assert (trabajo.filas_totales, trabajo.filas_procesadas) == (3, 3)
+    assert trabajo.progreso == 1.0
+    assert trabajo.expira == trabajo.finalizado + timedelta(seconds=60)
+    with open(trabajo.ruta, newline="", encoding="utf-8") as archivo:
+        assert len(list(csv.DictReader(archivo))) == 3
+
+
+async def test_trabajo_con_error(gestor, tmp_path):
+    ruta = tmp_path / "parcial.csv"
+
+    async def generar(db, trabajo, ruta_trabajo, filters):
+        ruta.write_text("a medias")
+        raise RuntimeError("falla de la copia")
+
+    gestor._ruta = lambda trabajo: str(ruta)
+    gestor._generar = generar
+    trabajo = gestor.crear(1, "csv", FILTROS)
+    await _esperar(trabajo)
+
+    assert trabajo.estado == "error"
+    assert trabajo.error == "No se pudo generar la exportación"
+    assert trabajo.ruta is None
+    assert not ruta.exists()
+
+
+async def test_limites_por_usuario_y_global(gestor):
+    liberar = _bloquear(gestor)
+    gestor.crear(1, "csv", FILTROS)
+    gestor.crear(1, "pdf", FILTROS)
+    with pytest.raises(LimiteExportacionesError, match="Ya tiene 2"):
+        gestor.crear(1, "excel", FILTROS)
+
+    gestor.crear(2, "csv", FILTROS)
+    with pytest.raises(LimiteExportacionesError, match="demasiadas"):
+        gestor.crear(3, "csv", FILTROS)
+
+    # Los trabajos terminados no cuentan
+    liberar.set()
+    for trabajo in list(gestor._trabajos.values()):
+        await _esperar(trabajo)
+    gestor.crear(3, "csv", FILTROS)
+
+
+async def test_purga_vencidos(gestor, crear_polizas):
+    await crear_polizas(1)
+    trabajo = gestor.crear(1, "csv", FILTROS)
+    await _esperar(trabajo)
+    assert os.path.exists(trabajo.ruta)
+
+    assert gestor.purgar_vencidos() == 0
+    trabajo.expira = datetime.now(timezone.utc) - timedelta(seconds=1)
+    assert gestor.obtener(trabajo.id) is None
+    assert gestor.purgar_vencidos() == 1
+    assert not os.path.exists(trabajo.ruta)
+    assert trabajo.id not in gestor._trabajos
+
+
+async def test_descarga_del_archivo(client, admin, crear_polizas, gestor_global):
+    await crear_polizas(2)
+    headers = auth_headers(admin)
+    response = await client.get(
+        "/api/v1/polizas/exportar/csv/", headers=headers, params={"asincrono": True}
+    )
+    assert response.status_code == 202, response.text
+    estado = response.json()
+    assert response.headers["Location"] == f"/api/v1/exports/{estado['id']}"
+
+    await _esperar(gestor_global.obtener(estado["id"]))
+    estado = (await client.get(response.headers["Location"], headers=headers)).json()
+    assert estado["estado"] == "completado"
+    assert estado["progreso"] == 1.0
+
+    descarga = await client.get(estado["url_descarga"], headers=headers)
+    assert descarga.status_code == 200
+    assert descarga.headers["content-type"].startswith("text/csv")
+    assert len(list(csv.DictReader(io.StringIO(descarga.text)))) == 2
+
+
+async def test_trabajo_de_otro_usuario_no_se_encuentra(
+    client, admin, otro_usuario, gestor_global
+):
+    liberar = _bloquear(gestor_global)
+    trabajo = gestor_global.crear(admin.id, "csv", FILTROS)
+    headers = auth_headers(otro_usuario)
+    url = f"/api/v1/exports/{trabajo.id}"
+    for ruta in (url, f"{url}/descarga"):
+        assert (await client.get(ruta, headers=headers)).status_code == 404
+    # Quien lo creó sí lo ve; todavía no se puede descargar
+    headers = auth_headers(admin)
+    response = await client.get(url, headers=headers)
+    assert response.json()["estado"] in ("pendiente", "en_proceso")
+    assert (await client.get(f"{url}/descarga", headers=headers)).status_code == 409
+    liberar.set()
+
+
+async def test_limite_responde_429(client, admin, gestor_global, monkeypatch):
+    monkeypatch.setattr(gestor_global, "max_por_usuario", 0)
+    response = await client.get(
+        "/api/v1/polizas/exportar/csv/",
+        headers=auth_headers(admin),
+        params={"asincrono": True},
+    )
+    assert response.status_code == 429
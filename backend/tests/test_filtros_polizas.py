@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+import pytest
+
+from .conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+async def _numeros(client, admin, **params):
+    response = await client.get(
+        "/api/v1/polizas/", params=params, headers=auth_headers(admin)
+    )
+    assert response.status_code == 200, response.text
+    return sorted(p["numero_poliza"] for p in response.json())
+
+
+async def _crear_vigente_y_vencida(crear_polizas):
+    hoy = date.today()
+    await crear_polizas(1, numero_poliza="VIGENTE", fecha_vencimiento=hoy)
+    await crear_polizas(
+        1,
+        numero_poliza="VENCIDA",
+        fecha_inicio=hoy - timedelta(days=400),
+        fecha_vencimiento=hoy - timedelta(days=1),
+    )
+
+
+async def test_listado_incluye_vencidas_por_defecto(client, admin, crear_polizas):
+    # Antes de los filtros declarativos el parámetro se ignoraba y el listado
+    # siempre incluía las vencidas; el valor por defecto conserva ese resultado
+    await _crear_vigente_y_vencida(crear_polizas)
+    assert await _numeros(client, admin) == ["VENCIDA", "VIGENTE"]
+
+
+async def test_listado_excluye_vencidas_si_se_pide(client, admin, crear_polizas):
+    await _crear_vigente_y_vencida(crear_polizas)
+    assert await _numeros(client, admin, incluir_vencidas="false") == ["VIGENTE"]
+
+
+async def test_proximo_vencimiento_excluye_vencidas(client, admin, crear_polizas):
+    await _crear_vigente_y_vencida(crear_polizas)
+    assert await _numeros(client, admin, proximo_vencimiento=30) == ["VIGENTE"]
+
+
+async def test_ordenar_por_campo_no_permitido(client, admin):
+    response = await client.get(
+        "/api/v1/polizas/",
+        params={"ordenar_por": "observaciones"},
+        headers=auth_headers(admin),
+    )
+    assert response.status_code == 400
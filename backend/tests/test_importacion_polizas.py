@@ -0,0 +1,84 @@
+"""Importación de planillas de pólizas."""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.models import MovimientoVigencia
+
+from .conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+# Planilla de ejemplo del repositorio, con el formato de la exportación
+PLANILLA_EJEMPLO = Path(__file__).resolve().parents[2] / "polizas.xlsx"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+POR_DEFECTO = {
+    "tipo_seguro": "AUTO",
+    "fecha_inicio": "2024-01-01",
+    "fecha_vencimiento": "2025-01-01",
+}
+
+
+async def _importar(client, headers, contenido: bytes, params=None):
+    return await client.post(
+        "/api/v1/polizas/importar",
+        headers=headers,
+        params=params,
+        files={"archivo": ("polizas.xlsx", contenido, XLSX_MEDIA_TYPE)},
+    )
+
+
+async def test_importa_la_planilla_de_ejemplo(client, admin, crear_clientes):
+    await crear_clientes(1, nombres="Carlos", apellido="González")
+
+    response = await _importar(
+        client, auth_headers(admin), PLANILLA_EJEMPLO.read_bytes(), POR_DEFECTO
+    )
+    assert response.status_code == 200, response.text
+    resultado = response.json()
+    assert resultado["errores"] == []
+    assert (resultado["filas"], resultado["creadas"]) == (5, 5)
+
+
+async def test_sin_valores_por_defecto_informa_las_columnas_faltantes(
+    client, admin, catalogos
+):
+    response = await _importar(
+        client, auth_headers(admin), PLANILLA_EJEMPLO.read_bytes()
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == (
+        "Faltan columnas en la planilla: "
+        "fecha_inicio, fecha_vencimiento, tipo_seguro"
+    )
+
+
+async def test_nombre_de_cliente_ambiguo_es_error_de_fila(
+    client, admin, crear_clientes
+):
+    await crear_clientes(2, nombres="Carlos", apellido="González")
+
+    response = await _importar(
+        client, auth_headers(admin), PLANILLA_EJEMPLO.read_bytes(), POR_DEFECTO
+    )
+    resultado = response.json()
+    assert (resultado["creadas"], resultado["invalidas"]) == (0, 5)
+    assert resultado["errores"][0]["error"] == (
+        "Hay 2 clientes llamados Carlos González; indique el documento del cliente"
+    )
+
+
+async def test_reimporta_una_exportacion(client, admin, crear_polizas, db):
+    await crear_polizas(3)
+    headers = auth_headers(admin)
+    exportacion = await client.get("/api/v1/polizas/exportar/excel/", headers=headers)
+    assert exportacion.status_code == 200, exportacion.text
+    await db.execute(MovimientoVigencia.__table__.delete())
+    await db.commit()
+
+    response = await _importar(client, headers, exportacion.content, POR_DEFECTO)
+    assert response.status_code == 200, response.text
+    assert response.json()["creadas"] == 3
+    assert await db.scalar(select(func.count(MovimientoVigencia.id))) == 3
@@ -0,0 +1,145 @@
+"""
+Índices de los filtros del listado de pólizas.
+
+Con los recorridos secuenciales desactivados, el plan de cada combinación de
+filtros de _apply_filters debe resolverse con un índice: ningún Seq Scan y
+ningún recorrido completo de un índice que no sea parcial (el reemplazo que
+elige el planificador cuando ningún índice sirve a la condición).
+"""
+
+import json
+from datetime import date, timedelta
+from itertools import combinations
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.db.base import Base
+from app.db.crud.poliza import FILTROS_POLIZA, poliza_crud
+from app.db.database import engines
+from app.db.models import MovimientoVigencia
+
+pytestmark = pytest.mark.anyio
+
+HOY = date.today()
+
+# Filtros que debe resolver un índice, solos o combinados entre sí
+FILTROS_INDEXADOS: Dict[str, Any] = {
+    "cliente_id": None,  # se completa con un cliente existente
+    "corredor_id": 7,
+    "estado": "activa",
+    "fecha_inicio": HOY - timedelta(days=30),
+    "fecha_fin": HOY,
+    "vencimiento_desde": HOY,
+    "vencimiento_hasta": HOY + timedelta(days=30),
+    "incluir_vencidas": False,
+    "numero_poliza": "POL-0001",
+    "cliente_nombre": "Cliente",
+    "cliente_apellido": "Pérez",
+}
+# Filtros por subcadena: usan índices de trigramas (pg_trgm)
+FILTROS_TRIGRAMAS = {"numero_poliza", "cliente_nombre", "cliente_apellido"}
+# Filtros que se aplican sobre las filas que ya seleccionó un filtro indexado
+FILTROS_RESIDUALES: Dict[str, Any] = {
+    "tipo_seguro_id": 1,
+    "moneda_id": 1,
+    "suma_asegurada_min": 100.0,
+    "suma_asegurada_max": 5000.0,
+    "prima_min": 1.0,
+    "prima_max": 500.0,
+    "tipo_duracion": "anual",
+}
+
+INDICES_PARCIALES = {
+    indice.name
+    for tabla in Base.metadata.sorted_tables
+    for indice in tabla.indexes
+    if indice.dialect_options["postgresql"]["where"] is not None
+}
+
+
+def test_todos_los_filtros_estan_clasificados():
+    assert set(FILTROS_POLIZA) <= set(FILTROS_INDEXADOS) | set(FILTROS_RESIDUALES)
+
+
+def _nodos(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for hijo in plan.get("Plans", []):
+        yield from _nodos(hijo)
+
+
+def _recorridos_sin_indice(plan: Dict[str, Any]) -> List[str]:
+    problemas = []
+    for nodo in _nodos(plan):
+        tipo = nodo["Node Type"]
+        if tipo == "Seq Scan":
+            problemas.append(f"Seq Scan on {nodo['Relation Name']}")
+        elif (
+            tipo in ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+            and "Index Cond" not in nodo
+            and nodo["Index Name"] not in INDICES_PARCIALES
+        ):
+            problemas.append(f"{tipo} completo de {nodo['Index Name']}")
+    return problemas
+
+
+async def _explicar(filtros: Dict[str, Any]) -> Dict[str, Any]:
+    query = poliza_crud._apply_filters(select(MovimientoVigencia.id), **filtros)
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    async with engines.primary.connect() as conexion:
+        await conexion.execute(text("SET enable_seqscan = off"))
+        resultado = await conexion.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    if isinstance(resultado, str):
+        resultado = json.loads(resultado)
+    return resultado[0]["Plan"]
+
+
+@pytest.fixture
+async def filtros_indexados(esquema, crear_polizas, db) -> Dict[str, Any]:
+    await crear_polizas(20)
+    filtros = dict(FILTROS_INDEXADOS)
+    filtros["cliente_id"] = await db.scalar(select(MovimientoVigencia.cliente_id))
+    if not esquema["pg_trgm"]:
+        for nombre in FILTROS_TRIGRAMAS:
+            del filtros[nombre]
+    return filtros
+
+
+async def _verificar(combinaciones: Iterator[Dict[str, Any]]) -> None:
+    problemas = {}
+    for filtros in combinaciones:
+        sin_indice = _recorridos_sin_indice(await _explicar(filtros))
+        if sin_indice:
+            problemas[", ".join(filtros)] = sin_indice
+    assert problemas == {}
+
+
+async def test_filtros_indexados_usan_indices(filtros_indexados):
+    await _verificar(
+        {nombre: filtros_indexados[nombre] for nombre in combinacion}
+        for cantidad in (1, 2)
+        for combinacion in combinations(filtros_indexados, cantidad)
+    )
+
+
+async def test_filtros_residuales_combinados_usan_indices(filtros_indexados):
+    await _verificar(
+        {nombre: valor, residual: valor_residual}
+        for nombre, valor in filtros_indexados.items()
+        for residual, valor_residual in FILTROS_RESIDUALES.items()
+    )
+
+
+async def test_filtros_de_nombre_usan_trigramas(esquema, filtros_indexados):
+    if not esquema["pg_trgm"]:
+        pytest.skip("Requiere la extensión pg_trgm")
+    for nombre, indice in (
+        ("cliente_nombre", "ix_clientes_nombres_trgm"),
+        ("cliente_apellido", "ix_clientes_apellidos_trgm"),
+    ):
+        plan = await _explicar({nombre: filtros_indexados[nombre]})
+        assert indice in {n.get("Index Name") for n in _nodos(plan)}
@@ -0,0 +1,65 @@
+from itertools import cycle
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+
+from app.db.crud.pagination import Cursor, paginate
+from app.db.models.movimiento_vigencia import MovimientoVigencia, TipoDuracion
+
+from .conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+class _ConsultaCapturada(Exception):
+    pass
+
+
+class _SesionFalsa:
+    """Registra la consulta en lugar de ejecutarla."""
+
+    async def execute(self, query):
+        self.sql = query.compile(dialect=PGDialect_asyncpg()).string
+        raise _ConsultaCapturada
+
+
+async def test_cursor_usa_el_tipo_de_cada_columna():
+    sesion = _SesionFalsa()
+    with pytest.raises(_ConsultaCapturada):
+        await paginate(
+            sesion,
+            select(MovimientoVigencia.id),
+            [MovimientoVigencia.tipo_duracion, MovimientoVigencia.id],
+            cursor=Cursor(values=["anual", 10]),
+        )
+    assert "($1::tipo_duracion, $2::INTEGER)" in sesion.sql
+
+
+async def test_recorre_listado_ordenado_por_tipo_duracion(
+    client, admin, crear_polizas, db
+):
+    ids = await crear_polizas(7)
+    duraciones = cycle([TipoDuracion.anual, TipoDuracion.mensual, TipoDuracion.diaria])
+    for poliza_id, duracion in zip(ids, duraciones):
+        poliza = await db.get(MovimientoVigencia, poliza_id)
+        poliza.tipo_duracion = duracion
+    await db.commit()
+
+    vistos = []
+    params = {"ordenar_por": "tipo_duracion", "limit": 2}
+    while True:
+        response = await client.get(
+            "/api/v1/polizas/", params=params, headers=auth_headers(admin)
+        )
+        assert response.status_code == 200, response.text
+        vistos.extend((p["tipo_duracion"], p["id"]) for p in response.json())
+        siguiente = response.headers.get("X-Next-Cursor")
+        if siguiente is None:
+            break
+        params = {"ordenar_por": "tipo_duracion", "limit": 2, "cursor": siguiente}
+
+    # PostgreSQL ordena el ENUM por el orden de declaración de sus valores
+    orden = [duracion.value for duracion in TipoDuracion]
+    assert len(vistos) == 7
+    assert vistos == sorted(vistos, key=lambda par: (orden.index(par[0]), par[1]))
@@ -0,0 +1,61 @@
+"""Rotación de refresh tokens."""
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models.refresh_token import RefreshToken
+
+pytestmark = pytest.mark.anyio
+
+
+async def _login(client) -> str:
+    response = await client.post(
+        "/api/v1/login/access-token",
+        data={"username": "admin", "password": "secreto"},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["refresh_token"]
+
+
+async def _refresh(client, refresh_token: str):
+    return await client.post(
+        "/api/v1/login/refresh", json={"refresh_token": refresh_token}
+    )
+
+
+async def _vigentes(db, usuario_id: int) -> int:
+    result = await db.execute(
+        select(RefreshToken).filter(
+            RefreshToken.usuario_id == usuario_id,
+            RefreshToken.usado.is_(False),
+            RefreshToken.revocado.is_(False),
+        )
+    )
+    return len(result.scalars().all())
+
+
+async def test_refresh_rota_el_token(client, admin, db):
+    refresh_token = await _login(client)
+
+    response = await _refresh(client, refresh_token)
+    assert response.status_code == 200, response.text
+    assert response.json()["refresh_token"] != refresh_token
+    assert await _vigentes(db, admin.id) == 1
+
+    # Reutilizar el token ya canjeado revoca la familia
+    assert (await _refresh(client, refresh_token)).status_code == 401
+    assert await _vigentes(db, admin.id) == 0
+
+
+async def test_refresh_de_usuario_inactivo_no_deja_sucesor(client, admin, db):
+    refresh_token = await _login(client)
+    admin.is_active = False
+    await db.commit()
+
+    assert (await _refresh(client, refresh_token)).status_code == 401
+    assert await _vigentes(db, admin.id) == 0
+
+    # Reactivado, el token sigue sin servir: la familia quedó revocada
+    admin.is_active = True
+    await db.commit()
+    assert (await _refresh(client, refresh_token)).status_code == 401
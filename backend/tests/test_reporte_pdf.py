@@ -0,0 +1,32 @@
+"""Reporte PDF paginado de pólizas."""
+
+import csv
+
+from app.core.reporte_pdf import FILAS_POR_PAGINA, renderizar_reporte
+
+
+def _datos(ruta, filas: int) -> None:
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        for i in range(filas):
+            escritor.writerow([i, f"POL-{i:05d}", "Ana Pérez", "activa", 1000, 10])
+
+
+def test_una_tabla_por_pagina(tmp_path):
+    _datos(tmp_path / "datos.csv", 2 * FILAS_POR_PAGINA + 1)
+    ruta_pdf = tmp_path / "reporte.pdf"
+
+    cantidad, paginas = renderizar_reporte(
+        str(tmp_path / "datos.csv"), str(ruta_pdf), "Pólizas"
+    )
+    # Dos páginas completas y una con la última fila y el resumen
+    assert (cantidad, paginas) == (2 * FILAS_POR_PAGINA + 1, 3)
+    assert ruta_pdf.read_bytes().startswith(b"%PDF")
+
+
+def test_sin_polizas(tmp_path):
+    _datos(tmp_path / "datos.csv", 0)
+    cantidad, paginas = renderizar_reporte(
+        str(tmp_path / "datos.csv"), str(tmp_path / "reporte.pdf"), "Pólizas"
+    )
+    assert (cantidad, paginas) == (0, 1)
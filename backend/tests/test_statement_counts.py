@@ -0,0 +1,75 @@
+"""
+Sentencias SQL por endpoint.
+
+El middleware de DB_COUNT_STATEMENTS cuenta con un StatementCounter las
+sentencias de cada petición y las publica en X-DB-Statements. Estas pruebas
+fijan esa cantidad para los endpoints principales y comprueban que no crece
+con la cantidad de filas (sin consultas N+1).
+"""
+
+import pytest
+
+from .conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+# Ruta -> sentencias, con el usuario autenticado ya en caché
+SENTENCIAS_POR_ENDPOINT = {
+    "/api/v1/polizas/": 1,
+    "/api/v1/polizas/estadisticas/": 1,
+    "/api/v1/polizas/estadisticas/?agrupar_por=moneda&agrupar_por=mes": 1,
+    "/api/v1/clientes/": 1,
+    "/api/v1/clientes/{cliente_id}": 1,
+    "/api/v1/corredores/": 1,
+    "/api/v1/usuarios/": 1,
+    "/api/v1/usuarios/{usuario_id}": 1,
+    "/api/v1/monedas/": 1,
+    "/api/v1/tipos-seguro/": 1,
+    "/api/v1/tipos-documento/": 1,
+    "/api/v1/aseguradoras/": 1,
+    "/api/v1/cliente-corredor/": 1,
+}
+
+
+def _sentencias(response) -> int:
+    assert response.status_code == 200, response.text
+    return int(response.headers["X-DB-Statements"])
+
+
+@pytest.mark.parametrize("filas", [1, 10])
+async def test_sentencias_por_endpoint(client, admin, crear_polizas, db, filas):
+    await crear_polizas(filas)
+    headers = auth_headers(admin)
+    # La primera petición autenticada resuelve la versión del token
+    await client.get("/api/v1/polizas/", headers=headers)
+    response = await client.get("/api/v1/clientes/", headers=headers)
+    cliente_id = response.json()[0]["id"]
+
+    medidas = {}
+    for ruta in SENTENCIAS_POR_ENDPOINT:
+        url = ruta.format(cliente_id=cliente_id, usuario_id=admin.id)
+        medidas[ruta] = _sentencias(await client.get(url, headers=headers))
+    assert medidas == SENTENCIAS_POR_ENDPOINT
+
+
+async def test_autenticacion_consulta_una_vez_la_version_del_token(client, admin):
+    headers = auth_headers(admin)
+    assert _sentencias(await client.get("/api/v1/polizas/", headers=headers)) == 2
+    assert _sentencias(await client.get("/api/v1/polizas/", headers=headers)) == 1
+
+
+async def test_sentencias_login_y_refresh(client, admin):
+    # Buscar el usuario por email o username y guardar el refresh token
+    for usuario in ("admin@example.com", "admin"):
+        response = await client.post(
+            "/api/v1/login/access-token",
+            data={"username": usuario, "password": "secreto"},
+        )
+        assert _sentencias(response) == 2
+
+    # Bloquear el token junto con su usuario, marcarlo usado y crear el sucesor
+    response = await client.post(
+        "/api/v1/login/refresh",
+        json={"refresh_token": response.json()["refresh_token"]},
+    )
+    assert _sentencias(response) == 3
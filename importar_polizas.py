@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Script para importar una planilla XLSX de pólizas (cartera de aseguradoras).
+
+Este script realiza las siguientes acciones:
+1. Inicia sesión en la API con el usuario indicado
+2. Envía la planilla al endpoint de importación de pólizas
+3. Muestra el resumen: pólizas creadas, duplicadas e inválidas
+
+La planilla debe tener en la primera fila los encabezados, entre ellos:
+Número de Póliza, Documento Cliente (o Cliente, con el nombre completo),
+Tipo de Seguro, Fecha Inicio, Fecha Vencimiento, Suma Asegurada y Prima.
+Opcionales: Corredor, Moneda, Estado, Tipo de Duración, Comisión, Cuotas,
+Carpeta, Endoso, etc. El tipo de seguro y las fechas pueden indicarse con
+--tipo-seguro, --fecha-inicio y --fecha-vencimiento para las filas que no
+los traen, por ejemplo al importar una exportación del sistema (ID, Número
+de Póliza, Cliente, Estado, Suma Asegurada, Prima).
+
+Uso:
+    python importar_polizas.py cartera.xlsx --usuario rponce
+    python importar_polizas.py polizas.xlsx --usuario rponce \
+        --tipo-seguro AUTO --fecha-inicio 2024-01-01 --fecha-vencimiento 2025-01-01
+"""
+
+import argparse
+import getpass
+import os
+import sys
+
+import requests
+
+# URL base de la API
+BASE_URL = os.environ.get("API_URL", "http://localhost:8000")
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def obtener_token(usuario, password):
+    """Inicia sesión y devuelve el token de acceso"""
+    response = requests.post(
+        f"{BASE_URL}/api/v1/login/access-token",
+        data={"username": usuario, "password": password},
+    )
+    if response.status_code != 200:
+        print(f"\n❌ Error al iniciar sesión: {response.status_code}")
+        print(response.text)
+        return None
+    return response.json()["access_token"]
+
+
+def importar_planilla(ruta, token, por_defecto=None):
+    """Envía la planilla a la API y devuelve el resultado de la importación"""
+    with open(ruta, "rb") as archivo:
+        response = requests.post(
+            f"{BASE_URL}/api/v1/polizas/importar",
+            headers={"Authorization": f"Bearer {token}"},
+            params=por_defecto,
+            files={"archivo": (os.path.basename(ruta), archivo, XLSX_MEDIA_TYPE)},
+        )
+    if response.status_code != 200:
+        print(f"\n❌ Error al importar la planilla: {response.status_code}")
+        print(response.text)
+        return None
+    return response.json()
+
+
+def mostrar_resultado(resultado):
+    """Muestra el resumen de la importación"""
+    print("\n✅ Importación finalizada")
+    print(f"Filas leídas: {resultado['filas']}")
+    print(f"Pólizas creadas: {resultado['creadas']}")
+    print(f"Pólizas duplicadas (ya existentes): {resultado['duplicadas']}")
+    print(f"Filas inválidas: {resultado['invalidas']}")
+    for error in resultado["errores"]:
+        numero = error.get("numero_poliza") or "-"
+        print(f"  Fila {error['fila']} (póliza {numero}): {error['error']}")
+    if resultado["invalidas"] > len(resultado["errores"]):
+        print("  ...")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importar planilla de pólizas")
+    parser.add_argument("planilla", help="Ruta de la planilla XLSX")
+    parser.add_argument("--usuario", required=True, help="Usuario o email")
+    parser.add_argument("--password", help="Contraseña (se pide si se omite)")
+    parser.add_argument(
+        "--tipo-seguro", help="Tipo de seguro de las filas que no lo indican"
+    )
+    parser.add_argument(
+        "--fecha-inicio", help="Fecha de inicio (AAAA-MM-DD) si la fila no la trae"
+    )
+    parser.add_argument(
+        "--fecha-vencimiento",
+        help="Fecha de vencimiento (AAAA-MM-DD) si la fila no la trae",
+    )
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.planilla):
+        sys.exit(f"\n❌ No existe el archivo {args.planilla}")
+
+    password = args.password or getpass.getpass("Contraseña: ")
+
+    print(f"\n🔄 Importando {args.planilla}...")
+    token = obtener_token(args.usuario, password)
+    if not token:
+        sys.exit(1)
+    por_defecto = {
+        "tipo_seguro": args.tipo_seguro,
+        "fecha_inicio": args.fecha_inicio,
+        "fecha_vencimiento": args.fecha_vencimiento,
+    }
+    resultado = importar_planilla(
+        args.planilla,
+        token,
+        {campo: valor for campo, valor in por_defecto.items() if valor},
+    )
+    if not resultado:
+        sys.exit(1)
+    mostrar_resultado(resultado)